@@ -1,6 +1,11 @@
 # brain/ai_engine.py
 import os
-from app.core.openai_client import client
+import json
+import asyncio
+import time
+from app.core.openai_client import get_async_client
+from app.core import metrics
+from app.brain import draft_pool
 
 from app.brain.signal_ranker import rank_signals
 from app.brain.prompt_builder import build_prompt
@@ -9,13 +14,14 @@ from app.brain.ending_engine import pick_ending
 
 # 🔐 HARD ANTI-SPAM (fingerprint)
 from app.brain.fingerprint_checker import (
-    is_fingerprint_duplicate,
+    get_fingerprint_memory,
+    matches_fingerprint,
     save_fingerprint
 )
 
 # Phase-2 memory
 from app.memory.memory_store import get_recent_reviews
-from app.memory.narrative_usage import is_narrative_allowed, mark_narrative_used
+from app.memory.narrative_usage import pick_narrative, mark_narrative_used
 
 
 NARRATIVES = [
@@ -26,8 +32,97 @@ NARRATIVES = [
     "Busy customer style"
 ]
 
+# "staged"     → AI opening call + body call + canned ending (default)
+# "structured" → ONE json-schema call returning opening/body/closing
+GENERATION_MODE = os.getenv("REVIEW_GENERATION_MODE", "staged")
+
+# Candidates per LLM call (n). >1 → pick the first one that passes the
+# local duplicate checks instead of paying for a serial rewrite call.
+REVIEW_CANDIDATES = int(os.getenv("REVIEW_CANDIDATES", "1"))
+
+# Serial rewrites are the last resort (all candidates rejected)
+MAX_REWRITES = 2
+
+REWRITE_INSTRUCTIONS = {
+    "fingerprint": "\nRewrite completely with a different structure and flow.",
+    "memory": "\nRewrite with different wording and emotion.",
+    "empty": ""     # every choice came back empty → same prompt again
+}
+
+# ---------------- VERBOSITY HARD LIMIT (PRODUCTION FIX) ----------------
+VERBOSITY_LIMITS = {
+    1: 25,
+    2: 45,
+    3: 70,
+    4: 110,
+    5: 160
+}
+
+# Target length per verbosity (words, whole review)
+VERBOSITY_RANGES = {
+    1: (20, 30),
+    2: (35, 50),
+    3: (60, 80),
+    4: (90, 120),
+    5: (130, 160)
+}
+
+# Output tokens per word (max_tokens of the structured call). Devanagari
+# takes several tokens per word, romanized Hinglish more than English;
+# unknown languages get the generous default — it only caps the output.
+TOKENS_PER_WORD = {
+    "English": 1.5,
+    "Hinglish": 2.5,
+    "Hindi": 5.0
+}
+DEFAULT_TOKENS_PER_WORD = 5.0
+
+REVIEW_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "review",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "opening": {"type": "string"},
+                "body": {"type": "string"},
+                "closing": {"type": "string"}
+            },
+            "required": ["opening", "body", "closing"],
+            "additionalProperties": False
+        }
+    }
+}
+
+
+# ---------------- STAGE GRAPH HELPERS ----------------
+async def _timed(timings: dict, stage: str, coro):
+    """
+    Await a stage and record its wall time (ms) in `timings`.
+    """
+    start = time.perf_counter()
+    try:
+        return await coro
+    finally:
+        timings[stage] = round((time.perf_counter() - start) * 1000, 1)
+
+
+def _start(stages: list, timings: dict, stage: str, coro) -> asyncio.Task:
+    """
+    Start a stage concurrently; tracked in `stages` so it can be cancelled.
+    """
+    task = asyncio.create_task(_timed(timings, stage, coro))
+    stages.append(task)
+    return task
+
 
-def generate_review(payload: dict):
+async def _pick_narrative(business_id: str, industry: str, exclude=()) -> str:
+    # least-used narrative, one cached usage map per business
+    return await pick_narrative(business_id, industry, NARRATIVES, exclude)
+
+
+async def generate_review(payload: dict):
     """
     REQUIRED:
     business_id
@@ -36,31 +131,372 @@ def generate_review(payload: dict):
     language
     """
 
+    print("SHOP NAME RECEIVED:", payload.get("shop_name"))
+
+    # ---------------- READY DRAFT (POOL) ----------------
+    pooled = await _serve_pooled(payload)
+    if pooled:
+        return pooled
+
+    timings = {}
+    started = time.perf_counter()
+
+    # Stage graph (staged mode):
+    #   opening ───┐
+    #   narrative ─┼─> body LLM (n candidates) ─> local checks ─> pick
+    #   ranking ───┘
+    #   ending pick + memory prefetch overlap everything above
+    # Structured mode drops the opening/ending stages: one LLM call.
+    stages = []
+    try:
+        result = await _generate_review_stages(payload, stages, timings)
+    finally:
+        # a failed stage must not leave its siblings running
+        for task in stages:
+            task.cancel()
+
+    # ---------------- STAGE TIMINGS ----------------
+    # "saved_vs_sequential" = sum of stage times - wall time,
+    # i.e. critical-path latency saved by running stages concurrently
+    total = round((time.perf_counter() - started) * 1000, 1)
+    sequential = round(sum(timings.values()), 1)
+    timings["total"] = total
+    timings["saved_vs_sequential"] = round(max(sequential - total, 0), 1)
+
+    # ---------------- METRICS (rewrite rate + latency per n) ----------------
+    n = result["debug"]["candidates"]
+    metrics.incr(f"review.generated.n{n}")
+    metrics.incr(f"review.rewrites.n{n}", result["debug"]["rewrites"])
+    metrics.observe(f"review.latency_ms.n{n}", total)
+
+    return result
+
+
+async def generate_draft(payload: dict, avoid: dict | None = None) -> dict:
+    """
+    Full pipeline WITHOUT saving memory or booking usage (draft pool
+    refills). avoid → {"narratives", "openings", "endings"} held by the
+    other pooled drafts. Memory is saved by _serve_pooled and usage booked
+    by draft_pool.take, if/when the draft is served.
+    """
+    timings = {}
+    stages = []
+    picks = {}
+    try:
+        result = await _generate_review_stages(
+            payload, stages, timings, save=False, avoid=avoid or {}, picks=picks
+        )
+    finally:
+        for task in stages:
+            task.cancel()
+
+    return {
+        "review": result["review"],
+        "narrative": result["debug"]["narrative"],
+        "opening": picks.get("opening"),
+        "ending": picks.get("ending"),
+        "debug": result["debug"],
+        "created": time.monotonic()
+    }
+
+
+async def _serve_pooled(payload: dict) -> dict | None:
+    if not draft_pool.pool_key(payload):
+        return None
+
+    # re-checked against memory as it is NOW (cache hit on a warm business)
+    memory = await get_fingerprint_memory(payload["business_id"], payload["industry"])
+    draft = draft_pool.take(payload, memory)
+    if not draft:
+        return None
+
+    timings = {}
+    started = time.perf_counter()
+
+    # usage (narrative / opening / ending) already booked by draft_pool.take
+    await _save_memory(
+        payload["business_id"], payload["industry"],
+        draft["review"], None, timings, draft.get("entry")
+    )
+
+    timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+    metrics.incr("review.generated.pool")
+    metrics.observe("review.latency_ms.pool", timings["total"])
+
+    return {
+        "review": draft["review"],
+        "debug": dict(draft["debug"], source="pool", timings_ms=timings)
+    }
+
+
+async def _generate_review_stages(
+    payload: dict,
+    stages: list,
+    timings: dict,
+    save: bool = True,
+    avoid: dict | None = None,
+    picks: dict | None = None
+):
+    """
+    save=False → draft: no memory saved, no usage booked.
+    avoid → phrases to skip (see generate_draft); picks ← opening / ending used.
+    """
+    avoid = avoid or {}
     business_id = payload["business_id"]
     industry = payload["industry"]
-    rating = payload.get("rating", 4)
-    shop_name = payload.get("shop_name")
-    print("SHOP NAME RECEIVED:", payload.get("shop_name"))
+    structured = (payload.get("generation_mode") or GENERATION_MODE) == "structured"
+    n = max(int(payload.get("candidates") or REVIEW_CANDIDATES), 1)
 
-    # ---------------- OPENING ----------------
-    opening = pick_opening(
-        business_id=business_id,
-        industry=industry,
-        rating=rating
+    # ---------------- INDEPENDENT STAGES (START NOW) ----------------
+    narrative_task = _start(
+        stages, timings, "narrative",
+        _pick_narrative(business_id, industry, avoid.get("narratives", ()))
+    )
+
+    # memory windows for the local duplicate checks (fetched once)
+    fingerprint_task = _start(
+        stages, timings, "fingerprint_memory", get_fingerprint_memory(business_id, industry)
+    )
+
+    recent_task = _start(
+        stages, timings, "recent_reviews", get_recent_reviews(business_id, industry)
     )
 
+    opening_task = ending_task = None
+    if not structured:
+        opening_task, ending_task = _start_opening_ending(
+            stages, timings, payload, book=save, avoid=avoid
+        )
+
     # ---------------- OVERRIDES ----------------
-    tone = payload.get("tone")
     verbosity = payload.get("verbosity")
+    language = payload.get("language") or "English"
+
+    ranked = _rank(payload, timings)
+
+    narrative = await narrative_task
+
+    # ---------------- STRUCTURED: ONE CALL ----------------
+    drafts = None
+    if structured:
+        prompt = _review_prompt(payload, ranked, narrative, None)
+        drafts = await _timed(
+            timings, "structured", _generate_structured(prompt, verbosity, n, language)
+        )
+
+        if not drafts:
+            # schema / parse failure → staged pipeline
+            structured = False
+            opening_task, ending_task = _start_opening_ending(
+                stages, timings, payload, book=save, avoid=avoid
+            )
+
+    opening = None
+    if not drafts:
+        # ---------------- WAIT: OPENING ----------------
+        opening = await opening_task
+        prompt = _review_prompt(payload, ranked, narrative, opening)
+
+        # ---------------- OPENAI CALL ----------------
+        drafts = await _timed(
+            timings, "body", _generate_bodies(prompt, opening, n)
+        )
+
+    # ---------------- WAIT: ENDING + MEMORY ----------------
+    ending = await ending_task if ending_task else None
+    fingerprint_memory = await fingerprint_task
+    recent = await recent_task
+
+    text, rewrites = await _check_and_rewrite(
+        drafts,
+        prompt=prompt,
+        structured=structured,
+        verbosity=verbosity,
+        language=language,
+        opening=opening,
+        ending=ending,
+        shop_name=payload.get("shop_name"),
+        fingerprint_memory=fingerprint_memory,
+        recent=recent,
+        timings=timings
+    )
+
+    if picks is not None:
+        picks["opening"] = opening
+        picks["ending"] = ending
+
+    if save:
+        await _save_memory(business_id, industry, text, narrative, timings)
+
+    return {
+        "review": text,
+        "debug": _debug(
+            payload, ranked, narrative,
+            "structured" if structured else "staged",
+            n, rewrites, timings
+        )
+    }
+
+
+# ---------------- STREAMING (SSE) ----------------
+async def stream_review(payload: dict):
+    """
+    Streaming variant of generate_review (staged mode, one candidate).
+    Yields (event, data):
+      opening  {"text"}             as soon as the opening is picked
+      token    {"text"}             body deltas straight from OpenAI
+      replace  {"review"}           a rewrite replaced the streamed text
+      done     {"review", "debug"}  final text (ending applied)
+    """
+    business_id = payload["business_id"]
+    industry = payload["industry"]
+    verbosity = payload.get("verbosity")
+
+    # ---------------- READY DRAFT (POOL) ----------------
+    pooled = await _serve_pooled(payload)
+    if pooled:
+        yield "done", pooled
+        return
 
+    timings = {}
+    started = time.perf_counter()
+    stages = []
+
+    try:
+        # ---------------- INDEPENDENT STAGES (START NOW) ----------------
+        narrative_task = _start(
+            stages, timings, "narrative", _pick_narrative(business_id, industry)
+        )
+        fingerprint_task = _start(
+            stages, timings, "fingerprint_memory", get_fingerprint_memory(business_id, industry)
+        )
+        recent_task = _start(
+            stages, timings, "recent_reviews", get_recent_reviews(business_id, industry)
+        )
+        opening_task, ending_task = _start_opening_ending(
+            stages, timings, payload
+        )
+
+        ranked = _rank(payload, timings)
+
+        # ---------------- OPENING (FIRST PAINT) ----------------
+        opening = await opening_task
+        yield "opening", {"text": opening + ". "}
+
+        narrative = await narrative_task
+        prompt = _review_prompt(payload, ranked, narrative, opening)
+
+        # ---------------- BODY TOKENS ----------------
+        limit = VERBOSITY_LIMITS.get(verbosity, 70)
+        body = ""
+        body_start = time.perf_counter()
+
+        stream = await get_async_client().chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "user", "content": prompt}
+            ],
+            stream=True
+        )
+
+        try:
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+
+                body += delta
+                yield "token", {"text": delta}
+
+                # anything past the verbosity limit gets trimmed anyway
+                if len(body.split()) > limit:
+                    break
+        finally:
+            await stream.close()
+
+        timings["body"] = round((time.perf_counter() - body_start) * 1000, 1)
+
+        # ---------------- DUPLICATE CHECKS ON FINAL BUFFER ----------------
+        ending = await ending_task
+        fingerprint_memory = await fingerprint_task
+        recent = await recent_task
+
+        # empty stream → no draft, handled like an empty body call
+        drafts = [{"opening": opening, "body": body, "closing": None}] if body.strip() else []
+
+        text, rewrites = await _check_and_rewrite(
+            drafts,
+            prompt=prompt,
+            structured=False,
+            verbosity=verbosity,
+            language=payload.get("language") or "English",
+            opening=opening,
+            ending=ending,
+            shop_name=payload.get("shop_name"),
+            fingerprint_memory=fingerprint_memory,
+            recent=recent,
+            timings=timings
+        )
+
+        if rewrites:
+            yield "replace", {"review": text}
+
+        await _save_memory(business_id, industry, text, narrative, timings)
+    finally:
+        for task in stages:
+            task.cancel()
+
+    total = round((time.perf_counter() - started) * 1000, 1)
+    timings["total"] = total
+
+    metrics.incr("review.generated.stream")
+    metrics.incr("review.rewrites.stream", rewrites)
+    metrics.observe("review.latency_ms.stream", total)
+
+    yield "done", {
+        "review": text,
+        "debug": _debug(payload, ranked, narrative, "stream", 1, rewrites, timings)
+    }
+
+
+def _debug(
+    payload: dict,
+    ranked: dict,
+    narrative: str,
+    mode: str,
+    n: int,
+    rewrites: int,
+    timings: dict
+) -> dict:
+    return {
+        "business_id": payload["business_id"],
+        "industry": payload["industry"],
+        "narrative": narrative,
+        "generation_mode": mode,
+        "candidates": n,
+        "rewrites": rewrites,
+        "tone_used": payload.get("tone") or "rating_based",
+        "verbosity_used": payload.get("verbosity") or "default",
+        "used_context": ranked.get("context"),
+        "used_trust": ranked.get("trust"),
+        "used_service": ranked.get("service"),
+        "used_area": ranked.get("area"),
+        "used_seo": ranked.get("seo"),
+        "timings_ms": timings
+    }
+
+
+def _rank(payload: dict, timings: dict) -> dict:
     admin_data = payload.get("admin_data", {})
 
     # ---------------- SIGNAL RANKING (CONTROLLED PICK) ----------------
+    rank_start = time.perf_counter()
     ranked = rank_signals(
         product=payload.get("product"),
         area=payload.get("area"),
         admin_data=admin_data
     )
+    timings["ranking"] = round((time.perf_counter() - rank_start) * 1000, 1)
 
     # ---------------- SAFE DEFAULTS (CRITICAL) ----------------
     ranked.setdefault("context", [])
@@ -82,23 +518,144 @@ def generate_review(payload: dict):
     if ranked.get("area"):
         ranked["area"] = ranked["area"][:1]         # max 1 area
 
-    # ---------------- NARRATIVE ----------------
-    narrative = None
-    for n in NARRATIVES:
-        if is_narrative_allowed(business_id, industry, n):
-            narrative = n
-            break
+    return ranked
+
+
+async def _check_and_rewrite(
+    drafts: list,
+    *,
+    prompt: str,
+    structured: bool,
+    verbosity: int | None,
+    language: str,
+    opening: str | None,
+    ending: str | None,
+    shop_name: str | None,
+    fingerprint_memory,
+    recent: list,
+    timings: dict
+) -> tuple[str, int]:
+    """
+    Local duplicate checks over the drafts, serial rewrite as last resort.
+    Returns (final text, number of rewrites).
+    No draft at all (every choice empty) → redrafted like a rejection;
+    still none after MAX_REWRITES → RuntimeError, nothing gets saved.
+    """
+
+    # ---------------- LOCAL DUPLICATE CHECKS ----------------
+    check_start = time.perf_counter()
+    candidates = [
+        _compose(d, ending, shop_name, verbosity, trim=not structured)
+        for d in drafts
+    ]
+    text, reason = _pick_candidate(candidates, fingerprint_memory, recent)
+    timings["checks"] = round((time.perf_counter() - check_start) * 1000, 1)
+
+    # ---------------- LAST RESORT: SERIAL REWRITE ----------------
+    rewrites = 0
+    while reason and rewrites < MAX_REWRITES:
+        rewrites += 1
+        redrafts = await _timed(
+            timings, f"rewrite_{rewrites}",
+            _redraft(
+                prompt + REWRITE_INSTRUCTIONS[reason], structured, verbosity, language, opening
+            )
+        )
+
+        if not redrafts:
+            metrics.incr("review.candidates_empty")
+            continue
+
+        candidates = [
+            _compose(d, ending, shop_name, verbosity, trim=not structured)
+            for d in redrafts
+        ]
+        text, reason = _pick_candidate(candidates, fingerprint_memory, recent)
+
+    if reason and not candidates:
+        raise RuntimeError("review generation returned no text")
+
+    if reason:
+        # nothing passed → keep the latest draft (same as before)
+        text = candidates[0][1]
+
+    return text, rewrites
+
+
+async def _save_memory(
+    business_id: str,
+    industry: str,
+    text: str,
+    narrative: str,
+    timings: dict,
+    entry=None
+):
+    # ---------------- SAVE MEMORY (WRITE-BEHIND) ----------------
+    # only enqueued here; core.write_behind flushes in the background
+    # entry → ReviewEntry already computed for this text (pooled draft)
+    # narrative=None → already booked (pooled draft)
+    await _timed(timings, "save", save_fingerprint(
+        business_id=business_id,
+        industry=industry,
+        review_text=text,
+        entry=entry
+    ))
+    if narrative:
+        mark_narrative_used(
+            business_id=business_id,
+            industry=industry,
+            narrative=narrative
+        )
 
-    if not narrative:
-        narrative = NARRATIVES[0]
+
+def _start_opening_ending(
+    stages: list,
+    timings: dict,
+    payload: dict,
+    book: bool = True,
+    avoid: dict | None = None
+):
+    business_id = payload["business_id"]
+    industry = payload["industry"]
+    rating = payload.get("rating", 4)
+    language = payload.get("language") or "English"
+    avoid = avoid or {}
+
+    opening_task = _start(stages, timings, "opening", pick_opening(
+        business_id=business_id,
+        industry=industry,
+        rating=rating,
+        language=language,
+        book=book,
+        exclude=avoid.get("openings", ())
+    ))
+
+    ending_task = _start(
+        stages, timings, "ending",
+        pick_ending(
+            business_id, industry, rating, language,
+            book=book, exclude=avoid.get("endings", ())
+        )
+    )
+
+    return opening_task, ending_task
+
+
+def _review_prompt(
+    payload: dict,
+    ranked: dict,
+    narrative: str,
+    opening: str | None
+) -> str:
+    verbosity = payload.get("verbosity")
 
     # ---------------- PROMPT ----------------
     prompt = build_prompt(
-        rating=rating,
+        rating=payload.get("rating", 4),
         language=payload.get("language"),
         experience=payload.get("experience"),
         ranked=ranked,
-        tone_override=tone,
+        tone_override=payload.get("tone"),
         verbosity=verbosity,
         opening=opening
     )
@@ -117,37 +674,33 @@ def generate_review(payload: dict):
     elif verbosity == 5:
         prompt += "\n\nWrite a long but natural review (130–160 words)."
 
-    # ---------------- OPENAI CALL ----------------
-    res = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "user", "content": prompt}
-        ]
-    )
+    return prompt
 
-    text = res.choices[0].message.content
 
-    # ---------------- VERBOSITY HARD LIMIT (PRODUCTION FIX) ----------------
-    verbosity_limits = {
-        1: 25,
-        2: 45,
-        3: 70,
-        4: 110,
-        5: 160
-    }
+def _compose(
+    draft: dict,
+    ending: str | None,
+    shop_name: str | None,
+    verbosity: int | None,
+    trim: bool
+) -> tuple[str, str]:
+    """
+    draft → (text before ending, final text).
+    The fingerprint check runs on the first, the memory check on the second.
+    """
+    text = draft["body"]
 
-    limit = verbosity_limits.get(verbosity, 70)
+    if trim:
+        limit = VERBOSITY_LIMITS.get(verbosity, 70)
 
-    words = text.split()
-    if len(words) > limit:
-        text = " ".join(words[:limit])
-        if not text.endswith((".", "!", "?")):
-            text = text.rstrip(", ") + "."
+        words = text.split()
+        if len(words) > limit:
+            text = " ".join(words[:limit])
+            if not text.endswith((".", "!", "?")):
+                text = text.rstrip(", ") + "."
 
     # ---------------- APPLY OPENING ----------------
-    text = opening + ". " + text.lstrip()
-
-    shop_name = payload.get("shop_name")
+    text = draft["opening"] + ". " + text.lstrip()
 
     if shop_name:
         import random
@@ -163,68 +716,134 @@ def generate_review(payload: dict):
 
                 text = ". ".join(sentences)
 
-    # ---------------- HARD FINGERPRINT CHECK ----------------
-    if is_fingerprint_duplicate(business_id, industry, text):
-        res = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "user",
-                    "content": prompt + "\nRewrite completely with a different structure and flow."
-                }
-            ]
-        )
-        text = res.choices[0].message.content
-        text = opening + ". " + text.lstrip()
-
     # ---------------- APPLY ENDING ----------------
-    ending = pick_ending(business_id, industry, rating)
-    text = text.rstrip(". ") + ". " + ending
-
-    # ---------------- SOFT MEMORY CHECK ----------------
-    recent = get_recent_reviews(business_id, industry)
-
-    for r in recent:
-        if r.get("review_text") and r["review_text"][:80] in text:
-            res = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt + "\nRewrite with different wording and emotion."
-                    }
-                ]
-            )
-            text = res.choices[0].message.content
-            text = opening + ". " + text.lstrip()
-            text = text.rstrip(". ") + ". " + ending
-            break
+    closing = draft.get("closing") or ending
+    return text, text.rstrip(". ") + ". " + closing
 
-    # ---------------- SAVE MEMORY ----------------
-    save_fingerprint(
-        business_id=business_id,
-        industry=industry,
-        review_text=text
+
+def _pick_candidate(
+    candidates: list,
+    fingerprint_memory,
+    recent: list
+) -> tuple[str | None, str | None]:
+    """
+    First candidate passing both local checks → (text, None).
+    None passed → (None, reason the first one failed).
+    No candidates → (None, "empty").
+    """
+    if not candidates:
+        metrics.incr("review.candidates_empty")
+        return None, "empty"
+
+    first_reason = None
+
+    for body_text, text in candidates:
+        # HARD FINGERPRINT CHECK
+        if matches_fingerprint(fingerprint_memory, body_text):
+            reason = "fingerprint"
+        # SOFT MEMORY CHECK
+        elif any(
+            r.text and r.text[:80] in text
+            for r in recent
+        ):
+            reason = "memory"
+        else:
+            return text, None
+
+        metrics.incr("review.candidates_rejected." + reason)
+        first_reason = first_reason or reason
+
+    return None, first_reason
+
+
+async def _generate_bodies(prompt: str, opening: str, n: int) -> list:
+    res = await get_async_client().chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "user", "content": prompt}
+        ],
+        n=n
     )
 
-    mark_narrative_used(
-        business_id=business_id,
-        industry=industry,
-        narrative=narrative
+    return [
+        {"opening": opening, "body": c.message.content, "closing": None}
+        for c in res.choices
+        if (c.message.content or "").strip()
+    ]
+
+
+async def _generate_structured(
+    prompt: str,
+    verbosity: int | None,
+    n: int = 1,
+    language: str = "English"
+) -> list | None:
+    """
+    Opening + body + closing in ONE json-schema call (n candidates).
+    Sized by verbosity + language (max_tokens) so nothing gets trimmed
+    afterwards; a choice cut off at max_tokens anyway is counted
+    (review.truncated.<language>) and dropped.
+    Returns None on any failure so the staged pipeline can take over.
+    """
+    low, high = VERBOSITY_RANGES.get(verbosity, VERBOSITY_RANGES[3])
+
+    prompt += (
+        f"\n\nReturn the review as JSON with three fields:\n"
+        f"- opening: one short, natural opening sentence (max 15 words)\n"
+        f"- body: the main review text\n"
+        f"- closing: one short closing sentence\n"
+        f"All three together: {low}–{high} words."
     )
 
-    return {
-        "review": text,
-        "debug": {
-            "business_id": business_id,
-            "industry": industry,
-            "narrative": narrative,
-            "tone_used": tone or "rating_based",
-            "verbosity_used": verbosity or "default",
-            "used_context": ranked.get("context"),
-            "used_trust": ranked.get("trust"),
-            "used_service": ranked.get("service"),
-            "used_area": ranked.get("area"),
-            "used_seo": ranked.get("seo")
-        }
-    }
\ No newline at end of file
+    try:
+        res = await get_async_client().chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": prompt}],
+            response_format=REVIEW_SCHEMA,
+            # tokens/word of the language + JSON overhead
+            max_tokens=int(high * TOKENS_PER_WORD.get(language, DEFAULT_TOKENS_PER_WORD)) + 60,
+            n=n
+        )
+    except Exception:
+        return None
+
+    drafts = []
+    for choice in res.choices:
+        if choice.finish_reason == "length":
+            # unterminated JSON → would only fail below, but silently
+            metrics.incr(f"review.truncated.{language}")
+            continue
+
+        try:
+            parts = json.loads(choice.message.content)
+            opening = parts["opening"].strip().rstrip(".")
+            body = parts["body"].strip()
+            closing = parts["closing"].strip()
+        except Exception:
+            continue
+
+        if not opening or not body or not closing:
+            continue
+
+        if not closing.endswith((".", "!", "?")):
+            closing += "."
+
+        drafts.append({"opening": opening, "body": body, "closing": closing})
+
+    return drafts or None
+
+
+async def _redraft(
+    prompt: str,
+    structured: bool,
+    verbosity: int | None,
+    language: str,
+    opening: str | None
+) -> list | None:
+    """
+    Serial rewrite call (one candidate) for when every candidate was rejected.
+    """
+    if structured:
+        return await _generate_structured(prompt, verbosity, language=language)
+
+    return await _generate_bodies(prompt, opening, 1)
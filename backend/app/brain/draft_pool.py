@@ -0,0 +1,245 @@
+# brain/draft_pool.py
+"""
+Per-client pool of ready review drafts (bursty QR traffic).
+
+- key: (business_id, rating, language); only plain requests use it
+  (no product / experience given → nothing request-specific in the draft)
+- opt-in: DRAFT_POOL_SIZE defaults to 0 (disabled)
+- drafts are generated by the normal pipeline WITHOUT saving memory,
+  already checked against review_memory + the other pooled drafts
+- each draft avoids the narrative / opening / ending of the drafts already
+  pooled; usage is booked only when take() serves it (rejected / expired
+  drafts cost nothing)
+- generate_review pops a draft; memory is saved only when it is served
+- a popped draft is checked again against the CURRENT review memory
+  (reviews saved since it was pooled); a hit is dropped, never booked
+- background worker refills a pool once it drops below LOW_WATERMARK
+- idle clients (no demand for ACTIVE_TTL) are dropped, total keys bounded
+
+Metrics: draft_pool.hit / .miss / .low_watermark / .refills / .rejected,
+draft_pool.expired / .stale, draft_pool.refill_ms, gauge draft_pool.drafts
+"""
+import os
+import time
+import asyncio
+from collections import OrderedDict, deque
+from app.core import metrics
+from app.brain.fingerprint_checker import matches_fingerprint
+from app.brain.opening_engine import mark_opening_used
+from app.brain.ending_engine import mark_ending_used
+from app.memory.narrative_usage import mark_narrative_used
+from app.memory.review_cache import ReviewEntry, ReviewMemory
+
+# ---------------- CONFIG ----------------
+POOL_SIZE = int(os.getenv("DRAFT_POOL_SIZE", "0"))           # 0 = disabled
+LOW_WATERMARK = int(os.getenv("DRAFT_POOL_LOW_WATERMARK", "2"))
+DRAFT_TTL = 30 * 60          # seconds a draft stays servable
+ACTIVE_TTL = 30 * 60         # seconds without demand → client dropped
+MAX_KEYS = 500               # bounded number of pools per worker
+REFILL_CONCURRENCY = 4       # parallel draft generations
+REFILL_INTERVAL = 5          # seconds between idle sweeps
+
+
+class _Pool:
+    __slots__ = ("template", "drafts", "last_demand", "refilling")
+
+    def __init__(self, template: dict):
+        self.template = template
+        self.drafts = deque()
+        self.last_demand = time.monotonic()
+        self.refilling = False
+
+
+_pools: "OrderedDict[tuple, _Pool]" = OrderedDict()
+_wake = asyncio.Event()
+_worker: asyncio.Task | None = None
+_refills: set = set()
+
+
+def pool_key(payload: dict) -> tuple | None:
+    if POOL_SIZE <= 0:
+        return None
+
+    if payload.get("product") or payload.get("experience"):
+        return None
+
+    return (
+        payload["business_id"],
+        payload.get("rating", 4),
+        payload.get("language") or "English"
+    )
+
+
+def take(payload: dict, memory: ReviewMemory | None = None) -> dict | None:
+    """
+    Pop a ready draft for this request (None → generate live).
+    Also records demand so the worker keeps this pool warm.
+
+    memory → current review memory of the business: drafts that now
+    match it (saved by a live request / another worker since the draft
+    was checked) are dropped
+    """
+    key = pool_key(payload)
+    if not key:
+        return None
+
+    now = time.monotonic()
+    pool = _pools.get(key)
+
+    if pool is None:
+        pool = _pools[key] = _Pool(payload)
+        while len(_pools) > MAX_KEYS:
+            _pools.popitem(last=False)
+    else:
+        pool.template = payload     # latest admin data wins
+        _pools.move_to_end(key)
+
+    pool.last_demand = now
+
+    draft = None
+    while pool.drafts:
+        candidate = pool.drafts.popleft()
+        if now - candidate["created"] >= DRAFT_TTL:
+            metrics.incr("draft_pool.expired")
+            continue
+        if memory is not None and matches_fingerprint(
+            memory, candidate["review"], features=candidate["entry"]
+        ):
+            metrics.incr("draft_pool.stale")
+            continue
+        draft = candidate
+        break
+
+    metrics.incr("draft_pool.hit" if draft else "draft_pool.miss")
+
+    if draft:
+        _book(payload, draft)
+
+    if len(pool.drafts) < LOW_WATERMARK:
+        metrics.incr("draft_pool.low_watermark")
+        _wake.set()
+
+    _update_gauge()
+    return draft
+
+
+def _book(payload: dict, draft: dict):
+    # usage counted for served drafts only
+    business_id = payload["business_id"]
+    industry = payload["industry"]
+
+    if draft.get("opening"):
+        mark_opening_used(business_id, industry, draft["opening"])
+    if draft.get("ending"):
+        mark_ending_used(business_id, industry, draft["ending"])
+    if draft.get("narrative"):
+        mark_narrative_used(business_id, industry, draft["narrative"])
+
+
+def stats() -> dict:
+    return {
+        "pools": len(_pools),
+        "drafts": sum(len(p.drafts) for p in _pools.values()),
+        "refilling": sum(1 for p in _pools.values() if p.refilling)
+    }
+
+
+def _update_gauge():
+    metrics.gauge("draft_pool.drafts", sum(len(p.drafts) for p in _pools.values()))
+
+
+# ---------------- BACKGROUND WORKER ----------------
+def start():
+    global _worker
+
+    if POOL_SIZE > 0 and _worker is None:
+        _worker = asyncio.create_task(_run())
+
+
+async def stop():
+    global _worker
+
+    tasks = list(_refills)
+    if _worker:
+        tasks.append(_worker)
+
+    for task in tasks:
+        task.cancel()
+
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _worker = None
+
+
+async def _run():
+    sem = asyncio.Semaphore(REFILL_CONCURRENCY)
+
+    while True:
+        try:
+            await asyncio.wait_for(_wake.wait(), timeout=REFILL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        _wake.clear()
+
+        now = time.monotonic()
+
+        # drop clients that went quiet
+        for key in [k for k, p in _pools.items() if now - p.last_demand > ACTIVE_TTL]:
+            del _pools[key]
+
+        for key, pool in list(_pools.items()):
+            if pool.refilling or len(pool.drafts) >= LOW_WATERMARK:
+                continue
+
+            pool.refilling = True
+            task = asyncio.create_task(_refill(key, pool, sem))
+            _refills.add(task)
+            task.add_done_callback(_refills.discard)
+
+        _update_gauge()
+
+
+def _avoid(pool: _Pool) -> dict:
+    # pooled drafts are unbooked → steer the next one away from their picks
+    return {
+        "narratives": {d["narrative"] for d in pool.drafts if d.get("narrative")},
+        "openings": {d["opening"] for d in pool.drafts if d.get("opening")},
+        "endings": {d["ending"] for d in pool.drafts if d.get("ending")}
+    }
+
+
+async def _refill(key: tuple, pool: _Pool, sem: asyncio.Semaphore):
+    # lazy import: ai_engine imports this module
+    from app.brain.ai_engine import generate_draft
+
+    attempts = 0
+    try:
+        while len(pool.drafts) < POOL_SIZE and attempts < POOL_SIZE * 2:
+            if _pools.get(key) is not pool:
+                return      # client dropped while refilling
+
+            attempts += 1
+            async with sem:
+                start = time.perf_counter()
+                draft = await generate_draft(pool.template, _avoid(pool))
+                metrics.observe(
+                    "draft_pool.refill_ms", (time.perf_counter() - start) * 1000
+                )
+
+            # pooled drafts must not look like each other either;
+            # features + minhash computed once per draft, reused when served
+            draft["entry"] = ReviewEntry(draft["review"])
+            pooled = ReviewMemory(d["entry"] for d in pool.drafts)
+            if matches_fingerprint(pooled, draft["review"], features=draft["entry"]):
+                metrics.incr("draft_pool.rejected")
+                continue
+
+            pool.drafts.append(draft)
+            _update_gauge()
+
+        metrics.incr("draft_pool.refills")
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        print("DRAFT POOL REFILL ERROR:", e)
+    finally:
+        pool.refilling = False
@@ -1,16 +1,26 @@
+import json
 import random
-import os
-from datetime import datetime
-from supabase import create_client
-
-supabase = create_client(
-    os.getenv("SUPABASE_URL"),
-    os.getenv("SUPABASE_SERVICE_KEY")
-)
+from app.core.openai_client import get_async_client
+from app.database.supabase import get_async_supabase
+from app.memory import phrase_usage
 
 # ---------------- CONFIG ----------------
 USAGE_LIMIT = 10
 
+# Batch-generated endings: one LLM call → BATCH_SIZE endings per
+# (business, industry, rating, language), each served up to
+# BATCH_USAGE_LIMIT times before the pool counts as exhausted
+BATCH_SIZE = 24
+BATCH_USAGE_LIMIT = 1
+
+ENDING_TONES = {
+    5: "very happy, would recommend",
+    4: "positive but natural",
+    3: "neutral and honest"
+}
+
+_refills = phrase_usage.RefillGate("ending_usage")
+
 ENDINGS = {
     5: [
         "I’ll definitely be coming back.",
@@ -29,62 +39,195 @@ ENDINGS = {
     ]
 }
 
+# ---------------- AI ENDING BATCH GENERATOR ----------------
+ENDINGS_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "endings",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "endings": {"type": "array", "items": {"type": "string"}}
+            },
+            "required": ["endings"],
+            "additionalProperties": False
+        }
+    }
+}
+
+
+async def _generate_ai_endings(
+    industry: str,
+    rating: int,
+    language: str,
+    count: int = BATCH_SIZE
+) -> list[str]:
+    """
+    ONE call → `count` short closing sentences.
+    Returns [] if AI fails (so the static pool kicks in).
+    """
+
+    prompt = (
+        f"Write {count} different short closing sentences for Google reviews.\n"
+        f"Industry: {industry}\n"
+        f"Tone: {ENDING_TONES.get(rating, ENDING_TONES[4])}\n"
+        f"Language: {language}\n"
+        f"Rules:\n"
+        f"- Human, casual\n"
+        f"- Every sentence is worded differently\n"
+        f"- No marketing words\n"
+        f"- No emojis\n"
+        f"- Max 12 words each\n"
+        f"- Do NOT mention Google or rating\n"
+    )
+
+    try:
+        res = await get_async_client().chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": prompt}],
+            response_format=ENDINGS_SCHEMA,
+            temperature=0.9
+        )
+
+        endings = json.loads(res.choices[0].message.content)["endings"]
+    except Exception:
+        return []
+
+    cleaned = []
+    for text in endings:
+        text = text.strip()
+        if not text.endswith((".", "!")):
+            text += "."
+        if len(text.split()) >= 3 and text not in cleaned:
+            cleaned.append(text)
+
+    return cleaned
+
+
+async def _usage(business_id: str, industry: str) -> phrase_usage.PhraseUsage:
+    # usable ending_usage rows of this business: ONE query cold, zero warm
+    return await phrase_usage.get(
+        "ending_usage", "ending_text", business_id, industry, BATCH_USAGE_LIMIT
+    )
+
+
+async def _refill_batch_endings(
+    usage: phrase_usage.PhraseUsage,
+    rating: int,
+    language: str
+) -> list[str]:
+    """
+    Pool ran out → one LLM call generates a fresh batch,
+    stored in ending_usage (usage_count 0) for this business.
+    Single-flight per pool so a burst triggers only one call;
+    a failed / empty refill is not retried for REFILL_COOLDOWN.
+    """
+    business_id, industry = usage.business_id, usage.industry
+    key = (business_id, industry, rating, language)
+    if _refills.cooling(key):
+        return []       # last refill failed → static pool for now
+
+    async with _refills.lock(key):
+        # another request may have refilled (or failed) while we waited
+        available = usage.available(str(rating), language, BATCH_USAGE_LIMIT)
+        if available:
+            return available
+
+        if _refills.cooling(key):
+            return []
+
+        endings = await _generate_ai_endings(industry, rating, language)
+        if not endings:
+            _refills.failed(key)
+            return []
+
+        # exhausted batches of this pool are dead weight from here on
+        await phrase_usage.prune(
+            "ending_usage", business_id, industry, str(rating), language, BATCH_USAGE_LIMIT
+        )
+
+        try:
+            await get_async_supabase().table("ending_usage").upsert(
+                [
+                    {
+                        "business_id": business_id,
+                        "industry": industry,
+                        "ending_text": text,
+                        "bucket": str(rating),
+                        "language": language,
+                        "usage_count": 0
+                    }
+                    for text in endings
+                ],
+                on_conflict="business_id,industry,ending_text",
+                ignore_duplicates=True
+            ).execute()
+        except Exception as e:
+            print("ENDING REFILL ERROR:", e)
+            _refills.failed(key)
+            return []
+
+        usage.add(endings, str(rating), language)
+        return usage.available(str(rating), language, BATCH_USAGE_LIMIT)
+
+
 # ---------------- CORE ----------------
-def pick_ending(business_id: str, industry: str, rating: int) -> str:
+async def pick_ending(
+    business_id: str,
+    industry: str,
+    rating: int,
+    language: str = "English",
+    book: bool = True,
+    exclude=()
+) -> str:
     """
     Production-grade ending picker
-    - Rating based pool
+    - Batch AI-generated endings, served from DB (no LLM call)
+    - One usage read per business (cached), selection in memory
+    - Pool empty → one LLM call refills a whole batch
+    - Rating based static pool
     - DB exhaustion (usage limit)
     - Safe fallback
+
+    book=False → usage not counted (draft pool: mark_ending_used on serve)
+    exclude    → endings to avoid (held by pooled drafts)
     """
 
-    pool = ENDINGS.get(rating, ENDINGS[4])
-    random.shuffle(pool)
+    usage = await _usage(business_id, industry)
+    ending = await _choose(usage, rating, language, exclude)
 
-    for ending in pool:
-        resp = (
-            supabase
-            .table("ending_usage")
-            .select("usage_count")
-            .eq("business_id", business_id)
-            .eq("industry", industry)
-            .eq("ending_text", ending)
-            .maybe_single()   # ✅ FIX: zero row safe
-            .execute()
-        )
+    if book:
+        usage.use(ending)
+    return ending
 
-        row = resp.data if resp else None
 
-        if not row or row.get("usage_count", 0) < USAGE_LIMIT:
-            _mark_ending_used(business_id, industry, ending)
-            return ending
+def mark_ending_used(business_id: str, industry: str, ending: str):
+    phrase_usage.mark_used("ending_usage", "ending_text", business_id, industry, ending)
 
-    # ---- fallback: least used ending ----
-    least = (
-        supabase
-        .table("ending_usage")
-        .select("ending_text")
-        .eq("business_id", business_id)
-        .eq("industry", industry)
-        .order("usage_count")
-        .limit(1)
-        .execute()
-        .data
-    )
 
-    ending = least[0]["ending_text"] if least else random.choice(pool)
-    _mark_ending_used(business_id, industry, ending)
-    return ending
+async def _choose(
+    usage: phrase_usage.PhraseUsage,
+    rating: int,
+    language: str,
+    exclude
+) -> str:
+    # 1️⃣ batch pool first
+    available = usage.available(str(rating), language, BATCH_USAGE_LIMIT)
+
+    if not available:
+        available = await _refill_batch_endings(usage, rating, language)
 
+    if available:
+        return random.choice([e for e in available if e not in exclude] or available)
+
+    # 2️⃣ static rating pool (counts from the same usage map)
+    pool = ENDINGS.get(rating, ENDINGS[4])
+    random.shuffle(pool)
+
+    for ending in pool:
+        if usage.count(ending) < USAGE_LIMIT and ending not in exclude:
+            return ending
 
-def _mark_ending_used(business_id: str, industry: str, ending: str):
-    supabase.table("ending_usage").upsert(
-        {
-            "business_id": business_id,
-            "industry": industry,
-            "ending_text": ending,
-            "usage_count": 1,
-            "last_used": datetime.utcnow().isoformat()
-        },
-        on_conflict="business_id,industry,ending_text"
-    ).execute()
\ No newline at end of file
+    # ---- fallback: least used ending (same rating / language), then static ----
+    return usage.least_used(str(rating), language) or min(pool, key=usage.count)
@@ -1,88 +1,75 @@
 # app/brain/fingerprint_checker.py
-import re
-from difflib import SequenceMatcher
-from app.database.supabase import supabase
+from app.core import write_behind
+from app.memory import review_cache
+from app.brain import minhash
+from app.brain.text_analysis import TextFeatures
 
-def normalize(text: str) -> str:
-    text = text.lower()
-    text = re.sub(r"[^a-z0-9\s]", "", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+FINGERPRINT_WINDOW = 40     # structure repeat is checked on recent reviews only
 
-def structure_fingerprint(text: str) -> str:
+async def get_fingerprint_memory(business_id: str, industry: str):
     """
-    Sentence length pattern fingerprint
-    S = short, M = medium, L = long
+    Memory used by the fingerprint check (in-process; check many
+    candidates locally):
+    - recent window → structure fingerprint
+    - LSH index over the whole history → near-duplicate text
     """
-    sentences = re.split(r"[.!?]", text)
-    pattern = []
+    return await review_cache.get_memory(business_id, industry)
 
-    for s in sentences:
-        w = len(s.strip().split())
-        if w == 0:
-            continue
-        if w <= 6:
-            pattern.append("S")
-        elif w <= 14:
-            pattern.append("M")
-        else:
-            pattern.append("L")
-
-    return "-".join(pattern)
-
-def is_fingerprint_duplicate(
-    business_id: str,
-    industry: str,
+def matches_fingerprint(
+    memory,
     new_text: str,
-    similarity_threshold: float = 0.55
+    similarity_threshold: float = minhash.SIMILARITY_THRESHOLD,
+    features: TextFeatures | None = None
 ) -> bool:
     """
-    HARD anti-spam check:
+    HARD anti-spam check (memory = review_cache.ReviewMemory):
     - structure fingerprint
-    - semantic similarity
-    """
-
-    new_norm = normalize(new_text)
-    new_fp = structure_fingerprint(new_text)
-
-    res = (
-        supabase
-        .table("review_memory")
-        .select("review_text, fingerprint")
-        .eq("business_id", business_id)
-        .eq("industry", industry)
-        .order("created_at", desc=True)
-        .limit(40)
-        .execute()
-    )
-
-    rows = res.data or []
+    - semantic similarity (minhash, estimated Jaccard)
 
-    for r in rows:
-        old_text = r.get("review_text") or ""
-        old_fp = r.get("fingerprint") or ""
+    features → TextFeatures / ReviewEntry of new_text if the caller already
+    has them (a ReviewEntry's minhash is reused too)
+    """
 
-        # 1️⃣ Structure repeat = BLOCK
-        if old_fp == new_fp and new_fp:
-            return True
+    new = features or TextFeatures(new_text)
+    new_fp = new.fingerprint
 
-        # 2️⃣ Semantic similarity
-        old_norm = normalize(old_text)
-        ratio = SequenceMatcher(None, new_norm, old_norm).ratio()
+    # 1️⃣ Structure repeat = BLOCK
+    if new_fp:
+        for r in memory.recent(FINGERPRINT_WINDOW):
+            if r.fingerprint == new_fp:
+                return True
 
-        if ratio >= similarity_threshold:
-            return True
+    # 2️⃣ Semantic similarity against every stored review (LSH, sub-ms)
+    sig = (
+        new.minhash if isinstance(new, review_cache.ReviewEntry)
+        else minhash.signature(new_text, new.norm)
+    )
+    return memory.index.is_duplicate(sig, similarity_threshold)
 
-    return False
+async def is_fingerprint_duplicate(
+    business_id: str,
+    industry: str,
+    new_text: str,
+    similarity_threshold: float = minhash.SIMILARITY_THRESHOLD
+) -> bool:
+    memory = await get_fingerprint_memory(business_id, industry)
+    return matches_fingerprint(memory, new_text, similarity_threshold)
 
-def save_fingerprint(
+async def save_fingerprint(
     business_id: str,
     industry: str,
-    review_text: str
+    review_text: str,
+    entry: review_cache.ReviewEntry | None = None
 ):
-    supabase.table("review_memory").insert({
+    entry = entry or review_cache.ReviewEntry(review_text)
+
+    # write-behind: the cache sees it now, the DB on the next flush
+    write_behind.insert("review_memory", {
         "business_id": business_id,
         "industry": industry,
         "review_text": review_text,
-        "fingerprint": structure_fingerprint(review_text)
-    }).execute()
\ No newline at end of file
+        "fingerprint": entry.fingerprint,
+        "minhash": list(entry.minhash)
+    })
+
+    review_cache.append(business_id, industry, entry)
@@ -0,0 +1,192 @@
+# brain/minhash.py
+"""
+MinHash signatures + LSH index for the near-duplicate check.
+
+- shingles  = word bigrams of the normalized text
+- signature = NUM_BINS min-hashes, one-permutation hashing: each shingle
+              is hashed once into one of NUM_BINS bins, empty bins borrow
+              from a fixed probe order ("densification") → O(shingles),
+              ~0.1 ms per review (stored per review_memory row, `minhash`)
+- LSHIndex  = BANDS x ROWS banding over ALL signatures of one business;
+              a lookup only compares against the few rows sharing a band
+
+Calibrated against the old SequenceMatcher ratio >= 0.55 rule
+(benchmarks/compare_minhash.py): at 0.20 estimated Jaccard ~0.84 of the
+pairs the old rule flagged are flagged (character 5-grams at 0.45: ~0.76),
+no unrelated review is flagged against a 10k-review history, and a lookup
+in that history takes ~0.2 ms. Not lower: reviews of one business share
+boilerplate ("I recently visited <shop> ...", openings / endings of one
+batch), which alone puts unrelated drafts at ~0.15. Changing NUM_BINS / the shingles makes
+stored signatures stale (from_db → None, recomputed like legacy rows).
+Pure python, no DB / network imports here.
+"""
+import sys
+import random
+import zlib
+import unicodedata
+from array import array
+from bisect import bisect_left
+from itertools import repeat
+from operator import lshift, or_
+
+from app.brain.text_analysis import normalize
+
+NUM_BINS = 128
+BANDS = 64
+ROWS = NUM_BINS // BANDS        # 2 → P(candidate | J = 0.20) ≈ 0.93
+SIMILARITY_THRESHOLD = 0.20
+MERGE_EVERY = 64                # appended signatures scanned linearly until merged
+
+_BIN_BITS = NUM_BINS.bit_length() - 1
+_MASK64 = (1 << 64) - 1
+_MASK32 = (1 << 32) - 1
+_EMPTY = 1 << 32
+
+# fixed seed: signatures must stay comparable across workers / deploys
+_rng = random.Random(20261018)
+_MULT = _rng.getrandbits(64) | 1
+_PROBES = []
+for _bin in range(NUM_BINS):
+    _order = [b for b in range(NUM_BINS) if b != _bin]
+    _rng.shuffle(_order)
+    _PROBES.append(_order)
+
+
+# ---------- SIGNATURE ----------
+
+def _words(text: str, norm: str) -> list[str]:
+    if text.isascii():
+        return norm.split()
+    # normalize() keeps a-z only → other scripts (Hindi, ...) keep letters + marks
+    return "".join(
+        c if unicodedata.category(c)[0] in "LMN" else " " for c in text.lower()
+    ).split()
+
+
+def shingles(text: str, norm: str | None = None) -> set[int]:
+    w = _words(text, normalize(text) if norm is None else norm)
+    if len(w) < 2:
+        return {zlib.crc32(" ".join(w).encode())}
+    return {zlib.crc32(f"{a} {b}".encode()) for a, b in zip(w, w[1:])}
+
+
+def signature(text: str, norm: str | None = None) -> array:
+    bins = [_EMPTY] * NUM_BINS
+    for h in shingles(text or "", norm):
+        h = h * _MULT & _MASK64                 # multiply-shift: top bits → bin
+        b = h >> (64 - _BIN_BITS)
+        v = h >> 16 & _MASK32
+        if v < bins[b]:
+            bins[b] = v
+
+    sig = array("I", bytes(4 * NUM_BINS))
+    for b, v in enumerate(bins):
+        if v == _EMPTY:
+            for other in _PROBES[b]:
+                if bins[other] != _EMPTY:
+                    v = bins[other]
+                    break
+        sig[b] = v
+    return sig
+
+
+def from_db(value) -> array | None:
+    """
+    review_memory.minhash (bigint[]) → signature, None if missing / stale size.
+    """
+    if not value or len(value) != NUM_BINS:
+        return None
+    return array("I", value)
+
+
+def similarity(a: array, b: array) -> float:
+    """
+    Estimated Jaccard similarity of two signatures.
+    """
+    return sum(x == y for x, y in zip(a, b)) / NUM_BINS
+
+
+# ---------- LSH INDEX ----------
+# In the index a signature is ONE int: the low 16 bits of every bin, bin i
+# at bits 16*i (a 1-in-65536 false match per bin, negligible). Equal bins
+# are then counted with a few big-int ops instead of a python loop, and
+# band j is bits 32*j..32*j+31 (ROWS = 2 bins).
+
+_LOW16 = slice(0, None, 2) if sys.byteorder == "little" else slice(1, None, 2)
+_LANE_LOW = int.from_bytes(b"\xff\x7f" * NUM_BINS, "little")
+_LANE_HIGH = int.from_bytes(b"\x00\x80" * NUM_BINS, "little")
+
+
+def _pack(sig: array) -> int:
+    return int.from_bytes(array("H", sig.tobytes())[_LOW16].tobytes(), "little")
+
+
+def _equal_bins(a: int, b: int) -> int:
+    x = a ^ b
+    # high bit of a lane set ⇔ that lane of x is non-zero
+    return NUM_BINS - ((((x & _LANE_LOW) + _LANE_LOW) | x) & _LANE_HIGH).bit_count()
+
+
+class LSHIndex:
+    """
+    Append-only. Each band is a sorted array("Q") of (band key << 32 | row):
+    8 bytes per row and band, bisect lookups. Rows added one by one are
+    compared linearly until MERGE_EVERY of them are merged into the bands.
+    """
+    __slots__ = ("signatures", "bands", "banded")
+
+    def __init__(self, signatures=()):
+        self.signatures = []                # packed, insertion order
+        self.bands = [array("Q") for _ in range(BANDS)]
+        self.banded = 0                     # signatures[:banded] are in the bands
+        self.extend(signatures)
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def add(self, sig: array):
+        self.signatures.append(_pack(sig))
+        if len(self.signatures) - self.banded >= MERGE_EVERY:
+            self._merge()
+
+    def extend(self, signatures):
+        self.signatures.extend(map(_pack, signatures))
+        self._merge()
+
+    def _merge(self):
+        start, end = self.banded, len(self.signatures)
+        if start == end:
+            return
+
+        # row-major band keys of the new rows (BANDS per row)
+        keys = array("I", b"".join(
+            s.to_bytes(2 * NUM_BINS, "little") for s in self.signatures[start:end]
+        ))
+        if sys.byteorder != "little":
+            keys.byteswap()
+
+        for j in range(BANDS):
+            new = map(or_, map(lshift, keys[j::BANDS], repeat(32)), range(start, end))
+            # two sorted runs → timsort merges them in linear time
+            self.bands[j] = array("Q", sorted([*self.bands[j], *new]))
+
+        self.banded = end
+
+    def is_duplicate(self, sig: array, threshold: float = SIMILARITY_THRESHOLD) -> bool:
+        q = _pack(sig)
+        need = threshold * NUM_BINS
+        signatures = self.signatures
+        seen = set()
+
+        for j, band in enumerate(self.bands):
+            key = q >> (32 * j) & _MASK32
+            p = bisect_left(band, key << 32)
+            while p < len(band) and band[p] >> 32 == key:
+                row = band[p] & _MASK32
+                p += 1
+                if row not in seen:
+                    seen.add(row)
+                    if _equal_bins(q, signatures[row]) >= need:
+                        return True
+
+        return any(_equal_bins(q, s) >= need for s in signatures[self.banded:])
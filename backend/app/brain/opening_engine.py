@@ -1,17 +1,20 @@
+import json
 import random
-import os
-from supabase import create_client
-from datetime import datetime
-from app.core.openai_client import client   # ✅ already used infra
-
-supabase = create_client(
-    os.getenv("SUPABASE_URL"),
-    os.getenv("SUPABASE_SERVICE_KEY")
-)
+from app.core.openai_client import get_async_client   # ✅ already used infra
+from app.database.supabase import get_async_supabase
+from app.memory import phrase_usage
 
 # ---------------- CONFIG ----------------
 USAGE_LIMIT = 10
 
+# Batch-generated openings: one LLM call → BATCH_SIZE openings per
+# (business, industry, tone bucket, language), each served up to
+# BATCH_USAGE_LIMIT times before the pool counts as exhausted
+BATCH_SIZE = 24
+BATCH_USAGE_LIMIT = 1
+
+_refills = phrase_usage.RefillGate("opening_usage")
+
 # ⛑️ HARD FALLBACK POOLS (UNCHANGED)
 OPENING_POOLS = {
     "positive": [
@@ -33,120 +36,196 @@ def rating_bucket(rating: int) -> str:
     return "positive" if rating >= 4 else "neutral"
 
 
-def _mark_opening_used(
-    business_id: str,
-    industry: str,
-    opening: str
-):
-    supabase.table("opening_usage").upsert(
-        {
-            "business_id": business_id,
-            "industry": industry,
-            "opening_text": opening,
-            "usage_count": 1,
-            "last_used": datetime.utcnow().isoformat()
-        },
-        on_conflict="business_id,industry,opening_text"
-    ).execute()
-
-
-# ---------------- AI OPENING GENERATOR ----------------
-def _generate_ai_opening(
+async def _usage(business_id: str, industry: str) -> phrase_usage.PhraseUsage:
+    # usable opening_usage rows of this business: ONE query cold, zero warm
+    return await phrase_usage.get(
+        "opening_usage", "opening_text", business_id, industry, BATCH_USAGE_LIMIT
+    )
+
+
+# ---------------- AI OPENING BATCH GENERATOR ----------------
+OPENINGS_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "openings",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "openings": {"type": "array", "items": {"type": "string"}}
+            },
+            "required": ["openings"],
+            "additionalProperties": False
+        }
+    }
+}
+
+
+async def _generate_ai_openings(
     industry: str,
-    rating: int
-) -> str | None:
+    rating: int,
+    language: str,
+    count: int = BATCH_SIZE
+) -> list[str]:
     """
-    Generates a short, natural review opening.
-    Returns None if AI fails (so fallback can kick in).
+    ONE call → `count` short, natural review openings.
+    Returns [] if AI fails (so fallback can kick in).
     """
 
-    tone = "positive" if rating >= 4 else "neutral"
+    tone = rating_bucket(rating)
 
     prompt = (
-        f"Write ONE short, natural opening sentence for a Google review.\n"
+        f"Write {count} different short, natural opening sentences for Google reviews.\n"
         f"Industry: {industry}\n"
         f"Tone: {tone}\n"
+        f"Language: {language}\n"
         f"Rules:\n"
         f"- Human, casual\n"
+        f"- Every sentence starts differently\n"
         f"- No marketing words\n"
         f"- No emojis\n"
-        f"- Max 15 words\n"
+        f"- Max 15 words each\n"
         f"- Do NOT mention Google or rating\n"
     )
 
     try:
-        res = client.chat.completions.create(
+        res = await get_async_client().chat.completions.create(
             model="gpt-4o-mini",
             messages=[{"role": "user", "content": prompt}],
+            response_format=OPENINGS_SCHEMA,
             temperature=0.9
         )
 
-        text = res.choices[0].message.content.strip()
+        openings = json.loads(res.choices[0].message.content)["openings"]
+    except Exception:
+        return []
 
-        if len(text.split()) < 4:
-            return None
+    cleaned = []
+    for text in openings:
+        text = text.strip().rstrip(".")
+        if len(text.split()) >= 4 and text not in cleaned:
+            cleaned.append(text)
+
+    return cleaned
 
-        return text.rstrip(".")
-    except Exception:
-        return None
+
+async def _refill_batch_openings(
+    usage: phrase_usage.PhraseUsage,
+    rating: int,
+    language: str
+) -> list[str]:
+    """
+    Pool ran out → one LLM call generates a fresh batch,
+    stored in opening_usage (usage_count 0) for this business.
+    Single-flight per pool so a burst triggers only one call;
+    a failed / empty refill is not retried for REFILL_COOLDOWN.
+    """
+    business_id, industry = usage.business_id, usage.industry
+    bucket = rating_bucket(rating)
+    key = (business_id, industry, bucket, language)
+    if _refills.cooling(key):
+        return []       # last refill failed → static pool for now
+
+    async with _refills.lock(key):
+        # another request may have refilled (or failed) while we waited
+        available = usage.available(bucket, language, BATCH_USAGE_LIMIT)
+        if available:
+            return available
+
+        if _refills.cooling(key):
+            return []
+
+        openings = await _generate_ai_openings(industry, rating, language)
+        if not openings:
+            _refills.failed(key)
+            return []
+
+        # exhausted batches of this pool are dead weight from here on
+        await phrase_usage.prune(
+            "opening_usage", business_id, industry, bucket, language, BATCH_USAGE_LIMIT
+        )
+
+        try:
+            await get_async_supabase().table("opening_usage").upsert(
+                [
+                    {
+                        "business_id": business_id,
+                        "industry": industry,
+                        "opening_text": text,
+                        "bucket": bucket,
+                        "language": language,
+                        "usage_count": 0
+                    }
+                    for text in openings
+                ],
+                on_conflict="business_id,industry,opening_text",
+                ignore_duplicates=True
+            ).execute()
+        except Exception as e:
+            print("OPENING REFILL ERROR:", e)
+            _refills.failed(key)
+            return []
+
+        usage.add(openings, bucket, language)
+        return usage.available(bucket, language, BATCH_USAGE_LIMIT)
 
 
 # ---------------- CORE ----------------
-def pick_opening(
+async def pick_opening(
     business_id: str,
     industry: str,
-    rating: int
+    rating: int,
+    language: str = "English",
+    book: bool = True,
+    exclude=()
 ) -> str:
     """
     Production-grade opening picker
-    ✔ AI-generated dynamic opening (PRIMARY)
+    ✔ Batch AI-generated openings, served from DB (PRIMARY, no LLM call)
+    ✔ One usage read per business (cached), selection in memory
+    ✔ Pool empty → one LLM call refills a whole batch
     ✔ DB exhaustion protection
     ✔ Hard fallback pool (NEVER FAILS)
+
+    book=False → usage not counted (draft pool: mark_opening_used on serve)
+    exclude    → openings to avoid (held by pooled drafts)
     """
 
-    # ✅ 1️⃣ TRY AI FIRST
-    ai_opening = _generate_ai_opening(industry, rating)
-    if ai_opening:
-        _mark_opening_used(business_id, industry, ai_opening)
-        return ai_opening
+    usage = await _usage(business_id, industry)
+    opening = await _choose(usage, rating, language, exclude)
+
+    if book:
+        usage.use(opening)
+    return opening
+
 
-    # ⛑️ 2️⃣ FALLBACK TO EXISTING POOL (UNCHANGED LOGIC)
+def mark_opening_used(business_id: str, industry: str, opening: str):
+    phrase_usage.mark_used("opening_usage", "opening_text", business_id, industry, opening)
+
+
+async def _choose(
+    usage: phrase_usage.PhraseUsage,
+    rating: int,
+    language: str,
+    exclude
+) -> str:
+    # ✅ 1️⃣ BATCH POOL FIRST
     bucket = rating_bucket(rating)
+    available = usage.available(bucket, language, BATCH_USAGE_LIMIT)
+
+    if not available:
+        available = await _refill_batch_openings(usage, rating, language)
+
+    if available:
+        return random.choice([o for o in available if o not in exclude] or available)
+
+    # ⛑️ 2️⃣ FALLBACK TO EXISTING POOL (counts from the same usage map)
     pool = OPENING_POOLS.get(bucket, OPENING_POOLS["positive"])
     random.shuffle(pool)
 
     for opening in pool:
-        resp = (
-            supabase
-            .table("opening_usage")
-            .select("usage_count")
-            .eq("business_id", business_id)
-            .eq("industry", industry)
-            .eq("opening_text", opening)
-            .maybe_single()
-            .execute()
-        )
-
-        row = resp.data if resp else None
-
-        if not row or row.get("usage_count", 0) < USAGE_LIMIT:
-            _mark_opening_used(business_id, industry, opening)
+        if usage.count(opening) < USAGE_LIMIT and opening not in exclude:
             return opening
 
     # -------- HARD FALLBACK (NEVER FAILS) --------
-    least_resp = (
-        supabase
-        .table("opening_usage")
-        .select("opening_text")
-        .eq("business_id", business_id)
-        .eq("industry", industry)
-        .order("usage_count", desc=False)
-        .limit(1)
-        .execute()
-    )
-
-    least = least_resp.data or []
-    opening = least[0]["opening_text"] if least else random.choice(pool)
-
-    _mark_opening_used(business_id, industry, opening)
-    return opening
\ No newline at end of file
+    return usage.least_used(bucket, language) or min(pool, key=usage.count)
@@ -36,12 +36,15 @@ def build_prompt(
     area = ranked.get("area", [])
     seo = ranked.get("seo", [])
 
-    prompt = f"""
-Start the review naturally like this:
-"{opening}"
-
-Continue naturally as a real human would.
+    # Structured mode asks the model for its own opening
+    opening_block = (
+        f'Start the review naturally like this:\n"{opening}"\n\n'
+        f"Continue naturally as a real human would.\n"
+        if opening else ""
+    )
 
+    prompt = f"""
+{opening_block}
 Write a REAL human Google review.
 
 Language: {language}
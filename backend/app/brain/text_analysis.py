@@ -0,0 +1,118 @@
+# brain/text_analysis.py
+"""
+Pure text helpers shared by the duplicate / similarity checks
+(fingerprint_checker, anti_spam, memory.review_cache).
+No DB / network imports here.
+
+TextFeatures = every feature those checks compare, from ONE pass over
+the text; the single-feature helpers below give the same values.
+"""
+import re
+from collections import Counter
+
+_SENTENCE_SPLIT = re.compile(r"[.!?]+")
+_WORD = re.compile(r"\w+")
+_NOT_ALNUM = re.compile(r"[^a-z0-9\s]")
+
+MEANING_BUCKETS = {
+    "emotion": ("happy", "satisfied", "comfortable", "relaxed", "impressed", "great"),
+    "service": ("staff", "service", "team", "helpful", "support"),
+    "experience": ("experience", "visit", "time", "process"),
+}
+
+# ---------- TOKENS ----------
+
+def sentences(text: str) -> list[str]:
+    return [s.strip() for s in re.split(r"[.!?]+", text) if s.strip()]
+
+def words(text: str) -> list[str]:
+    return re.findall(r"\w+", (text or "").lower())
+
+def normalize(text: str) -> str:
+    text = text.lower()
+    text = re.sub(r"[^a-z0-9\s]", "", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    return text
+
+# ---------- STRUCTURE FINGERPRINT ----------
+
+def structure_fingerprint(text: str) -> str:
+    """
+    Sentence length pattern fingerprint
+    S = short, M = medium, L = long
+    """
+    sentences = re.split(r"[.!?]", text)
+    pattern = []
+
+    for s in sentences:
+        w = len(s.strip().split())
+        if w == 0:
+            continue
+        if w <= 6:
+            pattern.append("S")
+        elif w <= 14:
+            pattern.append("M")
+        else:
+            pattern.append("L")
+
+    return "-".join(pattern)
+
+# ---------- OPENING / ENDING ----------
+
+def opening_phrase(text: str) -> str:
+    s = sentences(text)
+    return " ".join(words(s[0])[:6]) if s else ""
+
+def ending_phrase(text: str) -> str:
+    s = sentences(text)
+    return " ".join(words(s[-1])[-6:]) if s else ""
+
+# ---------- MEANING FINGERPRINT ----------
+
+def meaning_signature(text: str) -> Counter:
+    """
+    Rough semantic weight (emotion + experience)
+    """
+    return _meaning(words(text))
+
+def _meaning(tokens: list[str]) -> Counter:
+    # one count over the tokens, not one scan per vocabulary word
+    counts = Counter(tokens)
+    return Counter({
+        k: sum(counts[v] for v in vocab)
+        for k, vocab in MEANING_BUCKETS.items()
+    })
+
+# ---------- ALL FEATURES, ONE PASS ----------
+
+class TextFeatures:
+    """
+    Sentences split once, each sentence tokenised once; the structure
+    fingerprint, word set, opening / ending and meaning signature all
+    come from those tokens. Same values as the helpers above.
+    """
+    __slots__ = ("norm", "fingerprint", "words", "opening", "ending", "meaning")
+
+    def __init__(self, text: str):
+        lower = (text or "").lower()
+        pattern = []
+        tokens = []
+        first = last = None
+
+        for s in _SENTENCE_SPLIT.split(lower):
+            w = len(s.split())
+            if w == 0:
+                continue
+            pattern.append("S" if w <= 6 else "M" if w <= 14 else "L")
+
+            last = _WORD.findall(s)
+            if first is None:
+                first = last
+            tokens += last
+
+        self.norm = " ".join(_NOT_ALNUM.sub("", lower).split())
+        self.fingerprint = "-".join(pattern)
+        self.words = set(tokens)
+        self.opening = " ".join(first[:6]) if first else ""
+        self.ending = " ".join(last[-6:]) if last else ""
+        self.meaning = _meaning(tokens)
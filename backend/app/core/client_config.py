@@ -0,0 +1,144 @@
+# core/client_config.py
+"""
+Client configuration cache (per worker).
+
+Replaces the `clients` + `client_types(*)` join done on every
+/api/generate-review, /public-client/{id} and /r/{token}:
+- clients      → one row per client, TTL CONFIG_TTL, LRU MAX_CLIENTS;
+                 an entry never outlives its end_date (IST)
+- client_types → whole table cached separately (tiny, rarely changes)
+- unknown client ids are cached for MISS_TTL (negative cache)
+
+get_client() returns the same shape as the old join:
+client row + "client_types" (type row or None).
+
+Admin edits happen in the dashboard (supabase-js) → the frontend calls
+/admin/cache/... (routes/client_cache.py) → invalidate_*().
+Other workers pick a client edit up within qr_cache.POLL_INTERVAL
+(qr_cache.poll → invalidate_client); CONFIG_TTL is only the backstop.
+"""
+import time
+import asyncio
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+
+from app.core import metrics, qr_cache
+from app.database.supabase import get_async_supabase
+
+# ---------------- CONFIG ----------------
+CONFIG_TTL = 5 * 60       # seconds
+MISS_TTL = 30             # seconds, unknown client ids
+MAX_CLIENTS = 2000        # LRU bound
+TYPES_TTL = 30 * 60       # seconds
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+_clients: "OrderedDict[str, tuple[float, dict | None]]" = OrderedDict()
+_locks: dict = {}
+_version = 0              # bumped on every invalidation
+_types: tuple[float, dict] | None = None      # (expires_at, {id: type row})
+_types_lock = asyncio.Lock()
+
+
+def _expires_at(client: dict) -> float:
+    ttl = CONFIG_TTL
+
+    end_date = client.get("end_date")
+    if end_date:
+        # service stops at IST midnight after end_date
+        end = date.fromisoformat(str(end_date)[:10]) + timedelta(days=1)
+        end_ts = datetime(end.year, end.month, end.day, tzinfo=IST).timestamp()
+        remaining = end_ts - time.time()
+        if remaining > 0:
+            # already expired clients keep the normal TTL (status won't flip back)
+            ttl = min(ttl, remaining)
+
+    return time.monotonic() + ttl
+
+
+# ---------------- CLIENT TYPES ----------------
+
+async def get_client_types() -> dict:
+    global _types
+
+    if _types and _types[0] > time.monotonic():
+        return _types[1]
+
+    async with _types_lock:
+        if _types and _types[0] > time.monotonic():
+            return _types[1]
+
+        res = await get_async_supabase().table("client_types").select("*").execute()
+        _types = (
+            time.monotonic() + TYPES_TTL,
+            {t["id"]: t for t in res.data or []}
+        )
+        return _types[1]
+
+
+# ---------------- CLIENTS ----------------
+
+async def get_client(client_id: str) -> dict | None:
+    entry = _clients.get(client_id)
+
+    if entry and entry[0] > time.monotonic():
+        _clients.move_to_end(client_id)
+        metrics.incr("client_config.hit")
+        client = entry[1]
+    else:
+        # single-flight: a QR burst for one client shares one query
+        lock = _locks.setdefault(client_id, asyncio.Lock())
+        async with lock:
+            entry = _clients.get(client_id)
+            if entry and entry[0] > time.monotonic():
+                metrics.incr("client_config.hit")
+                client = entry[1]
+            else:
+                metrics.incr("client_config.miss")
+                client = await _load(client_id)
+
+    if client is None:
+        return None
+
+    types = await get_client_types()
+    return {**client, "client_types": types.get(client.get("type_id"))}
+
+
+async def _load(client_id: str) -> dict | None:
+    version = _version
+
+    res = await (
+        get_async_supabase()
+        .table("clients")
+        .select("*")
+        .eq("id", client_id)
+        .execute()
+    )
+
+    client = res.data[0] if res.data else None
+
+    # invalidated while we were reading → don't cache the old config
+    if version == _version:
+        expires_at = _expires_at(client) if client else time.monotonic() + MISS_TTL
+        _clients[client_id] = (expires_at, client)
+        _clients.move_to_end(client_id)
+
+        while len(_clients) > MAX_CLIENTS:
+            old, _ = _clients.popitem(last=False)
+            _locks.pop(old, None)
+
+    return client
+
+
+# ---------------- INVALIDATION ----------------
+
+def invalidate_client(client_id: str):
+    global _version
+    _version += 1
+    _clients.pop(client_id, None)
+    qr_cache.invalidate_client(client_id)
+
+
+def invalidate_client_types():
+    global _types
+    _types = None
@@ -1,18 +1,60 @@
-from datetime import date
+from datetime import datetime, date, timezone, timedelta
 from fastapi import HTTPException
 
+# ---------- IST TIMEZONE ----------
+IST = timezone(timedelta(hours=5, minutes=30))
+
+STATUS_MESSAGES = {
+    "inactive": "Service inactive",
+    "not_started": "Service not started",
+    "expired": "Service expired",
+}
+
+
+# ---------- DATE HELPER ----------
+def to_date(value):
+    if not value:
+        return None
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+    except Exception:
+        return None
+
+
+def client_status(client: dict) -> str | None:
+    """
+    None → service allowed, otherwise the reason
+    ("inactive" / "not_started" / "expired").
+    """
+
+    # 🔴 Manual active switch (soft stop)
+    if client.get("is_active") is False:
+        return "inactive"
+
+    # 🔴 Date based window (IST – production safe)
+    start_date = to_date(client.get("start_date"))
+    end_date = to_date(client.get("end_date"))
+
+    if start_date or end_date:
+        today = datetime.now(IST).date()
+
+        if start_date and today < start_date:
+            return "not_started"
+
+        if end_date and today > end_date:
+            return "expired"
+
+    return None
+
+
 def check_client_status(client: dict):
-    # 1️⃣ inactive check
-    if not client.get("is_active"):
-        raise HTTPException(
-            status_code=403,
-            detail="This review link is inactive"
-        )
-
-    # 2️⃣ expiry check
-    end_date = client.get("end_date")
-    if end_date and date.today() > date.fromisoformat(end_date):
-        raise HTTPException(
-            status_code=403,
-            detail="This service has expired"
-        )
+    """
+    CENTRAL SINGLE SOURCE OF TRUTH
+    Used by admin-data (AI generation), public-client and /r/{token}.
+    """
+    status = client_status(client)
+
+    if status:
+        raise HTTPException(status_code=403, detail=STATUS_MESSAGES[status])
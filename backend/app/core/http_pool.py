@@ -0,0 +1,125 @@
+# core/http_pool.py
+"""
+Shared keep-alive HTTP pools for outbound calls (per worker).
+
+One pooled httpx client per dependency, reused by every module:
+- Supabase PostgREST → database/supabase.py (sync + async client)
+- OpenAI             → core/openai_client.py
+
+Pool size per dependency comes from env (<NAME>_POOL_MAX,
+<NAME>_POOL_KEEPALIVE), so it can be sized per worker.
+
+Metrics (per host):
+- http.requests.<host>     → requests sent
+- http.connections.<host>  → new TCP connections opened
+  (requests / connections = reuse ratio)
+- stats()                  → open / idle connections right now
+
+aclose() closes all pools (app lifespan shutdown).
+"""
+import os
+import httpx
+
+from app.core import metrics
+
+# ---------------- CONFIG ----------------
+DEFAULT_POOL_MAX = 50           # connections per pool
+DEFAULT_POOL_KEEPALIVE = 20     # idle connections kept open
+KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))    # seconds
+
+_clients: dict = {}             # name → httpx.Client / httpx.AsyncClient
+
+
+def limits(name: str) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=int(os.getenv(f"{name}_POOL_MAX", DEFAULT_POOL_MAX)),
+        max_keepalive_connections=int(os.getenv(f"{name}_POOL_KEEPALIVE", DEFAULT_POOL_KEEPALIVE)),
+        keepalive_expiry=KEEPALIVE_EXPIRY
+    )
+
+
+# ---------------- COUNTING HOOKS ----------------
+# event hooks + the httpcore "trace" extension instead of custom
+# transports: works for httpx and the httpx fork openai ships with.
+
+def _sync_hook(request):
+    host = request.url.host
+    metrics.incr(f"http.requests.{host}")
+
+    def trace(event, info):
+        if event == "connection.connect_tcp.complete":
+            metrics.incr(f"http.connections.{host}")
+
+    request.extensions.setdefault("trace", trace)
+
+
+async def _async_hook(request):
+    host = request.url.host
+    metrics.incr(f"http.requests.{host}")
+
+    async def trace(event, info):
+        if event == "connection.connect_tcp.complete":
+            metrics.incr(f"http.connections.{host}")
+
+    request.extensions.setdefault("trace", trace)
+
+
+# ---------------- CLIENTS ----------------
+
+def sync_client(name: str, **kwargs) -> httpx.Client:
+    client = httpx.Client(
+        limits=limits(name),
+        event_hooks={"request": [_sync_hook]},
+        **kwargs
+    )
+    _clients[name.lower()] = client
+    return client
+
+
+def async_client(name: str, cls=httpx.AsyncClient, **kwargs):
+    """
+    cls → async client class (e.g. openai.DefaultAsyncHttpxClient).
+    """
+    client = cls(
+        limits=limits(name),
+        event_hooks={"request": [_async_hook]},
+        **kwargs
+    )
+    _clients[f"{name.lower()}_async"] = client
+    return client
+
+
+async def aclose():
+    """
+    Close every pool (app shutdown). The getters build new clients
+    on next use (they check is_closed).
+    """
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        try:
+            if hasattr(client, "aclose"):
+                await client.aclose()
+            else:
+                client.close()
+        except Exception as e:
+            print("HTTP POOL CLOSE ERROR:", e)
+
+
+def stats() -> dict:
+    """
+    {pool: {host: {"open", "idle"}}} for GET /admin/metrics.
+    """
+    out = {}
+    for name, client in _clients.items():
+        # benchmarks swap in MockTransport → no pool to inspect
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        hosts = {}
+        for conn in getattr(pool, "connections", []):
+            origin = getattr(conn, "_origin", None)
+            host = origin.host.decode() if origin else "?"
+            entry = hosts.setdefault(host, {"open": 0, "idle": 0})
+            entry["open"] += 1
+            entry["idle"] += conn.is_idle()
+        out[name] = hosts
+    return out
@@ -0,0 +1,69 @@
+# core/metrics.py
+"""
+Tiny in-process metrics (per worker).
+
+- counters:   incr("review.generated")
+- histograms: observe("review.latency_ms", 812.4)
+  (bounded reservoir of the latest samples → p50 / p90 / p99)
+- gauges:     gauge("draft_pool.drafts", 12)   (last value wins)
+
+Read via snapshot() / GET /admin/metrics.
+"""
+import threading
+from collections import defaultdict, deque
+
+RESERVOIR_SIZE = 2048
+
+_lock = threading.Lock()
+_counters = defaultdict(int)
+_histograms = defaultdict(lambda: deque(maxlen=RESERVOIR_SIZE))
+_gauges = {}
+
+
+def incr(name: str, value: int = 1):
+    with _lock:
+        _counters[name] += value
+
+
+def observe(name: str, value: float):
+    with _lock:
+        _histograms[name].append(value)
+
+
+def gauge(name: str, value: float):
+    with _lock:
+        _gauges[name] = value
+
+
+def _percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    idx = min(int(round(pct / 100 * (len(values) - 1))), len(values) - 1)
+    return round(values[idx], 1)
+
+
+def snapshot() -> dict:
+    with _lock:
+        counters = dict(_counters)
+        gauges = dict(_gauges)
+        samples = {k: sorted(v) for k, v in _histograms.items()}
+
+    histograms = {}
+    for name, values in samples.items():
+        histograms[name] = {
+            "count": len(values),
+            "mean": round(sum(values) / len(values), 1) if values else 0.0,
+            "p50": _percentile(values, 50),
+            "p90": _percentile(values, 90),
+            "p99": _percentile(values, 99),
+            "max": round(values[-1], 1) if values else 0.0
+        }
+
+    return {"counters": counters, "gauges": gauges, "histograms": histograms}
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+        _gauges.clear()
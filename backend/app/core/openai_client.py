@@ -1,9 +1,41 @@
 import os
-from openai import OpenAI
-from dotenv import load_dotenv
+import threading
 
-load_dotenv(override=True)
+from app.core import http_pool
 
-client = OpenAI(
-    api_key=os.getenv("OPENAI_API_KEY").strip()
-)
\ No newline at end of file
+# Async client: the review pipeline awaits OpenAI instead of
+# holding a threadpool thread for every completion.
+# One shared keep-alive pool (OPENAI_POOL_MAX / OPENAI_POOL_KEEPALIVE).
+#
+# `openai` is the heaviest import in the app (~0.8 s), so it is loaded
+# on first use; the lifespan preloads it off the event loop (preload()).
+
+_async_client = None
+_lock = threading.Lock()
+
+
+def get_async_client():
+    global _async_client
+
+    if _async_client is None or _async_client.is_closed():
+        with _lock:
+            if _async_client is None or _async_client.is_closed():
+                from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+                api_key = (os.getenv("OPENAI_API_KEY") or "").strip()
+                if not api_key:
+                    raise RuntimeError("OPENAI_API_KEY missing")
+
+                _async_client = AsyncOpenAI(
+                    api_key=api_key,
+                    http_client=http_pool.async_client("OPENAI", cls=DefaultAsyncHttpxClient)
+                )
+    return _async_client
+
+
+def preload():
+    """
+    Import openai (no client, no key needed) → run via asyncio.to_thread
+    so the first review request doesn't pay the import on the loop.
+    """
+    import openai  # noqa: F401
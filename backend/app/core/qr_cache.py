@@ -0,0 +1,146 @@
+# core/qr_cache.py
+"""
+QR token → {client_id, is_active, client} cache (per worker).
+
+client = {id, is_active, start_date, end_date} of the assigned client
+(None if unassigned / missing); token + client come from ONE
+resolve_qr_token RPC.
+
+- warm scan → zero DB calls
+- unknown tokens are cached too (negative cache, MISS_TTL)
+- QR admin routes (assign / unassign / disable) + dashboard edits
+  invalidate this worker right away
+- every worker polls qr_cache_changes (qr_tokens / clients updated_at)
+  each POLL_INTERVAL → a disabled / reassigned QR or an edited client
+  (client_config too) is dropped everywhere within seconds, one query
+  per worker per interval; TOKEN_TTL is only the backstop if polling fails
+- loop-only state: callers (routes, poller) run on the event loop,
+  never in the threadpool
+"""
+import time
+import asyncio
+from collections import OrderedDict
+
+from app.core import metrics
+from app.database.supabase import get_async_supabase
+
+# ---------------- CONFIG ----------------
+TOKEN_TTL = 5 * 60        # seconds
+MISS_TTL = 60             # seconds, invalid tokens
+MAX_TOKENS = 10000        # LRU bound
+POLL_INTERVAL = 5         # seconds between qr_cache_changes polls
+
+_tokens: "OrderedDict[str, tuple[float, dict | None]]" = OrderedDict()
+_locks: dict = {}
+_version = 0              # bumped on every invalidation
+_since = None             # DB time of the last poll
+_poller: asyncio.Task | None = None
+
+
+async def resolve(token: str) -> dict | None:
+    """
+    {"client_id", "is_active", "client"} or None (no such token).
+    """
+    entry = _tokens.get(token)
+
+    if entry and entry[0] > time.monotonic():
+        _tokens.move_to_end(token)
+        metrics.incr("qr_cache.hit")
+        return entry[1]
+
+    lock = _locks.setdefault(token, asyncio.Lock())
+    async with lock:
+        entry = _tokens.get(token)
+        if entry and entry[0] > time.monotonic():
+            metrics.incr("qr_cache.hit")
+            return entry[1]
+
+        metrics.incr("qr_cache.miss")
+        return await _load(token)
+
+
+async def _load(token: str) -> dict | None:
+    version = _version
+
+    # ONE round trip: token state + client active window (DB function)
+    res = await get_async_supabase().rpc("resolve_qr_token", {"p_token": token}).execute()
+
+    row = res.data or None
+
+    # invalidated while we were reading → don't cache the old state
+    if version == _version:
+        ttl = TOKEN_TTL if row else MISS_TTL
+        _tokens[token] = (time.monotonic() + ttl, row)
+        _tokens.move_to_end(token)
+
+        while len(_tokens) > MAX_TOKENS:
+            old, _ = _tokens.popitem(last=False)
+            _locks.pop(old, None)
+
+    return row
+
+
+def invalidate(token: str):
+    global _version
+    _version += 1
+    _tokens.pop(token, None)
+
+
+def invalidate_client(client_id: str):
+    """
+    Client edited → drop tokens carrying its old active window.
+    """
+    global _version
+    _version += 1
+    for token in [t for t, (_, row) in _tokens.items() if row and row.get("client_id") == client_id]:
+        _tokens.pop(token, None)
+
+
+# ---------------- CROSS-WORKER POLL ----------------
+
+async def poll():
+    """
+    ONE qr_cache_changes RPC: drop tokens / clients updated since last poll
+    (clients from client_config too, which drops their tokens here).
+    """
+    global _since
+
+    # lazy import: client_config imports this module
+    from app.core import client_config
+
+    res = await get_async_supabase().rpc("qr_cache_changes", {"p_since": _since}).execute()
+    changes = res.data or {}
+
+    for token in changes.get("tokens") or []:
+        invalidate(token)
+    for client_id in changes.get("clients") or []:
+        client_config.invalidate_client(client_id)
+
+    _since = changes.get("now") or _since
+
+
+def start():
+    global _poller
+
+    if _poller is None or _poller.done():
+        _poller = asyncio.create_task(_run())
+
+
+async def stop():
+    global _poller
+
+    if _poller:
+        _poller.cancel()
+        await asyncio.gather(_poller, return_exceptions=True)
+        _poller = None
+
+
+async def _run():
+    while True:
+        try:
+            await poll()
+        except Exception as e:
+            metrics.incr("qr_cache.poll_errors")
+            print("QR CACHE POLL ERROR:", e)
+
+        await asyncio.sleep(POLL_INTERVAL)
@@ -0,0 +1,268 @@
+# core/write_behind.py
+"""
+Write-behind queue for bookkeeping writes (review_memory, *_usage)
+and scan events (qr_review_logs).
+
+Request path only enqueues; a background worker flushes:
+- every FLUSH_INTERVAL seconds
+- as soon as BATCH_SIZE writes are queued
+- on shutdown (lifespan → stop())
+
+Rows for the same table go out as ONE bulk insert; usage counters are
+summed per key and sent as ONE `increment_<table>` RPC (atomic
+server-side increment).
+
+A write that failed on the way (transport error, 5xx, DB unavailable /
+deadlock / timeout) is requeued with exponential backoff (RETRY_BACKOFF,
+doubling up to MAX_BACKOFF). After MAX_RETRIES attempts droppable rows
+are dropped and counted; everything else keeps retrying at MAX_BACKOFF.
+Rows waiting for a retry count towards the depth.
+
+A write the DB rejected (4xx: constraint violation, bad column, ...)
+would fail the same way forever: the batch is split in halves right away
+so the good rows still land, and the bad row ends up alone → logged and
+counted as a dead letter (write_behind.dead_letter.<table>), not retried.
+
+Droppable rows (scan logs) are bounded: once MAX_DEPTH writes are
+queued they are dropped and counted (write_behind.dropped.<table>)
+instead of growing memory without limit under load (or a DB outage).
+
+Metrics: gauge write_behind.depth, gauge write_behind.retry_rows,
+write_behind.flush_ms, write_behind.rows.<table>,
+write_behind.dropped.<table>, write_behind.dead_letter.<table>,
+write_behind.errors, write_behind.retries
+"""
+import os
+import time
+import asyncio
+from postgrest.exceptions import APIError
+from app.core import metrics
+from app.database.supabase import get_async_supabase
+
+# ---------------- CONFIG ----------------
+BATCH_SIZE = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "50"))
+FLUSH_INTERVAL = float(os.getenv("WRITE_BEHIND_INTERVAL", "1.0"))    # seconds
+MAX_DEPTH = int(os.getenv("WRITE_BEHIND_MAX_DEPTH", "10000"))        # droppable rows only
+MAX_RETRIES = int(os.getenv("WRITE_BEHIND_MAX_RETRIES", "5"))
+RETRY_BACKOFF = 1.0          # seconds before the first retry, doubles per attempt
+MAX_BACKOFF = 60.0
+
+# SQLSTATE classes / PostgREST codes worth retrying: connection (08),
+# rollback / deadlock (40), resources (53), cancel / timeout (57),
+# system (58), PGRST0xx (DB unreachable / pool timeout)
+TRANSIENT_CODES = ("08", "40", "53", "57", "58", "PGRST0")
+
+_batches: dict = {}         # (table, droppable) → [row, ...]
+_counters: dict = {}        # table → {key values: row with usage_count}
+_retries: list = []         # [due, attempt, job] failed writes waiting for backoff
+_depth = 0
+_retry_rows = 0
+_wake: asyncio.Event | None = None
+_worker: asyncio.Task | None = None
+_stopping = False
+
+
+# ---------------- ENQUEUE ----------------
+
+def insert(table: str, row: dict, droppable: bool = False) -> bool:
+    """
+    droppable=True → dropped (and counted) when the queue is full.
+    Returns False if the row was dropped.
+    """
+    if droppable and _depth + _retry_rows >= MAX_DEPTH:
+        metrics.incr(f"write_behind.dropped.{table}")
+        return False
+
+    _batches.setdefault((table, droppable), []).append(row)
+    _queued()
+    return True
+
+
+def increment(table: str, row: dict, by: int = 1):
+    """
+    usage_count += by for the row identified by `row`
+    (server side, see increment_<table> in the migrations).
+    """
+    counters = _counters.setdefault(table, {})
+    key = tuple(row.values())
+
+    if key in counters:
+        counters[key]["usage_count"] += by
+    else:
+        counters[key] = {**row, "usage_count": by}
+    _queued()
+
+
+def depth() -> int:
+    return _depth + _retry_rows
+
+
+def _queued():
+    global _depth
+    _depth += 1
+    metrics.gauge("write_behind.depth", _depth + _retry_rows)
+
+    # no lifespan (scripts) → start lazily on the running loop
+    if _worker is None or _worker.done():
+        start()
+
+    if _depth >= BATCH_SIZE:
+        _wake.set()
+
+
+# ---------------- FLUSH ----------------
+
+async def flush(final: bool = False):
+    """
+    final=True (shutdown) → retries go out now, whatever their backoff.
+    """
+    global _batches, _counters, _depth, _retries, _retry_rows
+
+    now = time.monotonic()
+    due = [r for r in _retries if final or r[0] <= now]
+
+    if not _depth and not due:
+        return
+
+    batches, counters = _batches, _counters
+    _batches, _counters, _depth = {}, {}, 0
+    _retries = [r for r in _retries if not (final or r[0] <= now)]
+    _retry_rows -= sum(len(job[3]) for _, _, job in due)
+    _gauges()
+
+    start_t = time.perf_counter()
+    jobs = [_attempt(job, attempt) for _, attempt, job in due]
+
+    for (table, droppable), rows in batches.items():
+        # bulk payloads need one column set per request
+        by_columns: dict = {}
+        for row in rows:
+            by_columns.setdefault(frozenset(row), []).append(row)
+
+        for group in by_columns.values():
+            jobs.append(_attempt(("insert", table, droppable, group), 0))
+
+    for table, rows in counters.items():
+        jobs.append(_attempt(("increment", table, False, list(rows.values())), 0))
+
+    await asyncio.gather(*jobs)
+    metrics.observe("write_behind.flush_ms", (time.perf_counter() - start_t) * 1000)
+
+
+def _gauges():
+    metrics.gauge("write_behind.depth", _depth + _retry_rows)
+    metrics.gauge("write_behind.retry_rows", _retry_rows)
+
+
+async def _attempt(job: tuple, attempt: int):
+    # job → (op, table, droppable, rows); attempt → retries so far
+    op, table, droppable, rows = job
+    try:
+        if op == "increment":
+            await _increment(table, rows)
+        else:
+            await _insert(table, rows)
+        metrics.incr(f"write_behind.rows.{table}", len(rows))
+    except Exception as e:
+        metrics.incr("write_behind.errors")
+        if _permanent(e):
+            print("WRITE BEHIND REJECTED:", op, table, f"({len(rows)} rows)", e)
+            await _isolate(job, attempt)
+        else:
+            print("WRITE BEHIND ERROR:", op, table, f"(attempt {attempt + 1})", e)
+            _requeue(job, attempt)
+
+
+def _permanent(e: Exception) -> bool:
+    """
+    True → the DB rejected the write itself, retrying can't help.
+    """
+    if not isinstance(e, APIError):
+        return False        # transport error / timeout
+    code = e.code
+    if isinstance(code, int):
+        # no JSON body (proxy / gateway) → HTTP status
+        return code < 500 and code != 429
+    return bool(code) and not str(code).startswith(TRANSIENT_CODES)
+
+
+async def _isolate(job: tuple, attempt: int):
+    op, table, droppable, rows = job
+
+    if len(rows) == 1:
+        metrics.incr(f"write_behind.dead_letter.{table}")
+        print("WRITE BEHIND DEAD LETTER:", op, table, rows[0])
+        return
+
+    # one statement fails as a whole → halves, the good rows still land
+    mid = len(rows) // 2
+    await asyncio.gather(
+        _attempt((op, table, droppable, rows[:mid]), attempt),
+        _attempt((op, table, droppable, rows[mid:]), attempt)
+    )
+
+
+def _requeue(job: tuple, attempt: int):
+    global _retry_rows
+
+    _, table, droppable, rows = job
+    if droppable and attempt >= MAX_RETRIES:
+        metrics.incr(f"write_behind.dropped.{table}", len(rows))
+        return
+
+    delay = min(RETRY_BACKOFF * 2 ** min(attempt, 16), MAX_BACKOFF)
+    _retries.append([time.monotonic() + delay, attempt + 1, job])
+    _retry_rows += len(rows)
+    metrics.incr("write_behind.retries")
+    _gauges()
+
+
+async def _insert(table: str, rows: list):
+    await get_async_supabase().table(table).insert(rows).execute()
+
+
+async def _increment(table: str, rows: list):
+    await get_async_supabase().rpc(f"increment_{table}", {"p_rows": rows}).execute()
+
+
+# ---------------- WORKER ----------------
+
+def start():
+    global _worker, _wake, _stopping
+
+    if _worker is None or _worker.done():
+        _stopping = False
+        _wake = asyncio.Event()
+        _worker = asyncio.create_task(_run())
+
+
+async def stop():
+    """
+    Graceful shutdown: drain everything still queued (one last attempt
+    for rows waiting on a retry; what still fails is reported and lost).
+    """
+    global _worker, _stopping, _retries, _retry_rows
+
+    if _worker:
+        _stopping = True
+        _wake.set()
+        await _worker
+        _worker = None
+
+    await flush(final=True)
+
+    if _retries:
+        print("WRITE BEHIND: unwritten at shutdown:", _retry_rows, "rows")
+        _retries, _retry_rows = [], 0
+        _gauges()
+
+
+async def _run():
+    while not _stopping:
+        try:
+            await asyncio.wait_for(_wake.wait(), timeout=FLUSH_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        _wake.clear()
+
+        await flush()
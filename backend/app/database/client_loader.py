@@ -1,16 +1,9 @@
 # database/client_loader.py
-from database.supabase import supabase
+from app.core import client_config
 
-def load_client_data(client_id: str):
-    client = (
-        supabase
-        .table("clients")
-        .select("* , client_types(*)")
-        .eq("id", client_id)
-        .single()
-        .execute()
-        .data
-    )
+async def load_client_data(client_id: str):
+    # same cached client + client_types config the routes use
+    client = await client_config.get_client(client_id)
 
     if not client:
         return None
@@ -36,4 +29,4 @@ def load_client_data(client_id: str):
             or []
         ),
         "industry": ctype.get("type_name")
-    }
\ No newline at end of file
+    }
@@ -1,13 +1,56 @@
 import os
-from supabase import create_client
-from dotenv import load_dotenv
+from postgrest import SyncPostgrestClient, AsyncPostgrestClient
+from postgrest.constants import DEFAULT_POSTGREST_CLIENT_TIMEOUT
 
-load_dotenv()
+from app.core import http_pool
 
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
+# The backend only talks to PostgREST (tables + RPCs), so both clients
+# are plain PostgREST clients on ONE shared keep-alive pool each
+# (sized via SUPABASE_POOL_MAX / SUPABASE_POOL_KEEPALIVE, see core/http_pool).
+# Built on first use (or in the app lifespan), never at import time,
+# closed by the lifespan (http_pool.aclose) and rebuilt if used again;
+# every module goes through these getters, nothing else opens a client.
 
-if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
-    raise RuntimeError("Supabase env vars missing")
+_supabase: SyncPostgrestClient | None = None
+_async_supabase: AsyncPostgrestClient | None = None
 
-supabase = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
\ No newline at end of file
+
+def _settings() -> tuple[str, dict]:
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv("SUPABASE_SERVICE_KEY")
+
+    if not url or not key:
+        raise RuntimeError("Supabase env vars missing")
+
+    return f"{url}/rest/v1", {
+        "apikey": key,
+        "Authorization": f"Bearer {key}"
+    }
+
+
+def get_supabase() -> SyncPostgrestClient:
+    """Sync client for the plain `def` admin routes."""
+    global _supabase
+
+    if _supabase is None or _supabase.session.is_closed:
+        base_url, headers = _settings()
+        _supabase = SyncPostgrestClient(
+            base_url,
+            headers=headers,
+            http_client=http_pool.sync_client("SUPABASE", timeout=DEFAULT_POSTGREST_CLIENT_TIMEOUT)
+        )
+    return _supabase
+
+
+def get_async_supabase() -> AsyncPostgrestClient:
+    """Async client for the review generation path."""
+    global _async_supabase
+
+    if _async_supabase is None or _async_supabase.session.is_closed:
+        base_url, headers = _settings()
+        _async_supabase = AsyncPostgrestClient(
+            base_url,
+            headers=headers,
+            http_client=http_pool.async_client("SUPABASE", timeout=DEFAULT_POSTGREST_CLIENT_TIMEOUT)
+        )
+    return _async_supabase
@@ -1,3 +1,10 @@
+import asyncio
+from contextlib import asynccontextmanager
+from dotenv import load_dotenv
+
+# the only load_dotenv: clients read env lazily, after this
+load_dotenv()
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -9,8 +16,36 @@ from app.routes.qr_token import router as qr_token_router
 from app.routes.public_qr import router as public_qr_router
 from app.routes.qr_admin import router as qr_admin_router
 from app.routes.public_token import router as public_token_router
+from app.routes.metrics import router as metrics_router
+from app.routes.client_cache import router as client_cache_router
+
+from app.brain import draft_pool
+from app.core import write_behind, openai_client, http_pool, qr_cache
+from app.database.supabase import get_supabase, get_async_supabase
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # dependency clients: built here, not at import (missing env → fail fast)
+    get_supabase()
+    get_async_supabase()
+
+    # heavy openai import off the event loop; startup doesn't wait for it
+    preload = asyncio.create_task(asyncio.to_thread(openai_client.preload))
+
+    # background workers live as long as the app
+    draft_pool.start()
+    write_behind.start()
+    qr_cache.start()            # other workers' QR / client edits
+    yield
+    await qr_cache.stop()
+    await draft_pool.stop()
+    await write_behind.stop()   # flush queued bookkeeping writes
+    await preload
+    await http_pool.aclose()    # after the last flush used the pools
+
 
-app = FastAPI(title="GMB Lite AI Backend")
+app = FastAPI(title="GMB Lite AI Backend", lifespan=lifespan)
 
 # ✅ CORS (DEV + PROD SAFE)
 app.add_middleware(
@@ -34,6 +69,8 @@ app.include_router(qr_token_router)
 app.include_router(public_qr_router)
 app.include_router(qr_admin_router)
 app.include_router(public_token_router)
+app.include_router(metrics_router)
+app.include_router(client_cache_router)
 
 @app.get("/")
 def health():
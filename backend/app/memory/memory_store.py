@@ -1,31 +1,28 @@
 # app/memory/memory_store.py
 
-from app.database.supabase import supabase
+from app.core import write_behind
+from app.memory import review_cache
 
-# 1️⃣ Recent reviews nikalna (per business)
-def get_recent_reviews(business_id: str, industry: str, limit: int = 50):
-    res = (
-        supabase
-        .table("review_memory")
-        .select("review_text, fingerprint")
-        .eq("business_id", business_id)
-        .eq("industry", industry)
-        .order("created_at", desc=True)
-        .limit(limit)
-        .execute()
-    )
-    return res.data or []
+# 1️⃣ Recent reviews nikalna (per business) → ReviewEntry list, newest first
+async def get_recent_reviews(business_id: str, industry: str, limit: int = 50):
+    return await review_cache.get_recent(business_id, industry, limit=limit)
 
 # 2️⃣ Review memory me save karna
-def save_review(
+async def save_review(
     business_id: str,
     industry: str,
     review_text: str,
     fingerprint: str
 ):
-    supabase.table("review_memory").insert({
+    entry = review_cache.ReviewEntry(review_text, fingerprint)
+
+    # write-behind: the cache sees it now, the DB on the next flush
+    write_behind.insert("review_memory", {
         "business_id": business_id,
         "industry": industry,
         "review_text": review_text,
-        "fingerprint": fingerprint
-    }).execute()
\ No newline at end of file
+        "fingerprint": fingerprint,
+        "minhash": list(entry.minhash)
+    })
+
+    review_cache.append(business_id, industry, entry)
@@ -1,59 +1,74 @@
-import os
-from supabase import create_client
-from datetime import datetime, timezone
+import time
+import asyncio
+from collections import OrderedDict
+from app.core import metrics, write_behind
+from app.database.supabase import get_async_supabase
 
-supabase = create_client(
-    os.getenv("SUPABASE_URL"),
-    os.getenv("SUPABASE_SERVICE_KEY")
-)
+# usage map cache (per worker): (business_id, industry) → {narrative: usage_count}
+USAGE_TTL = 5 * 60        # seconds, phir DB se dobara (dusre workers ke counts)
+MAX_BUSINESSES = 1000     # LRU bound
 
-MAX_USE_PER_NARRATIVE = 5  # ek style max 5 baar
+_usage: "OrderedDict[tuple, tuple[float, dict]]" = OrderedDict()
+_locks: dict = {}
 
-# 1️⃣ Check karo: ye narrative abhi allowed hai ya nahi
-def is_narrative_allowed(business_id: str, industry: str, narrative: str) -> bool:
-    res = (
-        supabase
-        .table("narrative_usage")
-        .select("usage_count")
-        .eq("business_id", business_id)
-        .eq("industry", industry)
-        .eq("narrative", narrative)
-        .limit(1)
-        .execute()
-    )
 
-    if not res.data:
-        return True  # first time → allowed
+# 0️⃣ Poora usage map ek hi query me (warm → zero query)
+async def get_usage_map(business_id: str, industry: str) -> dict:
+    key = (business_id, industry)
+    cached = _usage.get(key)
 
-    return res.data[0]["usage_count"] < 3
+    if cached and time.monotonic() - cached[0] < USAGE_TTL:
+        _usage.move_to_end(key)
+        metrics.incr("narrative_usage.hit")
+        return cached[1]
+
+    # single-flight: ek business ke concurrent cold requests ek hi query share karein
+    lock = _locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        cached = _usage.get(key)
+        if cached and time.monotonic() - cached[0] < USAGE_TTL:
+            metrics.incr("narrative_usage.hit")
+            return cached[1]
+
+        metrics.incr("narrative_usage.miss")
+        res = await (
+            get_async_supabase()
+            .table("narrative_usage")
+            .select("narrative, usage_count")
+            .eq("business_id", business_id)
+            .eq("industry", industry)
+            .execute()
+        )
+
+        counts = {r["narrative"]: r["usage_count"] or 0 for r in res.data or []}
+        _usage[key] = (time.monotonic(), counts)
+        _usage.move_to_end(key)
+
+        while len(_usage) > MAX_BUSINESSES:
+            old, _ = _usage.popitem(last=False)
+            _locks.pop(old, None)
+
+        return counts
+
+
+# 1️⃣ Sabse kam use hua narrative (tie → list order)
+# exclude → pooled drafts ke narratives (jab tak serve nahi hue, count nahi badhta)
+async def pick_narrative(business_id: str, industry: str, narratives: list, exclude=()) -> str:
+    counts = await get_usage_map(business_id, industry)
+    candidates = [n for n in narratives if n not in exclude] or narratives
+    return min(candidates, key=lambda n: counts.get(n, 0))
 
 
 # 2️⃣ Jab narrative use ho jaaye to count badhao
+# (atomic +1 in DB via increment_narrative_usage; write-behind batch me jaata hai)
 def mark_narrative_used(business_id: str, industry: str, narrative: str):
-    # pehle check: row hai ya nahi
-    res = (
-        supabase
-        .table("narrative_usage")
-        .select("id, usage_count")
-        .eq("business_id", business_id)
-        .eq("industry", industry)
-        .eq("narrative", narrative)
-        .limit(1)
-        .execute()
-    )
-
-    # ❗ first time → INSERT
-    if not res.data:
-        supabase.table("narrative_usage").insert({
-            "business_id": business_id,
-            "industry": industry,
-            "narrative": narrative,
-            "usage_count": 1
-        }).execute()
-        return
-
-    # existing → UPDATE
-    row = res.data[0]
-    supabase.table("narrative_usage").update({
-        "usage_count": row["usage_count"] + 1
-    }).eq("id", row["id"]).execute()
\ No newline at end of file
+    # cache bhi turant update, next pick isi worker me sahi ho
+    cached = _usage.get((business_id, industry))
+    if cached:
+        cached[1][narrative] = cached[1].get(narrative, 0) + 1
+
+    write_behind.increment("narrative_usage", {
+        "business_id": business_id,
+        "industry": industry,
+        "narrative": narrative
+    })
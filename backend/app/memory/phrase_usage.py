@@ -0,0 +1,203 @@
+# app/memory/phrase_usage.py
+"""
+Per-business usage map for opening_usage / ending_usage (per worker).
+
+- cold (table, business, industry) → ONE query loads the usable rows
+  (batch rows still under the batch limit, all buckets / languages,
+  + static-pool rows); exhausted batch rows are never read again and
+  prune() deletes them when their pool is refilled
+- selection happens in memory (opening_engine, ending_engine)
+- use() bumps the count in place + queues the atomic DB increment
+- mark_used() → same, from sync code without the map at hand
+  (draft pool books a phrase only when its draft is served)
+- re-read after USAGE_TTL (other workers' usage), LRU-bounded
+- RefillGate → single-flight batch refills for the engines, LRU-bounded,
+  with a cooldown after a failed / empty refill (static pools meanwhile)
+"""
+import time
+import asyncio
+from collections import OrderedDict
+
+from app.core import metrics, write_behind
+from app.database.supabase import get_async_supabase
+
+USAGE_TTL = 5 * 60        # seconds
+MAX_ENTRIES = 2000        # LRU bound (openings + endings)
+REFILL_COOLDOWN = 60      # seconds without LLM refill after one failed
+MAX_REFILL_KEYS = 2000    # LRU bound per RefillGate
+
+
+class PhraseUsage:
+    __slots__ = ("table", "column", "business_id", "industry", "rows", "loaded_at")
+
+    def __init__(self, table: str, column: str, business_id: str, industry: str, rows: list):
+        self.table = table
+        self.column = column
+        self.business_id = business_id
+        self.industry = industry
+        # text → [usage_count, bucket, language]
+        self.rows = {
+            r[column]: [r.get("usage_count") or 0, r.get("bucket"), r.get("language")]
+            for r in rows
+        }
+        self.loaded_at = time.monotonic()
+
+    def count(self, text: str) -> int:
+        row = self.rows.get(text)
+        return row[0] if row else 0
+
+    def available(self, bucket: str, language: str, limit: int) -> list[str]:
+        return [
+            text for text, (used, b, lang) in self.rows.items()
+            if b == bucket and lang == language and used < limit
+        ]
+
+    def least_used(self, bucket: str, language: str) -> str | None:
+        pool = [
+            text for text, (_, b, lang) in self.rows.items()
+            if b == bucket and lang == language
+        ]
+        return min(pool, key=self.count, default=None)
+
+    def add(self, texts: list[str], bucket: str, language: str):
+        for text in texts:
+            self.rows.setdefault(text, [0, bucket, language])
+
+    def use(self, text: str):
+        row = self.rows.setdefault(text, [0, None, None])
+        row[0] += 1
+
+        # atomic +1 (increment_<table>), batched by the write-behind queue
+        write_behind.increment(self.table, {
+            "business_id": self.business_id,
+            "industry": self.industry,
+            self.column: text
+        })
+
+
+class RefillGate:
+    """
+    Batch refill state per pool key (one gate per engine).
+    - lock(key)    → shared lock, a burst triggers one LLM call
+    - cooling(key) → a refill failed < REFILL_COOLDOWN ago, don't retry yet
+    - failed(key)  → start the cooldown
+    Idle keys are evicted oldest-first past MAX_REFILL_KEYS.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        # key → [lock, failed_at]
+        self._keys: "OrderedDict[tuple, list]" = OrderedDict()
+
+    def lock(self, key: tuple) -> asyncio.Lock:
+        state = self._keys.get(key)
+        if state is None:
+            state = self._keys[key] = [asyncio.Lock(), None]
+            self._evict()
+        self._keys.move_to_end(key)
+        return state[0]
+
+    def cooling(self, key: tuple) -> bool:
+        state = self._keys.get(key)
+        if not state or state[1] is None:
+            return False
+        if time.monotonic() - state[1] < REFILL_COOLDOWN:
+            metrics.incr(f"{self.name}.refill_cooldown")
+            return True
+        state[1] = None
+        return False
+
+    def failed(self, key: tuple):
+        self.lock(key)
+        self._keys[key][1] = time.monotonic()
+        metrics.incr(f"{self.name}.refill_failed")
+
+    def _evict(self):
+        # held locks stay: their waiters still need them
+        for key in list(self._keys):
+            if len(self._keys) <= MAX_REFILL_KEYS:
+                break
+            if not self._keys[key][0].locked():
+                del self._keys[key]
+
+
+_cache: "OrderedDict[tuple, PhraseUsage]" = OrderedDict()
+_locks: dict = {}
+
+
+def _fresh(usage: PhraseUsage | None) -> bool:
+    return usage is not None and time.monotonic() - usage.loaded_at < USAGE_TTL
+
+
+def mark_used(table: str, column: str, business_id: str, industry: str, text: str):
+    usage = _cache.get((table, business_id, industry))
+    if usage is not None:
+        usage.use(text)
+        return
+
+    write_behind.increment(table, {
+        "business_id": business_id,
+        "industry": industry,
+        column: text
+    })
+
+
+async def prune(table: str, business_id: str, industry: str, bucket: str, language: str, limit: int):
+    """
+    Deletes the exhausted batch rows of one pool (called on refill, so
+    the table holds ~one live batch per pool instead of every batch ever).
+    """
+    try:
+        await (
+            get_async_supabase()
+            .table(table)
+            .delete()
+            .eq("business_id", business_id)
+            .eq("industry", industry)
+            .eq("bucket", bucket)
+            .eq("language", language)
+            .gte("usage_count", limit)
+            .execute()
+        )
+    except Exception as e:
+        print("USAGE PRUNE ERROR:", e)
+
+
+async def get(table: str, column: str, business_id: str, industry: str, batch_limit: int) -> PhraseUsage:
+    key = (table, business_id, industry)
+    usage = _cache.get(key)
+
+    if _fresh(usage):
+        _cache.move_to_end(key)
+        metrics.incr(f"{table}.cache_hit")
+        return usage
+
+    # single-flight: concurrent cold requests share one query
+    lock = _locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        usage = _cache.get(key)
+        if _fresh(usage):
+            metrics.incr(f"{table}.cache_hit")
+            return usage
+
+        metrics.incr(f"{table}.cache_miss")
+        res = await (
+            get_async_supabase()
+            .table(table)
+            .select(f"{column}, usage_count, bucket, language")
+            .eq("business_id", business_id)
+            .eq("industry", industry)
+            # static-pool rows (no bucket) + batch rows not yet exhausted
+            .or_(f"bucket.is.null,usage_count.lt.{batch_limit}")
+            .execute()
+        )
+
+        usage = PhraseUsage(table, column, business_id, industry, res.data or [])
+        _cache[key] = usage
+        _cache.move_to_end(key)
+
+        while len(_cache) > MAX_ENTRIES:
+            old, _ = _cache.popitem(last=False)
+            _locks.pop(old, None)
+
+        return usage
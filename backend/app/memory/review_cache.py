@@ -0,0 +1,261 @@
+# app/memory/review_cache.py
+"""
+In-process review memory (per worker).
+
+Per (business_id, industry):
+- ring buffer of the latest WINDOW reviews, each entry with its text
+  features precomputed once: normalized text, structure fingerprint,
+  word set, opening/ending phrase, meaning signature, minhash
+- LSH index over the minhash of the business's ENTIRE history
+  (near-duplicate lookups never go back to the DB)
+
+- cold business → latest WINDOW review_memory rows with their text, then
+  the minhash of everything older (paged, HISTORY_PAGE rows / page);
+  the index is built off the event loop
+- warm business → zero DB reads
+- after REFRESH_TTL → only rows newer than the last one seen
+  (picks up reviews saved by other workers)
+- save_fingerprint / save_review append to the buffer + index
+- legacy rows without a stored minhash get it computed off the event
+  loop (backfill: app/scripts/backfill_minhash.py)
+- LRU-bounded to MAX_BUSINESSES, history to MAX_HISTORY rows per business
+"""
+import time
+import asyncio
+from collections import OrderedDict, deque
+from itertools import islice
+
+from app.core import metrics
+from app.database.supabase import get_async_supabase
+from app.brain import minhash
+from app.brain.text_analysis import TextFeatures
+
+WINDOW = 60               # largest window any checker reads
+MAX_BUSINESSES = 1000     # LRU bound
+REFRESH_TTL = 5 * 60      # seconds
+HISTORY_PAGE = 1000       # PostgREST max rows per request
+MAX_HISTORY = 20000       # memory guard per business (~1 KB of index per row)
+
+
+class ReviewEntry(TextFeatures):
+    __slots__ = ("text", "minhash")
+
+    def __init__(self, text: str, fingerprint: str | None = None, signature=None):
+        text = text or ""
+        super().__init__(text)
+        self.text = text
+        if fingerprint is not None:
+            self.fingerprint = fingerprint      # as stored in review_memory
+        self.minhash = (
+            minhash.signature(text, self.norm) if signature is None else signature
+        )
+
+
+class ReviewMemory:
+    __slots__ = ("entries", "index", "newest", "loaded_at")
+
+    def __init__(self, entries=(), history=()):
+        """
+        entries → latest reviews, newest first
+        history → signatures of older reviews (index only, any order)
+        """
+        self.entries = deque(entries, maxlen=WINDOW)    # newest first
+        self.index = minhash.LSHIndex([*history, *(e.minhash for e in reversed(self.entries))])
+        self.newest = None                      # created_at of the newest DB row seen
+        self.loaded_at = time.monotonic()
+
+    def recent(self, limit: int = WINDOW) -> list:
+        return list(islice(self.entries, limit))
+
+    def add(self, entry: ReviewEntry):
+        self.entries.appendleft(entry)
+        self.index.add(entry.minhash)
+
+
+_memories: "OrderedDict[tuple, ReviewMemory]" = OrderedDict()
+_locks: dict = {}
+
+
+def _fresh(mem: ReviewMemory | None) -> bool:
+    return mem is not None and time.monotonic() - mem.loaded_at < REFRESH_TTL
+
+
+async def get_memory(business_id: str, industry: str) -> ReviewMemory:
+    key = (business_id, industry)
+    mem = _memories.get(key)
+
+    if _fresh(mem):
+        _memories.move_to_end(key)
+        metrics.incr("review_cache.hit")
+        return mem
+
+    # single-flight: concurrent cold readers share one load
+    lock = _locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        mem = _memories.get(key)
+        if _fresh(mem):
+            metrics.incr("review_cache.hit")
+        elif mem is not None and mem.newest is not None:
+            metrics.incr("review_cache.refresh")
+            mem = await _refresh(business_id, industry, mem)
+        else:
+            metrics.incr("review_cache.miss")
+            mem = await _load(business_id, industry)
+
+    return mem
+
+
+async def get_recent(business_id: str, industry: str, limit: int = WINDOW) -> list:
+    """
+    Latest `limit` reviews (newest first) as ReviewEntry objects.
+    """
+    mem = await get_memory(business_id, industry)
+    return mem.recent(limit)
+
+
+def _query(business_id: str, industry: str, columns: str = "review_text, fingerprint, minhash, created_at"):
+    return (
+        get_async_supabase()
+        .table("review_memory")
+        .select(columns)
+        .eq("business_id", business_id)
+        .eq("industry", industry)
+    )
+
+
+def _entries(rows: list) -> list:
+    return [
+        ReviewEntry(
+            r.get("review_text") or "",
+            r.get("fingerprint") or "",
+            minhash.from_db(r.get("minhash"))
+        )
+        for r in rows
+    ]
+
+
+async def _build_entries(rows: list) -> list:
+    legacy = sum(1 for r in rows if minhash.from_db(r.get("minhash")) is None)
+    if not legacy:
+        return _entries(rows)
+
+    # saved before minhash existed → signatures computed in a thread,
+    # the loop keeps serving other requests meanwhile
+    metrics.incr("review_cache.legacy_rows", legacy)
+    return await asyncio.to_thread(_entries, rows)
+
+
+async def _history(business_id: str, industry: str, before: str) -> list:
+    """
+    Signatures of the rows older than the window (minhash only, the text
+    is read just for legacy rows that have none stored).
+    """
+    sigs, legacy = [], []
+
+    for column, stored in (("minhash", True), ("review_text", False)):
+        offset = 0
+        while len(sigs) + len(legacy) < MAX_HISTORY:
+            q = _query(business_id, industry, column).lt("created_at", before)
+            q = q.not_.is_("minhash", "null") if stored else q.is_("minhash", "null")
+            res = await (
+                q.order("created_at", desc=True)
+                .range(offset, offset + HISTORY_PAGE - 1)
+                .execute()
+            )
+            rows = res.data or []
+
+            if stored:
+                sigs.extend(filter(None, (minhash.from_db(r.get("minhash")) for r in rows)))
+            else:
+                legacy.extend(r.get("review_text") or "" for r in rows)
+
+            if len(rows) < HISTORY_PAGE:
+                break
+            offset += HISTORY_PAGE
+
+    if legacy:
+        # saved before minhash existed → computed in a thread
+        metrics.incr("review_cache.legacy_rows", len(legacy))
+        sigs.extend(await asyncio.to_thread(lambda: [minhash.signature(t) for t in legacy]))
+
+    metrics.observe("review_cache.history_rows", len(sigs))
+    return sigs
+
+
+async def _load(business_id: str, industry: str) -> ReviewMemory:
+    # 1️⃣ latest WINDOW rows with their text (structure / phrase checks)
+    res = await (
+        _query(business_id, industry)
+        .order("created_at", desc=True)
+        .limit(WINDOW)
+        .execute()
+    )
+    rows = res.data or []
+    entries = await _build_entries(rows)
+
+    # 2️⃣ everything older → minhash index only
+    history = []
+    if len(rows) >= WINDOW:
+        history = await _history(business_id, industry, rows[-1].get("created_at"))
+
+    # index build is pure python (~40 ms per 1000 rows) → off the loop
+    mem = await asyncio.to_thread(ReviewMemory, entries, history)
+    if rows:
+        mem.newest = rows[0].get("created_at")
+
+    key = (business_id, industry)
+    _memories[key] = mem
+    _memories.move_to_end(key)
+
+    while len(_memories) > MAX_BUSINESSES:
+        old, _ = _memories.popitem(last=False)
+        _locks.pop(old, None)
+
+    return mem
+
+
+async def _refresh(business_id: str, industry: str, mem: ReviewMemory) -> ReviewMemory:
+    res = await (
+        _query(business_id, industry)
+        .gt("created_at", mem.newest)
+        .order("created_at", desc=True)
+        .limit(HISTORY_PAGE)
+        .execute()
+    )
+    rows = res.data or []
+
+    if len(rows) >= HISTORY_PAGE:
+        # too far behind → full reload
+        return await _load(business_id, industry)
+
+    if rows:
+        mem.newest = rows[0].get("created_at")
+
+    # rows this worker appended itself are already in memory
+    known = {e.text for e in mem.entries}
+
+    rows = [r for r in rows if (r.get("review_text") or "") not in known]
+
+    # beyond the buffer's WINDOW → index only
+    for r in reversed(rows[WINDOW:]):
+        mem.index.add(
+            minhash.from_db(r.get("minhash")) or minhash.signature(r.get("review_text") or "")
+        )
+    for entry in reversed(await _build_entries(rows[:WINDOW])):
+        mem.add(entry)
+
+    mem.loaded_at = time.monotonic()
+    key = (business_id, industry)
+    _memories[key] = mem
+    _memories.move_to_end(key)
+    return mem
+
+
+def append(business_id: str, industry: str, entry: ReviewEntry):
+    """
+    Newly saved review → front of the buffer + index (if this business
+    is warm; a cold one loads it from the DB on the next read anyway).
+    """
+    mem = _memories.get((business_id, industry))
+    if mem is not None:
+        mem.add(entry)
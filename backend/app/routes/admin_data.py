@@ -1,18 +1,9 @@
 from fastapi import APIRouter, HTTPException
-from datetime import datetime, date, timezone, timedelta
-from app.database.supabase import supabase
+from app.core import client_config
+from app.core.guards import check_client_status
 
 router = APIRouter()
 
-# ---------- DATE HELPER (CRITICAL FIX) ----------
-def to_date(value):
-    if not value:
-        return None
-    if isinstance(value, date):
-        return value
-    return datetime.strptime(value, "%Y-%m-%d").date()
-
-
 # ---------- STRING → LIST + VERBOSITY LIMIT ----------
 def split_limit(value, limit):
     """
@@ -25,54 +16,10 @@ def split_limit(value, limit):
     return items[:limit]
 
 
-def check_client_status(client: dict):
-    """
-    CENTRAL SINGLE SOURCE OF TRUTH
-    This decides whether AI generation is allowed or not.
-    """
-
-    # 🔴 Manual active switch (soft stop)
-    if client.get("is_active") is False:
-        raise HTTPException(
-            status_code=403,
-            detail="Service inactive"
-        )
-
-    # 🔴 Date based expiry (IST – production safe)
-    start_date = to_date(client.get("start_date"))
-    end_date = to_date(client.get("end_date"))
-
-    if start_date or end_date:
-        IST = timezone(timedelta(hours=5, minutes=30))
-        today = datetime.now(IST).date()
-
-        # Service not started yet
-        if start_date and today < start_date:
-            raise HTTPException(
-                status_code=403,
-                detail="Service not started"
-            )
-
-        # Service expired
-        if end_date and today > end_date:
-            raise HTTPException(
-                status_code=403,
-                detail="Service expired"
-            )
-
-
 @router.get("/admin-data/{client_id}")
-def get_admin_data(client_id: str):
-    # 1️⃣ Client + type join (single fetch)
-    res = (
-        supabase
-        .table("clients")
-        .select("*, client_types(*)")
-        .eq("id", client_id)
-        .execute()
-    )
-
-    client = res.data[0] if res.data else None
+async def get_admin_data(client_id: str):
+    # 1️⃣ Client + type (cached config, see core/client_config)
+    client = await client_config.get_client(client_id)
 
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
@@ -0,0 +1,26 @@
+# routes/client_cache.py
+
+from fastapi import APIRouter
+from app.core import client_config, qr_cache
+
+router = APIRouter(prefix="/admin/cache", tags=["Cache"])
+
+# Dashboard writes clients / client_types / qr_tokens straight to Supabase,
+# then calls these so this worker drops the stale config right away.
+
+@router.post("/clients/{client_id}/invalidate")
+async def invalidate_client(client_id: str):
+    client_config.invalidate_client(client_id)
+    return {"status": "invalidated", "client_id": client_id}
+
+
+@router.post("/client-types/invalidate")
+async def invalidate_client_types():
+    client_config.invalidate_client_types()
+    return {"status": "invalidated"}
+
+
+@router.post("/qr/{token}/invalidate")
+async def invalidate_qr_token(token: str):
+    qr_cache.invalidate(token)
+    return {"status": "invalidated", "token": token}
@@ -1,14 +1,15 @@
 # routes/generate_review.py
 
+import json
 from fastapi import APIRouter, HTTPException
-from app.brain.ai_engine import generate_review
+from fastapi.responses import StreamingResponse
+from app.brain.ai_engine import generate_review, stream_review
 from app.routes.admin_data import get_admin_data
-from app.database.supabase import supabase
+from app.core import write_behind
 
 router = APIRouter()
 
-@router.post("/generate-review")
-def generate_review_route(payload: dict):
+async def _build_final_payload(payload: dict) -> dict:
     """
     REQUIRED:
     - client_id
@@ -31,21 +32,13 @@ def generate_review_route(payload: dict):
         raise HTTPException(status_code=400, detail="rating must be 3–5")
 
     # 1️⃣ Fetch admin + DB data (includes guard: active + expiry)
-    admin_data = get_admin_data(client_id)
+    admin_data = await get_admin_data(client_id)
 
     language = payload.get("language", "English")
     product = payload.get("product") or payload.get("products_services")
 
-    # 2️⃣ LOG QR REVIEW EVENT
-    supabase.table("qr_review_logs").insert({
-        "client_id": client_id,
-        "rating": rating,
-        "language": language,
-        "product": product
-    }).execute()
-
-    # 3️⃣ Merge payload + admin data
-    final_payload = {
+    # 2️⃣ Merge payload + admin data
+    return {
         "client_id": client_id,
         "business_id": client_id,
         "industry": admin_data["industry"],
@@ -66,8 +59,60 @@ def generate_review_route(payload: dict):
         }
     }
 
-    # 4️⃣ Generate review
+
+def _log_qr_event(final_payload: dict):
+    # LOG QR REVIEW EVENT (queued → bulk insert by write_behind, off the request path)
+    write_behind.insert("qr_review_logs", {
+        "client_id": final_payload["client_id"],
+        "rating": final_payload["rating"],
+        "language": final_payload["language"],
+        "product": final_payload["product"]
+    }, droppable=True)
+
+
+@router.post("/generate-review")
+async def generate_review_route(payload: dict):
+    final_payload = await _build_final_payload(payload)
+
+    _log_qr_event(final_payload)
+
+    # Generate review
     print("=== FINAL PAYLOAD SENT TO AI ===")
     print(final_payload)
-    return generate_review(final_payload)
-    
\ No newline at end of file
+    return await generate_review(final_payload)
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/generate-review/stream")
+async def generate_review_stream_route(payload: dict):
+    """
+    Same input as /generate-review, answered as Server-Sent Events:
+    opening → token* → (replace) → done   (or error)
+    """
+    # validation + guard errors still come back as normal HTTP errors
+    final_payload = await _build_final_payload(payload)
+
+    async def events():
+        # first byte goes out before any LLM work
+        yield ": stream open\n\n"
+
+        try:
+            _log_qr_event(final_payload)
+
+            async for event, data in stream_review(final_payload):
+                yield _sse(event, data)
+        except Exception as e:
+            print("STREAM ERROR:", e)
+            yield _sse("error", {"detail": "Failed to generate review"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"   # no proxy buffering (nginx)
+        }
+    )
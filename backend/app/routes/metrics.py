@@ -0,0 +1,17 @@
+# routes/metrics.py
+
+from fastapi import APIRouter
+from app.core import metrics, http_pool
+from app.brain import draft_pool
+
+router = APIRouter()
+
+@router.get("/admin/metrics")
+def get_metrics():
+    """
+    Per-worker counters + latency distributions + outbound pools.
+    """
+    snapshot = metrics.snapshot()
+    snapshot["draft_pool"] = draft_pool.stats()
+    snapshot["http_pool"] = http_pool.stats()
+    return snapshot
@@ -1,19 +1,12 @@
 from fastapi import APIRouter, HTTPException
-from app.database.supabase import supabase
+from app.core import qr_cache
 
 router = APIRouter()   # ✅ THIS LINE WAS MISSING
 
 @router.get("/r/{token}")
-def resolve_qr_token(token: str):
-    res = (
-        supabase
-        .table("qr_tokens")
-        .select("client_id, is_active")
-        .eq("token", token)
-        .execute()
-    )
-
-    row = res.data[0] if res.data else None
+async def resolve_qr_token(token: str):
+    # cached token state (core/qr_cache) → warm scan = zero DB calls
+    row = await qr_cache.resolve(token)
 
     if not row:
         raise HTTPException(status_code=404, detail="Invalid QR")
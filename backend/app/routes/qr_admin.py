@@ -1,48 +1,53 @@
 from fastapi import APIRouter, HTTPException
-from app.database.supabase import supabase
+from app.database.supabase import get_async_supabase
+from app.core import qr_cache
 from datetime import datetime
 
 router = APIRouter()
 
 @router.post("/admin/assign-qr")
-def assign_qr(payload: dict):
+async def assign_qr(payload: dict):
     token = payload.get("token")
     client_id = payload.get("client_id")
 
     if not token or not client_id:
         raise HTTPException(status_code=400, detail="token and client_id required")
 
-    qr = (
-        supabase
+    res = await (
+        get_async_supabase()
         .table("qr_tokens")
         .select("*")
         .eq("token", token)
         .single()
         .execute()
-        .data
     )
+    qr = res.data
 
     if not qr:
         raise HTTPException(status_code=404, detail="QR not found")
 
-    supabase.table("qr_tokens").update({
+    await get_async_supabase().table("qr_tokens").update({
         "client_id": client_id,
         "assigned_at": datetime.utcnow()
     }).eq("token", token).execute()
 
+    qr_cache.invalidate(token)
+
     return {"status": "assigned"}
 
 
 @router.post("/admin/unassign-qr")
-def unassign_qr(payload: dict):
+async def unassign_qr(payload: dict):
     token = payload.get("token")
 
     if not token:
         raise HTTPException(status_code=400, detail="token required")
 
-    supabase.table("qr_tokens").update({
+    await get_async_supabase().table("qr_tokens").update({
         "client_id": None,
         "assigned_at": None
     }).eq("token", token).execute()
 
+    qr_cache.invalidate(token)
+
     return {"status": "unassigned"}
@@ -1,27 +1,19 @@
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import RedirectResponse
-from app.database.supabase import supabase
+from app.core import qr_cache
 from datetime import datetime, timezone
 
 router = APIRouter()
 
 @router.get("/r/{token}")
-def qr_redirect(token: str):
+async def qr_redirect(token: str):
     """
     QR ENTRY POINT
     token → client_id → /review/{client_id}
     """
 
-    # 1️⃣ Token lookup
-    qr = (
-        supabase
-        .table("qr_tokens")
-        .select("*")
-        .eq("token", token)
-        .single()
-        .execute()
-        .data
-    )
+    # 1️⃣ Token lookup (cached, invalid tokens too)
+    qr = await qr_cache.resolve(token)
 
     if not qr:
         raise HTTPException(status_code=404, detail="Invalid QR")
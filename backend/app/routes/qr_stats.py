@@ -1,44 +1,106 @@
 # routes/qr_stats.py
 
+import uuid
+from datetime import datetime, timedelta
 from fastapi import APIRouter, HTTPException
-from app.database.supabase import supabase
+from app.core.guards import IST
+from app.database.supabase import get_supabase
 
 router = APIRouter()
 
+# ---------------- CONFIG ----------------
+BUCKETS = ("day", "week", "month")
+BREAKDOWNS = ("rating", "language", "product")
+DEFAULT_RANGE_DAYS = 30
+MAX_RANGE_DAYS = 2 * 366
+MAX_CLIENTS = 500
+
 @router.get("/admin/qr-stats/{client_id}")
 def get_qr_stats(client_id: str):
-    logs = (
-        supabase
-        .table("qr_review_logs")
-        .select("rating, language, product, created_at")
+    # lifetime rollup, kept up to date by the qr_review_logs trigger
+    # (one row per client → constant cost, however long the history)
+    rows = (
+        get_supabase()
+        .table("qr_scan_totals")
+        .select("total, rating_3, rating_4, rating_5, rating_sum, last_scan")
         .eq("client_id", client_id)
-        .order("created_at", desc=True)
         .execute()
         .data
     )
 
-    if logs is None:
-        raise HTTPException(status_code=404, detail="No QR data found")
+    totals = rows[0] if rows else {}
+    total = totals.get("total") or 0
+
+    return {
+        "client_id": client_id,
+        "total_scans": total,
+        "avg_rating": round((totals.get("rating_sum") or 0) / total, 2) if total else 0,
+        "rating_breakdown": {
+            3: totals.get("rating_3") or 0,
+            4: totals.get("rating_4") or 0,
+            5: totals.get("rating_5") or 0,
+        },
+        "last_scan": totals.get("last_scan")
+    }
+
+
+@router.get("/admin/qr-analytics")
+def get_qr_analytics(
+    client_ids: str,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    bucket: str = "day",
+    breakdown: str | None = None
+):
+    """
+    client_ids → comma separated; dates → YYYY-MM-DD (IST, inclusive),
+    default last DEFAULT_RANGE_DAYS days.
 
-    total = len(logs)
+    Grouping happens in the qr_analytics RPC; answer is columnar:
+    series (client_id / bucket / key / scans / rating_sum) +
+    lifetime totals for the same clients.
+    """
+    ids = list(dict.fromkeys(c.strip() for c in client_ids.split(",") if c.strip()))
 
-    breakdown = {3: 0, 4: 0, 5: 0}
-    rating_sum = 0
-    last_scan = None
+    if not ids or len(ids) > MAX_CLIENTS:
+        raise HTTPException(status_code=400, detail=f"client_ids: 1–{MAX_CLIENTS} ids")
 
-    for l in logs:
-        r = l.get("rating")
-        if r in breakdown:
-            breakdown[r] += 1
-            rating_sum += r
+    try:
+        for c in ids:
+            uuid.UUID(c)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="client_ids must be UUIDs")
 
-    if logs:
-        last_scan = logs[0].get("created_at")
+    if bucket not in BUCKETS:
+        raise HTTPException(status_code=400, detail=f"bucket must be one of {', '.join(BUCKETS)}")
+
+    if breakdown and breakdown not in BREAKDOWNS:
+        raise HTTPException(status_code=400, detail=f"breakdown must be one of {', '.join(BREAKDOWNS)}")
+
+    try:
+        end = datetime.strptime(date_to, "%Y-%m-%d").date() if date_to else datetime.now(IST).date()
+        start = (
+            datetime.strptime(date_from, "%Y-%m-%d").date() if date_from
+            else end - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="dates must be YYYY-MM-DD")
+
+    if start > end or (end - start).days >= MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"date range must be 1–{MAX_RANGE_DAYS} days")
+
+    data = get_supabase().rpc("qr_analytics", {
+        "p_client_ids": ids,
+        "p_from": start.isoformat(),
+        "p_to": end.isoformat(),
+        "p_bucket": bucket,
+        "p_breakdown": breakdown
+    }).execute().data
 
     return {
-        "client_id": client_id,
-        "total_scans": total,
-        "avg_rating": round(rating_sum / total, 2) if total else 0,
-        "rating_breakdown": breakdown,
-        "last_scan": last_scan
-    }
\ No newline at end of file
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "bucket": bucket,
+        "breakdown": breakdown,
+        **data
+    }
@@ -1,7 +1,8 @@
 # routes/qr_token.py
 
 from fastapi import APIRouter, HTTPException
-from app.database.supabase import supabase
+from app.database.supabase import get_async_supabase
+from app.core import qr_cache
 import uuid
 from datetime import datetime
 
@@ -9,7 +10,7 @@ router = APIRouter(prefix="/admin/qr", tags=["QR Tokens"])
 
 # 1️⃣ CREATE BULK QR TOKENS
 @router.post("/create")
-def create_qr_tokens(count: int = 50):
+async def create_qr_tokens(count: int = 50):
     tokens = []
 
     for _ in range(count):
@@ -18,7 +19,7 @@ def create_qr_tokens(count: int = 50):
             "token": token
         })
 
-    supabase.table("qr_tokens").insert(tokens).execute()
+    await get_async_supabase().table("qr_tokens").insert(tokens).execute()
 
     return {
         "created": len(tokens),
@@ -28,32 +29,32 @@ def create_qr_tokens(count: int = 50):
 
 # 2️⃣ LIST FREE QR TOKENS
 @router.get("/free")
-def get_free_qr_tokens():
-    data = (
-        supabase
+async def get_free_qr_tokens():
+    res = await (
+        get_async_supabase()
         .table("qr_tokens")
         .select("*")
         .is_("client_id", None)
         .eq("is_active", True)
         .execute()
-        .data
     )
+    data = res.data
 
     return data or []
 
 
 # 3️⃣ ASSIGN QR TO CLIENT
 @router.post("/assign")
-def assign_qr(token: str, client_id: str):
-    qr = (
-        supabase
+async def assign_qr(token: str, client_id: str):
+    res = await (
+        get_async_supabase()
         .table("qr_tokens")
         .select("*")
         .eq("token", token)
         .single()
         .execute()
-        .data
     )
+    qr = res.data
 
     if not qr:
         raise HTTPException(status_code=404, detail="Invalid QR token")
@@ -61,30 +62,36 @@ def assign_qr(token: str, client_id: str):
     if qr.get("client_id"):
         raise HTTPException(status_code=400, detail="QR already assigned")
 
-    supabase.table("qr_tokens").update({
+    await get_async_supabase().table("qr_tokens").update({
         "client_id": client_id,
         "assigned_at": datetime.utcnow()
     }).eq("token", token).execute()
 
+    qr_cache.invalidate(token)
+
     return {"status": "assigned", "token": token}
 
 
 # 4️⃣ UNASSIGN QR (MAKE REUSABLE)
 @router.post("/unassign")
-def unassign_qr(token: str):
-    supabase.table("qr_tokens").update({
+async def unassign_qr(token: str):
+    await get_async_supabase().table("qr_tokens").update({
         "client_id": None,
         "assigned_at": None
     }).eq("token", token).execute()
 
+    qr_cache.invalidate(token)
+
     return {"status": "unassigned", "token": token}
 
 
 # 5️⃣ DISABLE QR (SECURITY)
 @router.post("/disable")
-def disable_qr(token: str):
-    supabase.table("qr_tokens").update({
+async def disable_qr(token: str):
+    await get_async_supabase().table("qr_tokens").update({
         "is_active": False
     }).eq("token", token).execute()
 
+    qr_cache.invalidate(token)
+
     return {"status": "disabled", "token": token}
\ No newline at end of file
@@ -0,0 +1,72 @@
+# app/scripts/backfill_minhash.py
+"""
+One-off: store the minhash of review_memory rows saved before the
+column existed (20261018100000_review_memory_minhash.sql left them NULL)
+or before the signature changed (20261018160000_review_memory_minhash_v2.sql
+cleared them).
+
+Without it review_cache computes those signatures on every cold load
+(in a thread, ~0.1 ms of CPU per row). Safe to re-run / interrupt:
+only rows still NULL are touched.
+
+Run from backend/ (same env as the app):
+    python -m app.scripts.backfill_minhash
+"""
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.brain import minhash
+from app.database.supabase import get_supabase
+
+BATCH = 500
+
+
+def main():
+    done = 0
+    started = time.perf_counter()
+
+    while True:
+        rows = (
+            get_supabase()
+            .table("review_memory")
+            .select("business_id, industry, created_at, review_text")
+            .is_("minhash", "null")
+            .not_.is_("review_text", "null")
+            .order("created_at", desc=True)
+            .limit(BATCH)
+            .execute()
+            .data
+        ) or []
+
+        if not rows:
+            break
+
+        updated = 0
+        for r in rows:
+            sig = minhash.signature(r.get("review_text") or "")
+            res = (
+                get_supabase()
+                .table("review_memory")
+                .update({"minhash": list(sig)})
+                .eq("business_id", r["business_id"])
+                .eq("industry", r["industry"])
+                .eq("created_at", r["created_at"])
+                .eq("review_text", r["review_text"])
+                .is_("minhash", "null")
+                .execute()
+            )
+            updated += len(res.data or [])
+
+        done += updated
+        print(f"backfilled {done} rows ({time.perf_counter() - started:.0f}s)")
+
+        if not updated:
+            # rows changed underneath (or updates rejected) → don't spin
+            print("no progress on the last batch, stopping")
+            break
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+# benchmarks/bench_anti_spam.py
+"""
+anti_spam.is_duplicate against a warm review memory (reads the latest
+WINDOW only, so the stored history size doesn't matter; novel candidate
+→ every row of the window checked).
+"""
+import asyncio
+
+import pytest
+
+from app.brain.anti_spam import is_duplicate
+from app.memory.review_cache import WINDOW
+from benchmarks import corpus
+
+WORDS = (20, 80, 160)
+
+_loop = asyncio.new_event_loop()
+
+
+@pytest.fixture(scope="module")
+def memory():
+    return corpus.memory(WINDOW)
+
+
+@pytest.mark.parametrize("n_words", WORDS, ids=lambda n: f"{n}w")
+def bench_is_duplicate(benchmark, memory, n_words):
+    corpus.install(memory)
+    text = corpus.novel(n_words)
+
+    def check():
+        return _loop.run_until_complete(
+            is_duplicate(corpus.BUSINESS_ID, corpus.INDUSTRY, text)
+        )
+
+    assert benchmark(check) is False
@@ -0,0 +1,35 @@
+# benchmarks/bench_fingerprint.py
+"""
+fingerprint_checker.is_fingerprint_duplicate against the warm review memory
+of a business with 40 → 10k stored reviews (structure check on the latest
+40, minhash LSH lookup over all n; novel candidate → full check, cache hit).
+"""
+import asyncio
+
+import pytest
+
+from app.brain.fingerprint_checker import is_fingerprint_duplicate
+from benchmarks import corpus
+
+STORED = (40, 1000, 10000)
+WORDS = (20, 80, 160)
+
+_loop = asyncio.new_event_loop()
+
+
+@pytest.fixture(scope="module", params=STORED, ids=lambda n: f"{n}stored")
+def memory(request):
+    return corpus.memory(request.param)
+
+
+@pytest.mark.parametrize("n_words", WORDS, ids=lambda n: f"{n}w")
+def bench_is_fingerprint_duplicate(benchmark, memory, n_words):
+    corpus.install(memory)
+    text = corpus.novel(n_words)
+
+    def check():
+        return _loop.run_until_complete(
+            is_fingerprint_duplicate(corpus.BUSINESS_ID, corpus.INDUSTRY, text)
+        )
+
+    assert benchmark(check) is False
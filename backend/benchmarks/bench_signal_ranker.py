@@ -0,0 +1,27 @@
+# benchmarks/bench_signal_ranker.py
+"""
+signal_ranker.rank_signals (once per generated review).
+"""
+import random
+
+import pytest
+
+from app.brain.signal_ranker import rank_signals
+from benchmarks import corpus
+
+ITEMS = (5, 50)     # entries per admin list (typical / heavy client type)
+
+
+@pytest.fixture(params=ITEMS, ids=lambda n: f"{n}items")
+def admin_data(request):
+    rng = random.Random(corpus.SEED)
+    n = request.param
+    return {
+        key: [corpus.review(rng, rng.randint(2, 6)).rstrip(".") for _ in range(n)]
+        for key in ("contexts", "trust_signals", "services", "areas", "seo_keywords")
+    }
+
+
+def bench_rank_signals(benchmark, admin_data):
+    random.seed(corpus.SEED)    # seo pick
+    benchmark(rank_signals, "haircut and coffee", "Andheri", admin_data)
@@ -0,0 +1,47 @@
+# benchmarks/bench_text_analysis.py
+"""
+Per-text feature extraction (runs on every candidate and every saved review).
+"""
+import random
+
+import pytest
+
+from app.brain import minhash
+from app.brain.text_analysis import (
+    normalize, structure_fingerprint, meaning_signature, TextFeatures
+)
+from app.memory.review_cache import ReviewEntry
+from benchmarks import corpus
+
+WORDS = (20, 80, 160)
+
+
+@pytest.fixture(params=WORDS, ids=lambda n: f"{n}w")
+def text(request):
+    return corpus.review(random.Random(corpus.SEED), request.param)
+
+
+def bench_normalize(benchmark, text):
+    benchmark(normalize, text)
+
+
+def bench_structure_fingerprint(benchmark, text):
+    benchmark(structure_fingerprint, text)
+
+
+def bench_meaning_signature(benchmark, text):
+    benchmark(meaning_signature, text)
+
+
+def bench_text_features(benchmark, text):
+    # all checker features of one candidate, one pass
+    benchmark(TextFeatures, text)
+
+
+def bench_minhash_signature(benchmark, text):
+    benchmark(minhash.signature, text)
+
+
+def bench_review_entry(benchmark, text):
+    # every feature of one saved review (save_fingerprint / save_review_memory)
+    benchmark(ReviewEntry, text)
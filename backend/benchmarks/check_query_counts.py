@@ -0,0 +1,82 @@
+# benchmarks/check_query_counts.py
+"""
+Query-count check for pick_opening / pick_ending (offline).
+
+PostgREST is replaced by an httpx MockTransport on the async client
+(every request recorded, reads answer [] → empty pools), the LLM by
+benchmarks.fake_llm. Locks in:
+- cold call → at most ONE usage read per table
+- warm call → zero reads
+- static-pool fallback (LLM down) → still at most one read
+
+Run from backend/:
+    python -m benchmarks.check_query_counts
+"""
+import os
+import sys
+import uuid
+import asyncio
+
+import httpx
+
+os.environ.setdefault("OPENAI_API_KEY", "offline")
+os.environ.setdefault("SUPABASE_URL", "http://postgrest.offline")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "offline")
+
+from app.core import write_behind
+from app.core.openai_client import get_async_client
+from app.database.supabase import get_async_supabase
+from app.brain.opening_engine import pick_opening
+from app.brain.ending_engine import pick_ending
+from benchmarks.fake_llm import fake_create, failing_create
+
+MAX_COLD_READS = 1
+
+_requests: list = []
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    _requests.append((request.method, request.url.path.rsplit("/", 1)[-1]))
+    if request.method == "GET":
+        return httpx.Response(200, json=[])
+    return httpx.Response(201, json=[])
+
+
+def _reads(table: str) -> int:
+    return sum(1 for method, path in _requests if method == "GET" and path == table)
+
+
+async def _check(label: str, pick, table: str, business_id: str, limit: int) -> bool:
+    _requests.clear()
+    await pick(business_id, "query-count-check", 5)
+    reads = _reads(table)
+
+    ok = reads <= limit
+    print(f"  {label:34s} {table:14s} reads {reads}  (max {limit})  {'OK' if ok else 'FAIL'}")
+    return ok
+
+
+async def main() -> bool:
+    get_async_supabase().session._transport = httpx.MockTransport(_handler)
+    write_behind.FLUSH_INTERVAL = 3600     # bookkeeping writes aren't reads anyway
+
+    ok = True
+    print("\npick_opening / pick_ending round trips")
+
+    for pick, table in ((pick_opening, "opening_usage"), (pick_ending, "ending_usage")):
+        get_async_client().chat.completions.create = fake_create
+        business_id = str(uuid.uuid4())
+        ok &= await _check("cold (batch refill)", pick, table, business_id, MAX_COLD_READS)
+        ok &= await _check("warm", pick, table, business_id, 0)
+
+        get_async_client().chat.completions.create = failing_create
+        business_id = str(uuid.uuid4())
+        ok &= await _check("cold (LLM down → static pool)", pick, table, business_id, MAX_COLD_READS)
+        ok &= await _check("warm (static pool)", pick, table, business_id, 0)
+
+    await write_behind.stop()
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(main()) else 1)
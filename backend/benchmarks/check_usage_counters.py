@@ -0,0 +1,135 @@
+# benchmarks/check_usage_counters.py
+"""
+Concurrency check for the atomic usage counters (increment_*_usage RPCs).
+
+Fires N parallel generate_review calls for ONE business, LLM replaced by
+an in-process fake. Then checks (exit code 1 on any FAIL):
+- narrative_usage / opening_usage / ending_usage grew by exactly N
+- the flush sends ONE increment_<table> RPC per table (counters summed
+  client-side) and never updates a usage row directly (no read-modify-write)
+- round trips per generation (every PostgREST request is counted)
+
+Default: offline, PostgREST replaced by benchmarks.fake_postgrest (its
+increment_<table> RPC adds like the SQL function). --live: against a
+local Supabase instead (migrations applied, `supabase start`).
+
+Run from backend/:
+    python -m benchmarks.check_usage_counters --n 50
+    SUPABASE_URL=http://127.0.0.1:54321 SUPABASE_SERVICE_KEY=... \
+        python -m benchmarks.check_usage_counters --n 50 --live
+"""
+import os
+import sys
+import uuid
+import asyncio
+import argparse
+
+os.environ.setdefault("OPENAI_API_KEY", "offline")
+
+from app.core import write_behind
+from app.core.openai_client import get_async_client
+from app.database.supabase import get_async_supabase
+from app.brain import ai_engine
+from benchmarks.fake_llm import fake_create
+
+TABLES = ("narrative_usage", "opening_usage", "ending_usage")
+
+
+def _check(label: str, ok: bool, detail: str) -> bool:
+    print(f"  {label:34s} {detail:28s} {'OK' if ok else 'FAIL'}")
+    return ok
+
+
+# ---------------- DB HELPERS ----------------
+
+async def _totals(business_id: str, industry: str) -> dict:
+    out = {}
+    for table in TABLES:
+        res = await (
+            get_async_supabase().table(table)
+            .select("usage_count")
+            .eq("business_id", business_id)
+            .eq("industry", industry)
+            .execute()
+        )
+        out[table] = sum(r["usage_count"] or 0 for r in res.data)
+    return out
+
+
+async def _cleanup(business_id: str, industry: str):
+    for table in TABLES + ("review_memory",):
+        await (
+            get_async_supabase().table(table).delete()
+            .eq("business_id", business_id)
+            .eq("industry", industry)
+            .execute()
+        )
+
+
+async def main(n: int, business_id: str, industry: str, live: bool) -> bool:
+    if not live:
+        # lazy: sets offline SUPABASE_* defaults on import
+        from benchmarks.offline_stack import install
+        install(db_rtt_ms=1.0, llm_latency_ms=5.0)
+    get_async_client().chat.completions.create = fake_create
+
+    before = await _totals(business_id, industry)
+
+    requests = []
+
+    async def _count(request):
+        requests.append((request.method, request.url.path.rsplit("/", 1)[-1]))
+
+    get_async_supabase().session.event_hooks["request"].append(_count)
+
+    payload = {
+        "business_id": business_id,
+        "industry": industry,
+        "rating": 5,
+        "language": "English",
+        "shop_name": "Check",
+        "product": "check",     # bypasses the draft pool
+        "admin_data": {"contexts": ["visit"], "services": ["service"]},
+    }
+
+    # flush only at stop() → generation and bookkeeping round trips separate
+    write_behind.BATCH_SIZE = 10 ** 9
+    write_behind.FLUSH_INTERVAL = 3600
+    write_behind.start()
+    await asyncio.gather(*[ai_engine.generate_review(dict(payload)) for _ in range(n)])
+    in_request = len(requests)
+    await write_behind.stop()
+    bookkeeping = len(requests) - in_request
+    flushed = requests[in_request:]
+
+    get_async_supabase().session.event_hooks["request"].remove(_count)
+    after = await _totals(business_id, industry)
+    await _cleanup(business_id, industry)
+
+    ok = True
+    print(f"\n{n} parallel generations, business {business_id} ({'live' if live else 'offline'})")
+    for table in TABLES:
+        delta = after[table] - before[table]
+        rpcs = flushed.count(("POST", f"increment_{table}"))
+        updates = sum(1 for method, path in requests if path == table and method == "PATCH")
+
+        ok &= _check(f"{table} total", delta == n, f"+{delta} (expected +{n})")
+        ok &= _check(f"{table} increment RPCs", rpcs == 1, f"{rpcs} (expected 1)")
+        ok &= _check(f"{table} direct updates", updates == 0, f"{updates} (expected 0)")
+
+    print(f"  round trips during generation   {in_request / n:.2f} per call")
+    print(f"  bookkeeping round trips (flush) {bookkeeping} total, "
+          f"{bookkeeping / n:.2f} per call")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=50)
+    parser.add_argument("--business-id", default=str(uuid.uuid4()))
+    parser.add_argument("--industry", default="usage-counter-check")
+    parser.add_argument("--live", action="store_true",
+                        help="local Supabase (SUPABASE_URL / SUPABASE_SERVICE_KEY) instead of the fake")
+    args = parser.parse_args()
+
+    sys.exit(0 if asyncio.run(main(args.n, args.business_id, args.industry, args.live)) else 1)
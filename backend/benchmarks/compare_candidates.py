@@ -0,0 +1,130 @@
+# benchmarks/compare_candidates.py
+"""
+Rewrite rate + latency: serial rewrites (before) vs n candidates per call.
+
+The real app against the offline stand-ins (benchmarks.offline_stack).
+The fake LLM repeats one of its recent bodies for --repeat-rate of the
+drafts, so some drafts hit the duplicate checks the way real near-dupes do:
+- before → REVIEW_CANDIDATES=1: a rejected draft costs a serial rewrite call
+- after  → REVIEW_CANDIDATES=--n: the first passing candidate wins,
+           rewrites only when all n are rejected
+A third run with --empty-rate empty choices checks that empty completions
+go through the redraft path (no review saved without text).
+
+The fake answers n choices as fast as one; real n>1 calls take a bit
+longer per call, so "after" latencies are a lower bound.
+
+Run from backend/:
+    python -m benchmarks.compare_candidates --n 3 --requests 200
+"""
+import sys
+import time
+import random
+import asyncio
+import argparse
+
+from benchmarks import fake_llm
+from benchmarks.offline_stack import install, seed, running_app, quiet_app, report
+from app.brain import ai_engine, draft_pool
+from app.core import metrics, write_behind
+
+
+def _pct(samples: list, pct: float) -> float:
+    return samples[min(int(len(samples) * pct / 100), len(samples) - 1)]
+
+
+async def _run(http, db, llm, clients: list, n: int, requests: int) -> dict:
+    ai_engine.REVIEW_CANDIDATES = n
+    metrics.reset()
+    llm.calls = 0
+    latencies = []
+    errors = 0
+
+    for _ in range(requests):
+        payload = {"client_id": random.choice(clients), "rating": random.choice((4, 5))}
+        start = time.perf_counter()
+        try:
+            res = await http.post("/api/generate-review", json=payload)
+            ok = res.status_code == 200 and res.json().get("review")
+        except RuntimeError:
+            ok = False      # ASGITransport re-raises what a server answers with 500
+        latencies.append((time.perf_counter() - start) * 1000)
+        if not ok:
+            errors += 1
+
+    await write_behind.flush()
+    counters = metrics.snapshot()["counters"]
+    latencies.sort()
+
+    generated = counters.get(f"review.generated.n{n}", 0) or 1
+    return {
+        "n": n,
+        "rewrite_rate": counters.get(f"review.rewrites.n{n}", 0) / generated,
+        "rejected": sum(v for k, v in counters.items() if k.startswith("review.candidates_rejected.")),
+        "empty": counters.get("review.candidates_empty", 0),
+        "llm_per_request": llm.calls / requests,
+        "p50_ms": _pct(latencies, 50),
+        "p95_ms": _pct(latencies, 95),
+        "errors": errors
+    }
+
+
+def _line(label: str, r: dict):
+    report(
+        f"  {label:8s} {r['n']:3d} {r['rewrite_rate']:9.3f} {r['rejected']:9d} {r['empty']:6d} "
+        f"{r['llm_per_request']:8.2f} {r['p50_ms']:8.1f} {r['p95_ms']:8.1f} {r['errors']:6d}"
+    )
+
+
+async def main(args) -> bool:
+    random.seed(args.seed)
+    draft_pool.POOL_SIZE = 0        # every request runs the pipeline
+    db, llm = install(args.db_rtt, args.llm_latency, 0)
+    clients, _ = seed(db, clients=args.clients, tokens_per_client=1, seed=args.seed)
+
+    report(
+        f"\nPOST /api/generate-review — {args.requests} requests each, {args.clients} clients, "
+        f"LLM latency {args.llm_latency} ms, repeat rate {args.repeat_rate}"
+    )
+    report(f"  {'':8s} {'n':>3s} {'rewrites':>9s} {'rejected':>9s} {'empty':>6s} "
+           f"{'llm/req':>8s} {'p50 ms':>8s} {'p95 ms':>8s} {'errors':>6s}")
+
+    async with running_app() as http:
+        # review memory filled first, so the checks have something to hit
+        fake_llm.REPEAT_RATE = 0.0
+        await _run(http, db, llm, clients, 1, args.warmup)
+
+        fake_llm.REPEAT_RATE = args.repeat_rate
+        before = await _run(http, db, llm, clients, 1, args.requests)
+        _line("before", before)
+        after = await _run(http, db, llm, clients, args.n, args.requests)
+        _line("after", after)
+
+        fake_llm.REPEAT_RATE, fake_llm.EMPTY_RATE = 0.0, args.empty_rate
+        empty = await _run(http, db, llm, clients, args.n, args.requests)
+        _line("empty", empty)
+        fake_llm.EMPTY_RATE = 0.0
+
+    saved_without_text = sum(1 for r in db.tables["review_memory"] if not r.get("review_text"))
+    report(f"\n  review_memory rows without text: {saved_without_text}")
+
+    return saved_without_text == 0 and not before["errors"] and not after["errors"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=3, help="candidates per call (after)")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=60)
+    parser.add_argument("--clients", type=int, default=3)
+    parser.add_argument("--repeat-rate", type=float, default=0.3)
+    parser.add_argument("--empty-rate", type=float, default=0.5)
+    parser.add_argument("--db-rtt", type=float, default=2.0)
+    parser.add_argument("--llm-latency", type=float, default=100.0)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--verbose", action="store_true", help="keep the app's own prints")
+    args = parser.parse_args()
+
+    with quiet_app(args.verbose):
+        ok = asyncio.run(main(args))
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,174 @@
+# benchmarks/compare_minhash.py
+"""
+MinHash + LSH vs the old SequenceMatcher check (ratio >= 0.55 over the
+latest 40 reviews); calibrates minhash.SIMILARITY_THRESHOLD.
+
+Synthetic review corpus (no DB / network):
+- accuracy: pairs of (original, mutated copy | unrelated review),
+  SequenceMatcher decision taken as the label, per candidate threshold
+  (a pair counts as flagged only if it also shares an LSH band);
+  plus how often an unrelated candidate is flagged against --history
+  stored reviews (the LSH check reads the whole history)
+- latency: signature + one LSH lookup against --history stored reviews,
+  vs the old scan of 40
+
+Run from backend/:
+    python -m benchmarks.compare_minhash
+    python -m benchmarks.compare_minhash --pairs 5000 --history 10000 --thresholds 0.1 0.12 0.15
+"""
+import argparse
+import random
+import statistics
+import time
+from difflib import SequenceMatcher
+
+from app.brain import minhash
+from app.brain.text_analysis import normalize
+from app.brain.fingerprint_checker import FINGERPRINT_WINDOW
+
+OLD_THRESHOLD = 0.55
+WINDOW = FINGERPRINT_WINDOW     # the old check read the latest 40 reviews
+
+VOCAB = (
+    "the staff were very friendly and helpful place was clean neat tidy "
+    "service quick smooth professional team explained everything clearly "
+    "price fair reasonable value visit again recommend experience comfortable "
+    "waiting time short booking easy appointment doctor salon haircut coffee "
+    "food tasty fresh owner polite warm welcoming atmosphere relaxed calm "
+    "happy satisfied impressed overall great good nice really genuinely felt "
+    "support process result quality detail attention care hygiene location "
+    "parking nearby family friends colleagues weekend evening morning"
+).split()
+
+
+def _review(rng: random.Random) -> str:
+    out, left = [], rng.randint(20, 90)
+    while left > 0:
+        k = min(left, rng.randint(4, 16))
+        left -= k
+        out.append(" ".join(rng.choice(VOCAB) for _ in range(k)).capitalize())
+    return ". ".join(out) + "."
+
+
+def _mutate(rng: random.Random, text: str, rate: float) -> str:
+    w = text.split()
+    for i in range(len(w)):
+        if rng.random() < rate:
+            w[i] = rng.choice(VOCAB)
+    # sentence reorder sometimes (rewrites often do this)
+    s = " ".join(w).split(". ")
+    if rng.random() < 0.3:
+        rng.shuffle(s)
+    return ". ".join(s)
+
+
+def _ms(samples):
+    samples = sorted(samples)
+    return (
+        f"p50 {statistics.median(samples):8.3f} ms   "
+        f"p99 {samples[int(len(samples) * 0.99) - 1]:8.3f} ms"
+    )
+
+
+def _pr(rows: list, col: int) -> tuple[float, float]:
+    tp = sum(1 for r in rows if r[col] and r[2])
+    fp = sum(1 for r in rows if not r[col] and r[2])
+    fn = sum(1 for r in rows if r[col] and not r[2])
+    return tp / max(tp + fp, 1), tp / max(tp + fn, 1)
+
+
+def _flagged(a, b, threshold: float) -> bool:
+    return minhash.LSHIndex([b]).is_duplicate(a, threshold)
+
+
+def accuracy(rng: random.Random, pairs: int, history: int, thresholds: list[float]):
+    base = [_review(rng) for _ in range(500)]
+    rows = []
+    for _ in range(pairs):
+        a = rng.choice(base)
+        b = _mutate(rng, a, rng.random() * 0.8) if rng.random() < 0.5 else rng.choice(base)
+        na, nb = normalize(a), normalize(b)
+        rows.append((
+            SequenceMatcher(None, na, nb).ratio() >= OLD_THRESHOLD,
+            SequenceMatcher(None, na, nb, autojunk=False).ratio() >= OLD_THRESHOLD,
+            minhash.signature(a),
+            minhash.signature(b)
+        ))
+
+    # what the check actually decides: one unrelated candidate vs the history
+    index = minhash.LSHIndex(minhash.signature(_review(rng)) for _ in range(history))
+    window_norms = [normalize(_review(rng)) for _ in range(WINDOW)]
+    probes = [_review(rng) for _ in range(200)]
+    probe_sigs = [minhash.signature(t) for t in probes]
+    old_flagged = sum(
+        any(SequenceMatcher(None, normalize(t), r).ratio() >= OLD_THRESHOLD for r in window_norms)
+        for t in probes
+    ) / len(probes)
+
+    print(f"\nACCURACY  ({pairs} pairs; labels = SequenceMatcher ratio >= {OLD_THRESHOLD})")
+    print(f"  {'threshold':>9s}   {'vs shipped (autojunk)':>24s}   {'vs autojunk=False':>24s}   "
+          f"unrelated flagged vs {history} stored")
+    for t in thresholds:
+        decided = [(r[0], r[1], _flagged(r[2], r[3], t)) for r in rows]
+        p0, r0 = _pr(decided, 0)
+        p1, r1 = _pr(decided, 1)
+        flagged = sum(index.is_duplicate(s, t) for s in probe_sigs) / len(probes)
+        mark = "  ← SIMILARITY_THRESHOLD" if t == minhash.SIMILARITY_THRESHOLD else ""
+        print(f"  {t:9.2f}   P {p0:.3f}  R {r0:.3f}          P {p1:.3f}  R {r1:.3f}          "
+              f"{flagged:.3f}{mark}")
+    print(f"  old check (shipped) flags {old_flagged:.3f} of unrelated candidates vs {WINDOW} stored")
+    print(
+        "  note: the shipped check (difflib autojunk) misses most near-duplicates\n"
+        "        longer than 200 chars, so precision against it is capped by those;\n"
+        "        the autojunk=False ratio is the intended label"
+    )
+
+
+def latency(rng: random.Random, history: int, queries: int = 200):
+    print(f"\nLATENCY  (one duplicate check, non-duplicate query)")
+    norms = [normalize(_review(rng)) for _ in range(WINDOW)]
+    stored = [minhash.signature(_review(rng)) for _ in range(history)]
+    start = time.perf_counter()
+    index = minhash.LSHIndex(stored)
+    build_ms = (time.perf_counter() - start) * 1000
+    probes = [_review(rng) for _ in range(queries)]
+
+    sm = []
+    for t in probes[:20]:
+        nt = normalize(t)
+        start = time.perf_counter()
+        any(SequenceMatcher(None, nt, r).ratio() >= OLD_THRESHOLD for r in norms)
+        sm.append((time.perf_counter() - start) * 1000)
+
+    sig_ms, lookup_ms = [], []
+    for t in probes:
+        start = time.perf_counter()
+        sig = minhash.signature(t)
+        mid = time.perf_counter()
+        index.is_duplicate(sig)
+        end = time.perf_counter()
+        sig_ms.append((mid - start) * 1000)
+        lookup_ms.append((end - mid) * 1000)
+
+    print(f"    SequenceMatcher scan   {_ms(sm)}   (latest {WINDOW})")
+    print(f"    minhash signature      {_ms(sig_ms)}   (once per candidate)")
+    print(f"    LSH lookup             {_ms(lookup_ms)}   ({history} stored)")
+    print(f"    LSH index build        {build_ms:8.1f} ms   ({history} stored, once per cold load)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pairs", type=int, default=2000)
+    parser.add_argument("--history", type=int, default=5000)
+    parser.add_argument("--thresholds", type=float, nargs="+",
+                        default=[0.08, 0.10, 0.12, 0.15, 0.20, 0.30])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    accuracy(rng, args.pairs, args.history, args.thresholds)
+    latency(rng, args.history)
+
+
+if __name__ == "__main__":
+    main()
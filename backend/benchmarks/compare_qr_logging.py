@@ -0,0 +1,124 @@
+# benchmarks/compare_qr_logging.py
+"""
+qr_review_logs ingestion: awaited insert vs write-behind queue.
+
+PostgREST is an httpx MockTransport adding --rtt ms per request
+(no DB needed). Compared, per scan event on the request path:
+- before → awaited single-row insert (old _log_qr_event)
+- after  → enqueue only; the worker bulk-inserts in batches
+
+Also checks:
+- shutdown (write_behind.stop) lands every queued row
+- a full queue drops + counts instead of growing
+
+Run from backend/:
+    python -m benchmarks.compare_qr_logging --rtt 15 --events 500
+"""
+import os
+import sys
+import json
+import asyncio
+import argparse
+import statistics
+import time
+
+import httpx
+
+os.environ.setdefault("OPENAI_API_KEY", "offline")
+os.environ.setdefault("SUPABASE_URL", "http://postgrest.offline")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "offline")
+
+from app.core import metrics, write_behind
+from app.database.supabase import get_async_supabase
+from app.routes.generate_review import _log_qr_event
+
+PAYLOAD = {"client_id": "c-1", "rating": 5, "language": "English", "product": None}
+
+_round_trips = 0
+_rows = 0
+
+
+def _transport(rtt_ms: float) -> httpx.MockTransport:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        global _round_trips, _rows
+        _round_trips += 1
+        await asyncio.sleep(rtt_ms / 1000)
+
+        body = json.loads(request.content or b"[]")
+        _rows += len(body) if isinstance(body, list) else 1
+        return httpx.Response(201, json=[])
+
+    return httpx.MockTransport(handler)
+
+
+async def _before(payload: dict):
+    await get_async_supabase().table("qr_review_logs").insert(payload).execute()
+
+
+async def _after(payload: dict):
+    _log_qr_event(payload)
+
+
+async def _measure(label: str, fn, events: int):
+    global _round_trips, _rows
+    samples = []
+    _round_trips = _rows = 0
+
+    for _ in range(events):
+        start = time.perf_counter()
+        await fn(PAYLOAD)
+        samples.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0)      # rest of the request yields → worker gets to run
+
+    # after: drain what's still queued (same as app shutdown)
+    await write_behind.stop()
+
+    samples.sort()
+    print(
+        f"  {label:8s} p50 {statistics.median(samples):7.3f} ms   "
+        f"p99 {samples[int(len(samples) * 0.99) - 1]:7.3f} ms   "
+        f"round trips {_round_trips:4d}   rows stored {_rows}/{events}"
+    )
+    return _rows == events
+
+
+async def _check_drop(events: int) -> bool:
+    global _rows
+    _rows = 0
+    write_behind.MAX_DEPTH = events // 2
+    write_behind.FLUSH_INTERVAL = 3600
+    write_behind.BATCH_SIZE = events * 2      # nothing flushes until stop()
+
+    before = metrics.snapshot()["counters"].get("write_behind.dropped.qr_review_logs", 0)
+    for _ in range(events):
+        _log_qr_event(PAYLOAD)
+    queued = write_behind.depth()
+    await write_behind.stop()
+    dropped = metrics.snapshot()["counters"].get("write_behind.dropped.qr_review_logs", 0) - before
+
+    ok = queued == events // 2 and dropped == events - queued and _rows == queued
+    print(
+        f"  full queue: MAX_DEPTH {events // 2}, {events} events → "
+        f"queued {queued}, dropped {dropped}, stored {_rows}  {'OK' if ok else 'FAIL'}"
+    )
+    return ok
+
+
+async def main(rtt: float, events: int) -> bool:
+    get_async_supabase().session._transport = _transport(rtt)
+
+    print(f"\nqr_review_logs, {events} scan events, {rtt} ms per DB round trip "
+          f"(BATCH_SIZE {write_behind.BATCH_SIZE})")
+    ok = await _measure("before", _before, events)
+    ok &= await _measure("after", _after, events)
+    ok &= await _check_drop(events)
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rtt", type=float, default=15.0)
+    parser.add_argument("--events", type=int, default=500)
+    args = parser.parse_args()
+
+    sys.exit(0 if asyncio.run(main(args.rtt, args.events)) else 1)
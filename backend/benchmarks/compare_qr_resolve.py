@@ -0,0 +1,115 @@
+# benchmarks/compare_qr_resolve.py
+"""
+/r/{token} resolve latency: before vs after resolve_qr_token.
+
+PostgREST is an httpx MockTransport adding --rtt ms per request
+(no DB needed). Compared:
+- before      → qr_tokens select, then clients select (old route flow)
+- after cold  → ONE resolve_qr_token RPC (qr_cache cleared every scan)
+- after warm  → qr_cache hit, zero round trips
+
+Run from backend/:
+    python -m benchmarks.compare_qr_resolve --rtt 15 --scans 300
+"""
+import os
+import asyncio
+import argparse
+import statistics
+import time
+
+import httpx
+
+os.environ.setdefault("SUPABASE_URL", "http://postgrest.offline")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "offline")
+
+from fastapi import HTTPException
+from app.core import qr_cache
+from app.core.guards import check_client_status
+from app.database.supabase import get_async_supabase
+from app.routes.public_token import resolve_qr_token
+
+CLIENT = {"id": "c-1", "is_active": True, "start_date": "2020-01-01", "end_date": "2099-12-31"}
+TOKEN = {"client_id": "c-1", "is_active": True}
+
+_round_trips = 0
+
+
+def _transport(rtt_ms: float) -> httpx.MockTransport:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        global _round_trips
+        _round_trips += 1
+        await asyncio.sleep(rtt_ms / 1000)
+
+        path = request.url.path
+        if path.endswith("/rpc/resolve_qr_token"):
+            return httpx.Response(200, json={**TOKEN, "client": CLIENT})
+        if path.endswith("/qr_tokens"):
+            return httpx.Response(200, json=[TOKEN])
+        if path.endswith("/clients"):
+            return httpx.Response(200, json=[CLIENT])
+        return httpx.Response(200, json=[])
+
+    return httpx.MockTransport(handler)
+
+
+async def _before(token: str):
+    # old public_token flow: token select → client select → status checks
+    res = await (
+        get_async_supabase().table("qr_tokens")
+        .select("token, client_id, is_active").eq("token", token).execute()
+    )
+    qr = res.data[0] if res.data else None
+    if not qr:
+        raise HTTPException(status_code=404, detail="Invalid QR")
+
+    res_client = await (
+        get_async_supabase().table("clients")
+        .select("id, is_active, start_date, end_date").eq("id", qr["client_id"]).execute()
+    )
+    check_client_status(res_client.data[0])
+
+
+async def _after_cold(token: str):
+    qr_cache._tokens.clear()
+    await resolve_qr_token(token)
+
+
+async def _after_warm(token: str):
+    await resolve_qr_token(token)
+
+
+async def _measure(label: str, fn, scans: int):
+    global _round_trips
+    samples = []
+    _round_trips = 0
+
+    for i in range(scans):
+        start = time.perf_counter()
+        await fn("tok-bench")
+        samples.append((time.perf_counter() - start) * 1000)
+
+    samples.sort()
+    print(
+        f"  {label:12s} p50 {statistics.median(samples):7.2f} ms   "
+        f"p99 {samples[int(len(samples) * 0.99) - 1]:7.2f} ms   "
+        f"round trips/scan {_round_trips / scans:.2f}"
+    )
+
+
+async def main(rtt: float, scans: int):
+    get_async_supabase().session._transport = _transport(rtt)
+
+    print(f"\n/r/{{token}} resolve, {scans} scans, {rtt} ms per DB round trip")
+    await _measure("before", _before, scans)
+    await _measure("after cold", _after_cold, scans)
+    await _after_warm("tok-bench")
+    await _measure("after warm", _after_warm, scans)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rtt", type=float, default=15.0)
+    parser.add_argument("--scans", type=int, default=300)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.rtt, args.scans))
@@ -0,0 +1,160 @@
+# benchmarks/conftest.py
+"""
+Micro-benchmark harness for benchmarks/bench_*.py (plain pytest, no plugin).
+
+Run from backend/:
+    python -m pytest -c benchmarks/pytest.ini benchmarks                # measure + compare to baseline
+    python -m pytest -c benchmarks/pytest.ini benchmarks -k anti_spam
+    python -m pytest -c benchmarks/pytest.ini benchmarks --bench-save   # accept → rewrite the baseline
+
+`benchmark(fn, *args)` is called like pytest-benchmark's fixture: calls per
+round are calibrated so one round takes >= MIN_ROUND_S, rounds repeat for
+MAX_TIME_S (at least MIN_ROUNDS), per-call min / median are kept.
+
+Baseline: benchmarks/baselines/brain_text.json (median µs per test id).
+A test whose median is slower than baseline × --bench-tolerance fails,
+so a change to the similarity logic has to re-save the baseline (and its
+cost shows in the diff). Baselines from another machine / python are
+only reported, never enforced.
+"""
+import os
+import sys
+import json
+import time
+import platform
+import statistics
+
+import pytest
+
+from benchmarks import corpus
+
+# ---------------- CONFIG ----------------
+MIN_ROUND_S = 0.002
+MAX_TIME_S = 0.5
+MIN_ROUNDS = 5
+BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "brain_text.json")
+
+_results: dict = {}     # test id → stats
+
+
+def _machine() -> dict:
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count()
+    }
+
+
+def _load_baseline() -> dict:
+    if not os.path.exists(BASELINE):
+        return {"machine": None, "benchmarks": {}}
+    with open(BASELINE) as f:
+        return json.load(f)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("bench")
+    group.addoption("--bench-save", action="store_true",
+                    help="write this run's medians to the baseline")
+    group.addoption("--bench-tolerance", type=float, default=1.5,
+                    help="fail when median > baseline × this (0 = report only)")
+
+
+def pytest_configure(config):
+    # no cache under -p no:cacheprovider → corpora are rebuilt every run
+    cache = getattr(config, "cache", None)
+    if cache is not None:
+        corpus.CACHE_DIR = str(cache.mkdir("brain_corpus"))
+    config._bench_baseline = _load_baseline()
+
+
+class Benchmark:
+    def __init__(self, name: str, baseline: dict, tolerance: float):
+        self.name = name
+        self.baseline = baseline
+        self.tolerance = tolerance
+
+    def __call__(self, fn, *args, **kwargs):
+        # calibrate: enough calls per round for the clock to be meaningful
+        iterations = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(iterations):
+                result = fn(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+            if elapsed >= MIN_ROUND_S:
+                break
+            iterations *= 2
+
+        samples = []
+        deadline = time.perf_counter() + MAX_TIME_S
+        while len(samples) < MIN_ROUNDS or time.perf_counter() < deadline:
+            start = time.perf_counter()
+            for _ in range(iterations):
+                fn(*args, **kwargs)
+            samples.append((time.perf_counter() - start) / iterations * 1e6)
+
+        stats = {
+            "median_us": round(statistics.median(samples), 2),
+            "min_us": round(min(samples), 2),
+            "rounds": len(samples),
+            "iterations": iterations
+        }
+        _results[self.name] = stats
+
+        # same machine only: timings elsewhere are not comparable
+        base = self.baseline["benchmarks"].get(self.name)
+        enforce = self.tolerance > 0 and self.baseline["machine"] == _machine()
+        if enforce and base and stats["median_us"] > base["median_us"] * self.tolerance:
+            pytest.fail(
+                f"{self.name}: {stats['median_us']:.1f} µs vs baseline "
+                f"{base['median_us']:.1f} µs (> x{self.tolerance}); "
+                f"re-run with --bench-save if the cost is intended",
+                pytrace=False
+            )
+        return result
+
+
+@pytest.fixture
+def benchmark(request):
+    config = request.config
+    return Benchmark(
+        request.node.nodeid,
+        config._bench_baseline,
+        0 if config.getoption("bench_save") else config.getoption("bench_tolerance")
+    )
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not _results:
+        return
+    base = config._bench_baseline["benchmarks"]
+    tr = terminalreporter
+    tr.section("benchmarks (µs per call)")
+    tr.write_line(f"{'':72s} {'median':>10s} {'min':>10s} {'baseline':>10s} {'ratio':>6s}")
+    for name, s in sorted(_results.items()):
+        b = base.get(name, {}).get("median_us")
+        ratio = f"{s['median_us'] / b:6.2f}" if b else "     -"
+        tr.write_line(
+            f"{name:72s} {s['median_us']:10.1f} {s['min_us']:10.1f} "
+            f"{b if b else '-':>10} {ratio}"
+        )
+    if config._bench_baseline["machine"] not in (None, _machine()):
+        tr.write_line("baseline was recorded on another machine / python → not enforced")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    if not config.getoption("bench_save") or not _results:
+        return
+
+    # keep entries of benchmarks not selected in this run (-k)
+    benchmarks = {**config._bench_baseline["benchmarks"], **_results}
+    baseline = {"machine": _machine(), "benchmarks": dict(sorted(benchmarks.items()))}
+
+    os.makedirs(os.path.dirname(BASELINE), exist_ok=True)
+    with open(BASELINE, "w") as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+    print(f"\nbaseline saved → {os.path.relpath(BASELINE)}", file=sys.stderr)
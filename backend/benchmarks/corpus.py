@@ -0,0 +1,88 @@
+# benchmarks/corpus.py
+"""
+Synthetic review corpora for the bench_*.py micro-benchmarks
+(no DB / network).
+
+- review(rng, n_words) → one review, sentences of 4-16 words
+- stored(n)            → a business with n stored reviews (20-160 words)
+                         + their minhash, newest first
+- memory(n)            → review_cache.ReviewMemory, as review_cache._load builds it:
+                         the newest WINDOW as entries, all n in the LSH index
+- install(mem)         → puts it in the per-worker cache (every call = cache hit)
+- novel(n_words)       → candidate from a vocabulary the stored reviews never
+                         use: not a duplicate, so every check runs to the end
+                         (the path of an accepted review)
+
+stored() keeps its rows in CACHE_DIR (pytest's cache, set by conftest).
+"""
+import os
+import time
+import pickle
+import random
+
+from app.brain import minhash
+from app.memory import review_cache
+from benchmarks.compare_minhash import VOCAB
+
+SEED = 20261018
+BUSINESS_ID = "00000000-0000-4000-8000-000000000bench"
+INDUSTRY = "Restaurant"
+
+CACHE_DIR = None    # set by benchmarks/conftest.py
+
+NOVEL_VOCAB = (
+    "ambience playlist lighting upholstery balcony terrace skyline monsoon "
+    "chutney saffron cardamom masala tandoor biryani paneer lassi jalebi "
+    "manicure pedicure keratin balayage threading facial massage aromatherapy "
+    "physiotherapy dermatology orthodontics xray pharmacy prescription "
+    "treadmill kettlebell yoga pilates zumba spinning dumbbell locker"
+).split()
+
+
+def review(rng: random.Random, n_words: int, vocab=VOCAB, sentence=(4, 16)) -> str:
+    out, left = [], n_words
+    while left > 0:
+        k = min(left, rng.randint(*sentence))
+        left -= k
+        out.append(" ".join(rng.choice(vocab) for _ in range(k)).capitalize())
+    return ". ".join(out) + "."
+
+
+def novel(n_words: int) -> str:
+    # 3-word sentences: a structure pattern stored reviews (4+ words) rarely have
+    return review(random.Random(SEED + n_words), n_words, NOVEL_VOCAB, (3, 3))
+
+
+def stored(n: int) -> list[tuple]:
+    """
+    [(text, signature)] newest first, same for every run.
+    """
+    path = CACHE_DIR and os.path.join(CACHE_DIR, f"stored-{SEED}-{n}.pickle")
+    if path and os.path.exists(path):
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    rng = random.Random(SEED + n)
+    rows = []
+    for _ in range(n):
+        text = review(rng, rng.randint(20, 160))
+        rows.append((text, minhash.signature(text)))
+
+    if path:
+        with open(path, "wb") as f:
+            pickle.dump(rows, f)
+    return rows
+
+
+def memory(n: int) -> review_cache.ReviewMemory:
+    rows = stored(n)
+    window = review_cache.WINDOW
+    return review_cache.ReviewMemory(
+        (review_cache.ReviewEntry(text, None, sig) for text, sig in rows[:window]),
+        (sig for _, sig in rows[window:])
+    )
+
+
+def install(mem: review_cache.ReviewMemory):
+    mem.loaded_at = time.monotonic()
+    review_cache._memories[(BUSINESS_ID, INDUSTRY)] = mem
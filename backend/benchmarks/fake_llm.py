@@ -0,0 +1,81 @@
+# benchmarks/fake_llm.py
+"""
+In-process stand-in for chat.completions.create (offline checks).
+Answers the three call shapes the engine makes: opening / ending
+batches (json_schema), structured reviews (json_schema), plain bodies.
+
+Shaped so the pipeline's own filters pass it, or the load tests would
+measure the fake: batch phrases have >= 4 words (opening_engine keeps
+only those), bodies are 2-6 sentences of 4-16 words from a ~100-word
+vocabulary, so unrelated drafts differ in structure and shingles.
+
+Knobs for the candidate / rewrite comparison (benchmarks.compare_candidates):
+- REPEAT_RATE → share of bodies that repeat one of the last RECENT bodies
+  (an LLM falling back on the same review; rejected by the duplicate checks)
+- EMPTY_RATE  → share of choices that come back empty
+"""
+import json
+import uuid
+import random
+import asyncio
+from collections import deque
+from types import SimpleNamespace
+
+from benchmarks.compare_minhash import VOCAB
+
+
+REPEAT_RATE = 0.0
+EMPTY_RATE = 0.0
+RECENT = 8
+
+_recent: deque = deque(maxlen=RECENT)
+
+
+def _body() -> str:
+    if random.random() < EMPTY_RATE:
+        return ""
+    if _recent and random.random() < REPEAT_RATE:
+        return random.choice(_recent)
+
+    body = ". ".join(
+        " ".join(random.choices(VOCAB, k=random.randint(4, 16))).capitalize()
+        for _ in range(random.randint(2, 6))
+    ) + "."
+    _recent.append(body)
+    return body
+
+
+def completion_texts(kw: dict) -> list[str]:
+    """
+    Message contents for one chat.completions.create(**kw) call
+    (also served over HTTP by benchmarks.fake_openai).
+    """
+    fmt = kw.get("response_format")
+    name = fmt["json_schema"]["name"] if fmt else None
+
+    if name in ("openings", "endings"):
+        tag = uuid.uuid4().hex[:6]
+        kind = name[:-1].capitalize()
+        content = [json.dumps({name: [f"{kind} line {tag} number {i}" for i in range(24)]})]
+    else:
+        content = [_body() for _ in range(kw.get("n", 1))]
+        if name:
+            content = [json.dumps({"opening": "Visited", "body": c, "closing": "Thanks"})
+                       for c in content]
+    return content
+
+
+async def fake_create(**kw):
+    await asyncio.sleep(0.02)
+    content = completion_texts(kw)
+
+    return SimpleNamespace(
+        choices=[
+            SimpleNamespace(message=SimpleNamespace(content=c), finish_reason="stop")
+            for c in content
+        ]
+    )
+
+
+async def failing_create(**kw):
+    raise RuntimeError("LLM unavailable (offline check)")
@@ -0,0 +1,97 @@
+# benchmarks/fake_openai.py
+"""
+In-process OpenAI-compatible chat endpoint (offline load tests).
+
+Installed as the transport of the shared OpenAI pool
+(core/openai_client.get_async_client), so the real SDK builds and
+parses real HTTP requests / responses:
+- POST /chat/completions          → chat.completion JSON (n choices)
+- POST /chat/completions, stream  → chat.completion.chunk SSE + [DONE]
+
+Latency: latency_ms before the answer (time to first token), then
+token_ms per streamed word. Content comes from fake_llm.completion_texts
+(opening / ending batches, structured reviews, plain bodies).
+"""
+import json
+import time
+import uuid
+import asyncio
+import importlib
+
+from app.core.openai_client import get_async_client
+from benchmarks.fake_llm import completion_texts
+
+
+def _httpx_of(client):
+    # newer openai releases ship their own httpx fork → use its Response / MockTransport
+    for cls in type(client).__mro__:
+        root = cls.__module__.split(".")[0]
+        if root.startswith("httpx"):
+            return importlib.import_module(root)
+
+
+class FakeOpenAI:
+    def __init__(self, latency_ms: float = 300.0, token_ms: float = 0.0):
+        self.latency_ms = latency_ms
+        self.token_ms = token_ms
+        self.calls = 0
+
+    def install(self):
+        http = get_async_client()._client
+        self.httpx = _httpx_of(http)
+        http._transport = self.httpx.MockTransport(self._handle)
+
+    async def _handle(self, request):
+        httpx = self.httpx
+
+        if not request.url.path.endswith("/chat/completions"):
+            return httpx.Response(404, json={"error": {"message": "not found"}})
+
+        self.calls += 1
+        kw = json.loads(request.content)
+        texts = completion_texts(kw)
+
+        await asyncio.sleep(self.latency_ms / 1000)
+
+        if kw.get("stream"):
+            return httpx.Response(
+                200,
+                headers={"content-type": "text/event-stream"},
+                content=self._stream(kw, texts[0])
+            )
+
+        return httpx.Response(200, json={
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": kw.get("model"),
+            "choices": [
+                {
+                    "index": i,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop"
+                }
+                for i, text in enumerate(texts)
+            ],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        })
+
+    async def _stream(self, kw: dict, text: str):
+        chunk_id = f"chatcmpl-{uuid.uuid4().hex}"
+
+        def event(delta: dict, finish: str | None = None) -> bytes:
+            return ("data: " + json.dumps({
+                "id": chunk_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": kw.get("model"),
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}]
+            }) + "\n\n").encode()
+
+        yield event({"role": "assistant", "content": ""})
+        for word in text.split(" "):
+            if self.token_ms:
+                await asyncio.sleep(self.token_ms / 1000)
+            yield event({"content": word + " "})
+        yield event({}, "stop")
+        yield b"data: [DONE]\n\n"
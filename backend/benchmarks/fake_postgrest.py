@@ -0,0 +1,227 @@
+# benchmarks/fake_postgrest.py
+"""
+In-process PostgREST stand-in (offline load tests).
+
+Installed on the shared clients from database/supabase.py
+(get_supabase / get_async_supabase → session transport), so the real
+app code runs unchanged against in-memory tables:
+clients, client_types, qr_tokens, qr_review_logs, review_memory,
+narrative_usage, opening_usage, ending_usage (any table works).
+
+Covers what the backend sends:
+- GET    select / eq / neq / gt / gte / lt / lte / in / is / not.* / or, order, limit, offset
+- POST   insert (single / bulk), upsert (Prefer: resolution=..., on_conflict)
+- PATCH  update, DELETE
+- RPC    resolve_qr_token, qr_cache_changes, increment_<table>
+  (updates to qr_tokens / clients bump updated_at, like the trigger)
+
+Every request is one round trip (optionally delayed by rtt_ms) and is
+counted per "METHOD table" in `calls`.
+"""
+import json
+import uuid
+import asyncio
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+import httpx
+
+from app.database.supabase import get_supabase, get_async_supabase
+
+RESERVED = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+TOUCHED = {"qr_tokens", "clients"}      # updated_at trigger tables
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _match(value, op: str, arg: str) -> bool:
+    arg = arg.strip('"')     # postgrest-py quotes values with reserved chars
+
+    if op == "not":
+        op, arg = arg.split(".", 1)
+        return not _match(value, op, arg)
+    if op == "is":
+        return value is None if arg == "null" else str(value).lower() == arg
+    if value is None:
+        return False
+    if op == "in":
+        return str(value) in [a.strip('"') for a in arg.strip("()").split(",")]
+
+    if isinstance(value, bool):
+        value = str(value).lower()
+    elif isinstance(value, (int, float)):
+        try:
+            arg = float(arg)
+        except ValueError:
+            value = str(value)
+    else:
+        value = str(value)
+
+    return {
+        "eq": value == arg,
+        "neq": value != arg,
+        "gt": value > arg,
+        "gte": value >= arg,
+        "lt": value < arg,
+        "lte": value <= arg,
+    }.get(op, False)
+
+
+def _filter(row: dict, col: str, op: str, arg: str) -> bool:
+    if col == "or":
+        # or=(a.op.x,b.op.y) → split back into column filters
+        parts = f"{op}.{arg}".strip("()").split(",")
+        return any(_filter(row, *p.split(".", 2)) for p in parts)
+    return _match(row.get(col), op, arg)
+
+
+class FakePostgrest:
+    def __init__(self, rtt_ms: float = 0.0):
+        self.rtt_ms = rtt_ms
+        self.tables: dict = defaultdict(list)
+        self.calls: Counter = Counter()
+
+    # ---------------- SETUP ----------------
+
+    def seed(self, table: str, rows: list):
+        for row in rows:
+            self.tables[table].append({"id": str(uuid.uuid4()), "created_at": _now(), **row})
+
+    def install(self):
+        get_supabase().session._transport = httpx.MockTransport(self._handle)
+        get_async_supabase().session._transport = httpx.MockTransport(self._handle_async)
+
+    @property
+    def round_trips(self) -> int:
+        return sum(self.calls.values())
+
+    # ---------------- TRANSPORT ----------------
+
+    async def _handle_async(self, request: httpx.Request) -> httpx.Response:
+        if self.rtt_ms:
+            await asyncio.sleep(self.rtt_ms / 1000)
+        return self._handle(request)
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.split("/rest/v1/", 1)[-1]
+        body = json.loads(request.content) if request.content else None
+
+        if path.startswith("rpc/"):
+            name = path[4:]
+            self.calls[f"RPC {name}"] += 1
+            return httpx.Response(200, json=self._rpc(name, body or {}))
+
+        self.calls[f"{request.method} {path}"] += 1
+        params = request.url.params
+        filters = [
+            (col, *value.split(".", 1))
+            for col, value in params.multi_items()
+            if col not in RESERVED
+        ]
+
+        if request.method == "GET":
+            return httpx.Response(200, json=self._select(path, params, filters))
+        if request.method == "POST":
+            prefer = request.headers.get("prefer", "")
+            return httpx.Response(201, json=self._insert(path, body, params.get("on_conflict"), prefer))
+        if request.method == "PATCH":
+            rows = self._rows(path, filters)
+            for row in rows:
+                row.update(body or {})
+                if path in TOUCHED:
+                    row["updated_at"] = _now()
+            return httpx.Response(200, json=rows)
+        if request.method == "DELETE":
+            rows = self._rows(path, filters)
+            self.tables[path] = [r for r in self.tables[path] if r not in rows]
+            return httpx.Response(200, json=rows)
+
+        return httpx.Response(405, json={"message": "method not supported"})
+
+    # ---------------- TABLES ----------------
+
+    def _rows(self, table: str, filters: list) -> list:
+        return [
+            row for row in self.tables[table]
+            if all(_filter(row, col, op, arg) for col, op, arg in filters)
+        ]
+
+    def _select(self, table: str, params, filters: list) -> list:
+        rows = self._rows(table, filters)
+
+        for part in reversed((params.get("order") or "").split(",")):
+            if part:
+                col, _, direction = part.partition(".")
+                rows.sort(key=lambda r: (r.get(col) is None, r.get(col) or ""),
+                          reverse=direction.startswith("desc"))
+
+        offset = int(params.get("offset") or 0)
+        limit = params.get("limit")
+        rows = rows[offset:offset + int(limit)] if limit else rows[offset:]
+
+        columns = [c.strip() for c in (params.get("select") or "*").split(",")]
+        if "*" in columns:
+            return [dict(r) for r in rows]
+        return [{c: r.get(c) for c in columns} for r in rows]
+
+    def _insert(self, table: str, body, on_conflict: str | None, prefer: str) -> list:
+        rows = body if isinstance(body, list) else [body]
+        keys = on_conflict.split(",") if on_conflict else None
+        out = []
+
+        for row in rows:
+            existing = None
+            if keys:
+                existing = next(
+                    (r for r in self.tables[table] if all(r.get(k) == row.get(k) for k in keys)),
+                    None
+                )
+
+            if existing is None:
+                new = {"id": str(uuid.uuid4()), "created_at": _now(), **row}
+                self.tables[table].append(new)
+                out.append(new)
+            elif "merge-duplicates" in prefer:
+                existing.update(row)
+                out.append(existing)
+
+        return out
+
+    # ---------------- RPC ----------------
+
+    def _rpc(self, name: str, args: dict):
+        if name == "resolve_qr_token":
+            token = next((t for t in self.tables["qr_tokens"] if t.get("token") == args.get("p_token")), None)
+            if token is None:
+                return None
+            client = next((c for c in self.tables["clients"] if c["id"] == token.get("client_id")), None)
+            return {
+                "client_id": token.get("client_id"),
+                "is_active": token.get("is_active"),
+                "client": client and {k: client.get(k) for k in ("id", "is_active", "start_date", "end_date")}
+            }
+
+        if name == "qr_cache_changes":
+            since = args.get("p_since")
+
+            def changed(table, col):
+                return [
+                    r[col] for r in self.tables[table]
+                    if since and (r.get("updated_at") or "") > since
+                ]
+            return {"now": _now(), "tokens": changed("qr_tokens", "token"), "clients": changed("clients", "id")}
+
+        if name.startswith("increment_"):
+            table = name[len("increment_"):]
+            for row in args.get("p_rows", []):
+                key = {k: v for k, v in row.items() if k != "usage_count"}
+                match = self._rows(table, [(k, "eq", str(v)) for k, v in key.items()])
+                if match:
+                    match[0]["usage_count"] = (match[0].get("usage_count") or 0) + row["usage_count"]
+                else:
+                    self.seed(table, [row])
+            return None
+
+        return None
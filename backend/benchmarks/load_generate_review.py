@@ -0,0 +1,190 @@
+# benchmarks/load_generate_review.py
+"""
+Offline load test for POST /api/generate-review.
+
+The real app (routes, caches, write-behind, draft pool) against the
+offline stand-ins (benchmarks.offline_stack): no Supabase, no OpenAI
+spend. Runs fixed concurrency levels one after another and reports,
+per level:
+- throughput (req/s), latency p50 / p95 / p99
+- peak in flight: most requests inside the pipeline at once (one worker)
+- DB round trips per request (incl. write-behind flushes)
+- LLM calls per request (incl. draft-pool refills)
+- top DB calls per request for the last level
+
+--mode async,sync compares the async route with the old sync one:
+`sync` is a plain `def` endpoint holding one threadpool thread for the
+whole pipeline, as the blocking OpenAI / PostgREST calls did, so a worker
+keeps at most the threadpool size (anyio default 40) in flight.
+
+Run from backend/:
+    python -m benchmarks.load_generate_review --concurrency 1,4,16,64 --requests 200
+    python -m benchmarks.load_generate_review --mode async --json report.json   # keep for diffing
+"""
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+
+import anyio.to_thread
+
+from benchmarks.offline_stack import install, seed, running_app, quiet_app, report
+from app.main import app
+from app.core import write_behind
+from app.brain import draft_pool
+from app.routes import generate_review as review_route
+
+SYNC_PATH = "/bench/generate-review-sync"
+
+
+class _InFlight:
+    # wraps the pipeline the route awaits: requests inside it right now
+    def __init__(self, generate):
+        self.generate = generate
+        self.current = 0
+        self.peak = 0
+
+    async def __call__(self, payload: dict) -> dict:
+        self.current += 1
+        self.peak = max(self.peak, self.current)
+        try:
+            return await self.generate(payload)
+        finally:
+            self.current -= 1
+
+
+def _install_sync_route(loop: asyncio.AbstractEventLoop):
+    # the pre-async route: `def` → Starlette runs it in the threadpool,
+    # the thread is held until the whole pipeline is done
+    def generate_review_sync(payload: dict):
+        return asyncio.run_coroutine_threadsafe(
+            review_route.generate_review_route(payload), loop
+        ).result()
+
+    app.add_api_route(SYNC_PATH, generate_review_sync, methods=["POST"])
+
+
+def _pct(samples: list, pct: float) -> float:
+    return samples[min(int(len(samples) * pct / 100), len(samples) - 1)]
+
+
+async def _level(
+    http, db, llm, in_flight: _InFlight, clients: list,
+    concurrency: int, requests: int, path: str = "/api/generate-review"
+) -> dict:
+    db.calls.clear()
+    llm.calls = 0
+    in_flight.peak = 0
+    latencies = []
+    errors = 0
+    todo = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in todo:
+            payload = {
+                "client_id": random.choice(clients),
+                "rating": random.choice((3, 4, 5)),
+                "language": "English"
+            }
+            start = time.perf_counter()
+            res = await http.post(path, json=payload)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if res.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+
+    # bookkeeping writes of these requests are part of their DB cost
+    await write_behind.flush()
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "peak_in_flight": in_flight.peak,
+        "requests": requests,
+        "errors": errors,
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(_pct(latencies, 50), 1),
+        "p95_ms": round(_pct(latencies, 95), 1),
+        "p99_ms": round(_pct(latencies, 99), 1),
+        "db_per_request": round(db.round_trips / requests, 2),
+        "llm_per_request": round(llm.calls / requests, 2),
+        "db_calls": {k: round(v / requests, 2) for k, v in db.calls.most_common()},
+    }
+
+
+async def main(args) -> bool:
+    random.seed(args.seed)
+    if args.draft_pool is not None:
+        draft_pool.POOL_SIZE = args.draft_pool
+    db, llm = install(args.db_rtt, args.llm_latency, args.llm_token_ms)
+    clients, _ = seed(db, clients=args.clients, tokens_per_client=1, seed=args.seed)
+
+    in_flight = _InFlight(review_route.generate_review)
+    review_route.generate_review = in_flight
+    if "sync" in args.mode:
+        _install_sync_route(asyncio.get_running_loop())
+
+    report(
+        f"\nPOST /api/generate-review — {args.clients} clients, "
+        f"DB rtt {args.db_rtt} ms, LLM latency {args.llm_latency} ms, "
+        f"draft pool {draft_pool.POOL_SIZE}, "
+        f"threadpool {anyio.to_thread.current_default_thread_limiter().total_tokens}"
+    )
+    report(f"  {'mode':>5s} {'conc':>4s} {'req':>5s} {'req/s':>7s} {'p50':>8s} {'p95':>8s} {'p99':>8s} "
+          f"{'peak':>5s} {'db/req':>7s} {'llm/req':>8s} {'errors':>6s}")
+
+    results = []
+    async with running_app() as http:
+        # warm caches (client config, usage maps, review memory) first
+        await _level(http, db, llm, in_flight, clients, min(8, args.clients), args.warmup)
+
+        for mode in args.mode:
+            path = SYNC_PATH if mode == "sync" else "/api/generate-review"
+            for concurrency in args.concurrency:
+                r = await _level(http, db, llm, in_flight, clients, concurrency, args.requests, path)
+                r["mode"] = mode
+                results.append(r)
+                report(
+                    f"  {mode:>5s} {r['concurrency']:4d} {r['requests']:5d} {r['rps']:7.1f} "
+                    f"{r['p50_ms']:6.1f}ms {r['p95_ms']:6.1f}ms {r['p99_ms']:6.1f}ms "
+                    f"{r['peak_in_flight']:5d} {r['db_per_request']:7.2f} "
+                    f"{r['llm_per_request']:8.2f} {r['errors']:6d}"
+                )
+
+    report("\n  DB calls per request (last level)")
+    for call, per_request in results[-1]["db_calls"].items():
+        report(f"    {call:32s} {per_request:.2f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "levels": results}, f, indent=2)
+
+    return all(r["errors"] == 0 for r in results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=lambda v: [int(c) for c in v.split(",")], default=[1, 4, 16, 64])
+    parser.add_argument("--mode", type=lambda v: v.split(","), default=["async", "sync"],
+                        help="async (current route) and / or sync (threadpool baseline)")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--db-rtt", type=float, default=5.0)
+    parser.add_argument("--llm-latency", type=float, default=300.0)
+    parser.add_argument("--llm-token-ms", type=float, default=0.0)
+    parser.add_argument("--draft-pool", type=int, help="override DRAFT_POOL_SIZE (0 = off)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json")
+    parser.add_argument("--verbose", action="store_true", help="keep the app's own prints")
+    args = parser.parse_args()
+
+    with quiet_app(args.verbose):
+        ok = asyncio.run(main(args))
+    sys.exit(0 if ok else 1)
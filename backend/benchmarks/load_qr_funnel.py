@@ -0,0 +1,331 @@
+# benchmarks/load_qr_funnel.py
+"""
+QR scan funnel load profile (offline, multi-worker).
+
+Replays scan funnels against `uvicorn benchmarks.offline_app:app
+--workers N` (real processes, real HTTP, offline stand-ins per worker):
+
+    GET /r/{token}  →  GET /public-client/{client_id}  →  (think)
+    →  POST /api/generate-review/stream   (--convert share of scanners)
+
+(same calls as frontend PublicReview.jsx; --no-stream uses
+POST /api/generate-review instead)
+
+Traffic is open-loop (Poisson arrivals, --rate funnels/s) with a spike
+(--spike-x times the rate for --spike-for s, starting at --spike-at s),
+like new table cards going up. Tokens are picked with a skewed
+(Zipf-like) popularity over clients: a few shops get most scans.
+
+Per worker count it reports:
+- latency p50 / p95 / p99 per step against the p95 SLOs (PASS / FAIL)
+- where the time goes: mean generate-review stage timings (debug.timings_ms)
+- DB round trips and LLM calls per funnel, cache hit rates (all workers)
+
+Run from backend/:
+    python -m benchmarks.load_qr_funnel --workers 1,4,16
+    python -m benchmarks.load_qr_funnel --workers 4 --rate 40 --spike-x 8 --duration 30
+"""
+import os
+import sys
+import json
+import time
+import random
+import socket
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from collections import Counter, defaultdict
+
+import httpx
+
+from benchmarks.offline_stack import seed
+from benchmarks.fake_postgrest import FakePostgrest
+
+STEPS = ("scan", "client", "first_text", "generate")
+READY_TIMEOUT = 60        # seconds
+
+
+def _pct(samples: list, pct: float) -> float:
+    return samples[min(int(len(samples) * pct / 100), len(samples) - 1)] if samples else 0.0
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _tokens(args) -> list:
+    # same seed as the workers → same tokens (offline_stack.seed is deterministic)
+    _, tokens = seed(FakePostgrest(), args.clients, args.tokens_per_client, args.seed)
+    # group per client, in seed order
+    return [
+        tokens[i:i + args.tokens_per_client]
+        for i in range(0, len(tokens), args.tokens_per_client)
+    ]
+
+
+def _arrivals(args, rnd: random.Random) -> list:
+    """Poisson arrival times (s) with one spike window."""
+    times, t = [], 0.0
+    while True:
+        spiking = args.spike_at <= t < args.spike_at + args.spike_for
+        rate = args.rate * (args.spike_x if spiking else 1)
+        t += rnd.expovariate(rate)
+        if t >= args.duration:
+            return times
+        times.append(t)
+
+
+# ---------------- WORKERS ----------------
+
+def _start_workers(args, workers: int, stats_dir: str):
+    port = _free_port()
+    env = {
+        **os.environ,
+        "OFFLINE_CLIENTS": str(args.clients),
+        "OFFLINE_TOKENS_PER_CLIENT": str(args.tokens_per_client),
+        "OFFLINE_SEED": str(args.seed),
+        "OFFLINE_DB_RTT_MS": str(args.db_rtt),
+        "OFFLINE_LLM_LATENCY_MS": str(args.llm_latency),
+        "OFFLINE_STATS_DIR": stats_dir,
+    }
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "benchmarks.offline_app:app",
+            "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+        ],
+        env=env
+    )
+
+    # ready = every worker answered (fresh connection each poll → spread over workers)
+    pids, deadline = set(), time.monotonic() + READY_TIMEOUT
+    while len(pids) < workers:
+        if time.monotonic() > deadline:
+            proc.terminate()
+            raise RuntimeError(f"only {len(pids)}/{workers} workers came up")
+        try:
+            pids.add(httpx.get(f"http://127.0.0.1:{port}/_bench/worker", timeout=1).json()["pid"])
+        except httpx.TransportError:
+            time.sleep(0.05)
+
+    return proc, f"http://127.0.0.1:{port}"
+
+
+def _stop_workers(proc, stats_dir: str) -> dict:
+    proc.terminate()
+    proc.wait(timeout=60)
+
+    total = {"db_calls": Counter(), "llm_calls": 0, "counters": Counter()}
+    for name in os.listdir(stats_dir):
+        with open(os.path.join(stats_dir, name)) as f:
+            stats = json.load(f)
+        total["db_calls"].update(stats["db_calls"])
+        total["llm_calls"] += stats["llm_calls"]
+        total["counters"].update(stats["counters"])
+    return total
+
+
+# ---------------- FUNNEL ----------------
+
+async def _generate_stream(http, payload: dict, samples: dict) -> dict | None:
+    """
+    POST /api/generate-review/stream (what PublicReview.jsx calls):
+    first_text = first "opening" event, generate = whole stream.
+    Returns the "done" event data.
+    """
+    start = time.perf_counter()
+    event, done = None, None
+
+    async with http.stream("POST", "/api/generate-review/stream", json=payload) as res:
+        if res.status_code != 200:
+            return None
+        async for line in res.aiter_lines():
+            if line.startswith("event: "):
+                event = line[7:]
+                if event == "opening":
+                    samples["first_text"].append((time.perf_counter() - start) * 1000)
+            elif line.startswith("data: ") and event == "done":
+                done = json.loads(line[6:])
+
+    samples["generate"].append((time.perf_counter() - start) * 1000)
+    return done
+
+
+async def _funnel(http, args, rnd, token: str, samples: dict, stages: dict, errors: Counter):
+    async def step(name, method, url, ok_status=(200,), **kw):
+        start = time.perf_counter()
+        try:
+            res = await http.request(method, url, **kw)
+        except httpx.HTTPError:
+            errors[name] += 1
+            return None
+        samples[name].append((time.perf_counter() - start) * 1000)
+        if res.status_code not in ok_status:
+            errors[name] += 1
+            return None
+        return res
+
+    # /r/{token} answers JSON {client_id} (public_qr is registered first);
+    # a 302 to /review/{client_id} is accepted too
+    res = await step("scan", "GET", f"/r/{token}", ok_status=(200, 302))
+    if res is None:
+        return
+    if res.status_code == 302:
+        client_id = res.headers["location"].rsplit("/", 1)[-1]
+    else:
+        client_id = res.json()["client_id"]
+
+    if await step("client", "GET", f"/public-client/{client_id}") is None:
+        return
+
+    if rnd.random() >= args.convert:
+        return
+
+    # customer picks a rating / product before generating
+    await asyncio.sleep(rnd.expovariate(1000 / args.think_ms) if args.think_ms else 0)
+
+    payload = {
+        "client_id": client_id,
+        "rating": rnd.choice((3, 4, 5, 5, 5)),
+        "language": "English"
+    }
+
+    try:
+        if args.no_stream:
+            res = await step("generate", "POST", "/api/generate-review", json=payload)
+            done = res.json() if res is not None else None
+        else:
+            done = await _generate_stream(http, payload, samples)
+    except httpx.HTTPError:
+        done = None
+
+    if not done:
+        errors["generate"] += 1
+        return
+
+    for stage, ms in ((done.get("debug") or {}).get("timings_ms") or {}).items():
+        if isinstance(ms, (int, float)):
+            stages[stage].append(ms)
+
+
+async def _profile(args, base_url: str, tokens: list) -> tuple:
+    rnd = random.Random(args.seed + 1)
+    arrivals = _arrivals(args, rnd)
+
+    # skewed shop popularity: weight 1 / rank^skew
+    weights = [1 / (rank + 1) ** args.skew for rank in range(len(tokens))]
+
+    samples = defaultdict(list)
+    stages = defaultdict(list)
+    errors = Counter()
+
+    limits = httpx.Limits(max_connections=args.max_connections, max_keepalive_connections=args.max_connections)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as http:
+        start = time.perf_counter()
+        tasks = []
+        for at in arrivals:
+            delay = at - (time.perf_counter() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            token = rnd.choice(rnd.choices(tokens, weights)[0])
+            tasks.append(asyncio.create_task(_funnel(http, args, rnd, token, samples, stages, errors)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+
+    return len(arrivals), elapsed, samples, stages, errors
+
+
+# ---------------- REPORT ----------------
+
+def _report(args, workers: int, funnels: int, elapsed: float, samples, stages, errors, stats) -> bool:
+    slo = {
+        "scan": args.slo_scan,
+        "client": args.slo_client,
+        "first_text": args.slo_first_text,
+        "generate": args.slo_generate
+    }
+    ok = True
+
+    print(f"\n{workers} worker(s): {funnels} funnels in {elapsed:.1f} s "
+          f"(base {args.rate}/s, spike x{args.spike_x})")
+    print(f"  {'step':9s} {'count':>6s} {'err':>4s} {'p50':>9s} {'p95':>9s} {'p99':>9s} {'SLO p95':>9s}")
+    for name in STEPS:
+        if name == "first_text" and args.no_stream:
+            continue
+        s = sorted(samples[name])
+        p95 = _pct(s, 95)
+        passed = p95 <= slo[name] and not errors[name]
+        ok &= passed
+        print(
+            f"  {name:9s} {len(s):6d} {errors[name]:4d} {_pct(s, 50):7.1f}ms {p95:7.1f}ms "
+            f"{_pct(s, 99):7.1f}ms {slo[name]:7.0f}ms  {'PASS' if passed else 'FAIL'}"
+        )
+
+    if stages:
+        print("  generate-review stages (mean ms)")
+        for stage, values in sorted(stages.items(), key=lambda kv: -sum(kv[1]) / len(kv[1])):
+            print(f"    {stage:24s} {sum(values) / len(values):8.1f}")
+
+    db_calls = stats["db_calls"]
+    print(f"  per funnel: DB round trips {sum(db_calls.values()) / funnels:.2f}, "
+          f"LLM calls {stats['llm_calls'] / funnels:.2f}")
+    for call, n in db_calls.most_common(6):
+        print(f"    {call:32s} {n / funnels:.3f}")
+
+    counters = stats["counters"]
+    for cache in ("qr_cache", "client_config"):
+        hit, miss = counters.get(f"{cache}.hit", 0), counters.get(f"{cache}.miss", 0)
+        if hit + miss:
+            print(f"  {cache} hit rate {hit / (hit + miss):.1%} ({miss} misses)")
+
+    return ok
+
+
+async def main(args) -> bool:
+    tokens = _tokens(args)
+    ok = True
+
+    # workers + this load generator share the machine: N workers on
+    # fewer cores measures contention, not capacity
+    print(f"\n{args.clients} clients, {len(tokens) * args.tokens_per_client} tokens, "
+          f"{os.cpu_count()} CPU(s), DB rtt {args.db_rtt} ms, LLM latency {args.llm_latency} ms")
+
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as stats_dir:
+            proc, base_url = _start_workers(args, workers, stats_dir)
+            try:
+                funnels, elapsed, samples, stages, errors = await _profile(args, base_url, tokens)
+            finally:
+                stats = _stop_workers(proc, stats_dir)
+            ok &= _report(args, workers, funnels, elapsed, samples, stages, errors, stats)
+
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=lambda v: [int(w) for w in v.split(",")], default=[1, 4, 16])
+    parser.add_argument("--clients", type=int, default=300)
+    parser.add_argument("--tokens-per-client", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds")
+    parser.add_argument("--rate", type=float, default=10.0, help="funnels/s outside the spike")
+    parser.add_argument("--spike-at", type=float, default=5.0)
+    parser.add_argument("--spike-for", type=float, default=5.0)
+    parser.add_argument("--spike-x", type=float, default=5.0)
+    parser.add_argument("--skew", type=float, default=1.1, help="shop popularity skew")
+    parser.add_argument("--convert", type=float, default=0.6, help="share of scans that generate")
+    parser.add_argument("--think-ms", type=float, default=1500.0)
+    parser.add_argument("--db-rtt", type=float, default=5.0)
+    parser.add_argument("--llm-latency", type=float, default=300.0)
+    parser.add_argument("--slo-scan", type=float, default=50.0, help="p95 ms")
+    parser.add_argument("--slo-client", type=float, default=100.0, help="p95 ms")
+    parser.add_argument("--slo-first-text", type=float, default=1000.0, help="p95 ms (stream)")
+    parser.add_argument("--slo-generate", type=float, default=3000.0, help="p95 ms")
+    parser.add_argument("--no-stream", action="store_true", help="POST /api/generate-review instead of /stream")
+    parser.add_argument("--max-connections", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    sys.exit(0 if asyncio.run(main(args)) else 1)
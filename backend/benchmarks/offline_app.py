@@ -0,0 +1,63 @@
+# benchmarks/offline_app.py
+"""
+uvicorn target: app.main wired to the offline stand-ins, one set per
+worker process (each worker seeds the same data from OFFLINE_SEED).
+
+    uvicorn benchmarks.offline_app:app --workers 4
+
+Env (set by benchmarks.load_qr_funnel):
+    OFFLINE_CLIENTS, OFFLINE_TOKENS_PER_CLIENT, OFFLINE_SEED,
+    OFFLINE_DB_RTT_MS, OFFLINE_LLM_LATENCY_MS, OFFLINE_LLM_TOKEN_MS,
+    OFFLINE_STATS_DIR  → <pid>.json per worker on shutdown
+                         (DB calls, LLM calls, app metrics counters)
+"""
+import os
+import sys
+import json
+from contextlib import asynccontextmanager
+
+from benchmarks.offline_stack import app, install, seed
+from app.core import metrics
+
+if not os.getenv("OFFLINE_VERBOSE"):
+    # the app's debug prints would cost more than the code under test
+    sys.stdout = open(os.devnull, "w")
+
+db, llm = install(
+    float(os.getenv("OFFLINE_DB_RTT_MS", "5")),
+    float(os.getenv("OFFLINE_LLM_LATENCY_MS", "300")),
+    float(os.getenv("OFFLINE_LLM_TOKEN_MS", "0"))
+)
+seed(
+    db,
+    clients=int(os.getenv("OFFLINE_CLIENTS", "50")),
+    tokens_per_client=int(os.getenv("OFFLINE_TOKENS_PER_CLIENT", "10")),
+    seed=int(os.getenv("OFFLINE_SEED", "7"))
+)
+
+
+@app.get("/_bench/worker")
+def bench_worker():
+    return {"pid": os.getpid()}
+
+
+_lifespan = app.router.lifespan_context
+
+
+@asynccontextmanager
+async def _lifespan_with_stats(a):
+    async with _lifespan(a):
+        yield
+
+    # after the app's own shutdown → write-behind flush is counted too
+    stats_dir = os.getenv("OFFLINE_STATS_DIR")
+    if stats_dir:
+        with open(os.path.join(stats_dir, f"{os.getpid()}.json"), "w") as f:
+            json.dump({
+                "db_calls": dict(db.calls),
+                "llm_calls": llm.calls,
+                "counters": metrics.snapshot()["counters"]
+            }, f)
+
+
+app.router.lifespan_context = _lifespan_with_stats
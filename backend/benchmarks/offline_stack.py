@@ -0,0 +1,117 @@
+# benchmarks/offline_stack.py
+"""
+The real FastAPI app wired to the offline stand-ins
+(benchmarks.fake_postgrest + benchmarks.fake_openai), for load tests.
+
+    db, llm = install(db_rtt_ms=5, llm_latency_ms=300)
+    clients, tokens = seed(db, clients=100, tokens_per_client=20)
+    async with running_app() as http:
+        await http.post("/api/generate-review", json={...})
+
+Requests go through httpx.ASGITransport (in-process, no sockets);
+the app lifespan runs, so write_behind / draft_pool work as in prod.
+"""
+import os
+import sys
+import uuid
+import random
+from contextlib import asynccontextmanager, contextmanager, redirect_stdout
+
+os.environ.setdefault("OPENAI_API_KEY", "offline")
+os.environ.setdefault("SUPABASE_URL", "http://postgrest.offline")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "offline")
+
+import httpx
+
+from app.main import app
+from benchmarks.fake_postgrest import FakePostgrest
+from benchmarks.fake_openai import FakeOpenAI
+
+_stdout = sys.stdout
+
+INDUSTRIES = ["Restaurant", "Salon", "Clinic", "Gym", "Bakery", "Cafe"]
+AREAS = ["Andheri", "Bandra", "Powai", "Thane", "Borivali"]
+
+
+def install(db_rtt_ms: float = 5.0, llm_latency_ms: float = 300.0, llm_token_ms: float = 0.0):
+    db = FakePostgrest(rtt_ms=db_rtt_ms)
+    llm = FakeOpenAI(latency_ms=llm_latency_ms, token_ms=llm_token_ms)
+    db.install()
+    llm.install()
+    return db, llm
+
+
+def seed(db: FakePostgrest, clients: int = 50, tokens_per_client: int = 10, seed: int = 7):
+    """
+    client_types (one per industry), active clients, assigned QR tokens.
+    Same seed → same ids and tokens. Returns (client ids, tokens).
+    """
+    rnd = random.Random(seed)
+
+    def new_id() -> str:
+        # deterministic → a load generator can rebuild the same ids / tokens
+        return str(uuid.UUID(int=rnd.getrandbits(128), version=4))
+
+    types = [
+        {
+            "id": new_id(),
+            "type_name": name,
+            "context": "friendly staff, clean place, quick service, fair prices",
+            "trust_signals": "on time, well explained, value for money",
+            "seo_keywords": f"best {name.lower()}, {name.lower()} near me",
+            "products_services": f"{name} service, consultation, package",
+            "tone": "friendly",
+            "verbosity": 2
+        }
+        for name in INDUSTRIES
+    ]
+    db.seed("client_types", types)
+
+    client_rows = [
+        {
+            "id": new_id(),
+            "type_id": rnd.choice(types)["id"],
+            "shop_name": f"Shop {i}",
+            "area": rnd.choice(AREAS),
+            "is_active": True,
+            "start_date": "2020-01-01",
+            "end_date": "2099-12-31"
+        }
+        for i in range(clients)
+    ]
+    db.seed("clients", client_rows)
+
+    tokens = []
+    for client in client_rows:
+        for _ in range(tokens_per_client):
+            token = f"{rnd.getrandbits(40):010x}"
+            tokens.append(token)
+            db.seed("qr_tokens", [{"token": token, "client_id": client["id"], "is_active": True}])
+
+    return [c["id"] for c in client_rows], tokens
+
+
+@asynccontextmanager
+async def running_app():
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://app",
+            timeout=120
+        ) as http:
+            yield http
+
+
+def report(*args):
+    """print() that still reaches the terminal inside quiet_app()."""
+    print(*args, file=_stdout, flush=True)
+
+
+@contextmanager
+def quiet_app(verbose: bool = False):
+    # the app's debug prints (payloads, shop names) would drown the report
+    if verbose:
+        yield
+        return
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        yield
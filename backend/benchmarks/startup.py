@@ -0,0 +1,108 @@
+# benchmarks/startup.py
+"""
+Worker startup cost (no DB / OpenAI needed, nothing is called).
+
+- import time → fresh interpreter, `import app.main` (--runs times)
+- time-to-first-request → --workers uvicorn processes started together
+  (like a restart), each polled on GET / until it answers 200;
+  measured from process spawn, so it includes interpreter start,
+  imports and the lifespan.
+
+Also reports whether the heavy / unused modules (openai, anti_spam)
+were imported by app.main.
+
+Run from backend/:
+    python -m benchmarks.startup --runs 5 --workers 4
+"""
+import os
+import sys
+import time
+import socket
+import argparse
+import statistics
+import subprocess
+
+import httpx
+
+ENV = {
+    **os.environ,
+    "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", "offline"),
+    "SUPABASE_URL": os.getenv("SUPABASE_URL", "http://postgrest.offline"),
+    "SUPABASE_SERVICE_KEY": os.getenv("SUPABASE_SERVICE_KEY", "offline"),
+}
+
+IMPORT_PROBE = """
+import sys, time
+t = time.perf_counter()
+import app.main
+ms = (time.perf_counter() - t) * 1000
+print(ms, 'openai' in sys.modules, 'app.brain.anti_spam' in sys.modules)
+"""
+
+TTFR_TIMEOUT = 30     # seconds
+
+
+def _import_time() -> tuple[float, bool, bool]:
+    out = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE],
+        env=ENV, capture_output=True, text=True, check=True
+    ).stdout.split()
+    return float(out[0]), out[1] == "True", out[2] == "True"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _time_to_first_request(workers: int) -> list[float]:
+    procs = []
+    for _ in range(workers):
+        port = _free_port()
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+            env=ENV, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        procs.append((proc, port, time.perf_counter()))
+
+    results = []
+    try:
+        for proc, port, started in procs:
+            deadline = started + TTFR_TIMEOUT
+            while time.perf_counter() < deadline:
+                try:
+                    if httpx.get(f"http://127.0.0.1:{port}/", timeout=0.5).status_code == 200:
+                        results.append((time.perf_counter() - started) * 1000)
+                        break
+                except httpx.TransportError:
+                    time.sleep(0.005)
+            else:
+                raise RuntimeError(f"worker on :{port} didn't answer within {TTFR_TIMEOUT}s")
+    finally:
+        for proc, _, _ in procs:
+            proc.terminate()
+            proc.wait()
+
+    return results
+
+
+def main(runs: int, workers: int):
+    print(f"\nimport app.main ({runs} fresh interpreters)")
+    samples = [_import_time() for _ in range(runs)]
+    times = sorted(s[0] for s in samples)
+    print(f"  median {statistics.median(times):7.1f} ms   min {times[0]:7.1f} ms   max {times[-1]:7.1f} ms")
+    print(f"  openai imported: {samples[0][1]}   anti_spam imported: {samples[0][2]}")
+
+    print(f"\ntime-to-first-request, {workers} worker(s) started together")
+    for i, ms in enumerate(_time_to_first_request(workers)):
+        print(f"  worker {i + 1}: {ms:7.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    main(args.runs, args.workers)
@@ -0,0 +1,20 @@
+-- Batch-generated opening / ending pools (opening_engine, ending_engine)
+-- Rows inserted by a batch carry the pool they belong to:
+--   opening_usage.bucket = 'positive' | 'neutral'   (rating bucket)
+--   ending_usage.bucket  = '3' | '4' | '5'          (rating)
+-- Legacy rows (static pools) keep bucket / language NULL.
+
+alter table opening_usage
+    add column if not exists bucket text,
+    add column if not exists language text;
+
+alter table ending_usage
+    add column if not exists bucket text,
+    add column if not exists language text;
+
+-- pick_opening / pick_ending: "available rows in this pool"
+create index if not exists opening_usage_pool_idx
+    on opening_usage (business_id, industry, bucket, language, usage_count);
+
+create index if not exists ending_usage_pool_idx
+    on ending_usage (business_id, industry, bucket, language, usage_count);
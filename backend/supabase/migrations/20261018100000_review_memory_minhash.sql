@@ -0,0 +1,9 @@
+-- MinHash signature per review (brain/minhash.py, NUM_PERM values)
+-- Legacy rows keep minhash NULL; review_cache computes them on load.
+
+alter table review_memory
+    add column if not exists minhash bigint[];
+
+-- review_cache: full-history load (paged) + "rows newer than X" refresh
+create index if not exists review_memory_business_created_idx
+    on review_memory (business_id, industry, created_at desc);
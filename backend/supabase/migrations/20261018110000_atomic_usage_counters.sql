@@ -0,0 +1,72 @@
+-- Atomic usage counters (memory/narrative_usage, brain/opening_engine,
+-- brain/ending_engine). One RPC per table per write-behind flush:
+--   p_rows = [{business_id, industry, <text column>, usage_count}, ...]
+-- usage_count in a row is the increment (rows are coalesced per key
+-- client-side, so one statement never touches the same row twice).
+
+-- narrative_usage had no unique key (select → insert race): merge dups first
+with ranked as (
+    select
+        id,
+        sum(usage_count) over w as total,
+        row_number() over (w order by id::text) as rn
+    from narrative_usage
+    window w as (partition by business_id, industry, narrative)
+)
+update narrative_usage n
+set usage_count = r.total
+from ranked r
+where n.id = r.id and r.rn = 1 and n.usage_count is distinct from r.total;
+
+with ranked as (
+    select
+        id,
+        row_number() over (
+            partition by business_id, industry, narrative order by id::text
+        ) as rn
+    from narrative_usage
+)
+delete from narrative_usage n
+using ranked r
+where n.id = r.id and r.rn > 1;
+
+create unique index if not exists narrative_usage_key
+    on narrative_usage (business_id, industry, narrative);
+
+
+create or replace function increment_narrative_usage(p_rows jsonb)
+returns void
+language sql
+as $$
+    insert into narrative_usage as u (business_id, industry, narrative, usage_count)
+    select r.business_id, r.industry, r.narrative, r.usage_count
+    from jsonb_populate_recordset(null::narrative_usage, p_rows) r
+    on conflict (business_id, industry, narrative)
+    do update set usage_count = coalesce(u.usage_count, 0) + excluded.usage_count;
+$$;
+
+create or replace function increment_opening_usage(p_rows jsonb)
+returns void
+language sql
+as $$
+    insert into opening_usage as u (business_id, industry, opening_text, usage_count, last_used)
+    select r.business_id, r.industry, r.opening_text, r.usage_count, now()
+    from jsonb_populate_recordset(null::opening_usage, p_rows) r
+    on conflict (business_id, industry, opening_text)
+    do update set
+        usage_count = coalesce(u.usage_count, 0) + excluded.usage_count,
+        last_used = excluded.last_used;
+$$;
+
+create or replace function increment_ending_usage(p_rows jsonb)
+returns void
+language sql
+as $$
+    insert into ending_usage as u (business_id, industry, ending_text, usage_count, last_used)
+    select r.business_id, r.industry, r.ending_text, r.usage_count, now()
+    from jsonb_populate_recordset(null::ending_usage, p_rows) r
+    on conflict (business_id, industry, ending_text)
+    do update set
+        usage_count = coalesce(u.usage_count, 0) + excluded.usage_count,
+        last_used = excluded.last_used;
+$$;
@@ -0,0 +1,24 @@
+-- /r/{token}: token state + assigned client's active window in ONE call
+-- (core/qr_cache → routes/public_token, public_qr, qr_redirect)
+-- Returns NULL for an unknown token; "client" is NULL when unassigned.
+
+create or replace function resolve_qr_token(p_token text)
+returns jsonb
+language sql
+stable
+as $$
+    select jsonb_build_object(
+        'client_id', t.client_id,
+        'is_active', t.is_active,
+        'client', case when c.id is null then null else jsonb_build_object(
+            'id', c.id,
+            'is_active', c.is_active,
+            'start_date', c.start_date,
+            'end_date', c.end_date
+        ) end
+    )
+    from qr_tokens t
+    left join clients c on c.id = t.client_id
+    where t.token = p_token
+    limit 1
+$$;
@@ -0,0 +1,126 @@
+-- QR scan rollups (routes/qr_stats). Maintained at ingestion by a
+-- statement-level trigger on qr_review_logs, so one write-behind bulk
+-- insert updates each (client, day) once:
+--   qr_scan_daily  → per client per IST day
+--   qr_scan_totals → per client lifetime (what /admin/qr-stats reads)
+-- Ratings outside 3–5 count in total only (same as the old endpoint).
+
+create table if not exists qr_scan_daily (
+    client_id uuid not null,
+    day date not null,
+    total bigint not null default 0,
+    rating_3 bigint not null default 0,
+    rating_4 bigint not null default 0,
+    rating_5 bigint not null default 0,
+    rating_sum bigint not null default 0,
+    last_scan timestamptz,
+    primary key (client_id, day)
+);
+
+create table if not exists qr_scan_totals (
+    client_id uuid primary key,
+    total bigint not null default 0,
+    rating_3 bigint not null default 0,
+    rating_4 bigint not null default 0,
+    rating_5 bigint not null default 0,
+    rating_sum bigint not null default 0,
+    last_scan timestamptz
+);
+
+
+create or replace function qr_review_logs_rollup()
+returns trigger
+language plpgsql
+as $$
+begin
+    -- ordered by key → concurrent flushes lock rows in the same order
+    insert into qr_scan_daily as d
+        (client_id, day, total, rating_3, rating_4, rating_5, rating_sum, last_scan)
+    select
+        client_id,
+        (created_at at time zone 'Asia/Kolkata')::date,
+        count(*),
+        count(*) filter (where rating = 3),
+        count(*) filter (where rating = 4),
+        count(*) filter (where rating = 5),
+        coalesce(sum(rating) filter (where rating between 3 and 5), 0),
+        max(created_at)
+    from new_rows
+    where client_id is not null
+    group by 1, 2
+    order by 1, 2
+    on conflict (client_id, day) do update set
+        total = d.total + excluded.total,
+        rating_3 = d.rating_3 + excluded.rating_3,
+        rating_4 = d.rating_4 + excluded.rating_4,
+        rating_5 = d.rating_5 + excluded.rating_5,
+        rating_sum = d.rating_sum + excluded.rating_sum,
+        last_scan = greatest(d.last_scan, excluded.last_scan);
+
+    insert into qr_scan_totals as t
+        (client_id, total, rating_3, rating_4, rating_5, rating_sum, last_scan)
+    select
+        client_id,
+        count(*),
+        count(*) filter (where rating = 3),
+        count(*) filter (where rating = 4),
+        count(*) filter (where rating = 5),
+        coalesce(sum(rating) filter (where rating between 3 and 5), 0),
+        max(created_at)
+    from new_rows
+    where client_id is not null
+    group by 1
+    order by 1
+    on conflict (client_id) do update set
+        total = t.total + excluded.total,
+        rating_3 = t.rating_3 + excluded.rating_3,
+        rating_4 = t.rating_4 + excluded.rating_4,
+        rating_5 = t.rating_5 + excluded.rating_5,
+        rating_sum = t.rating_sum + excluded.rating_sum,
+        last_scan = greatest(t.last_scan, excluded.last_scan);
+
+    return null;
+end;
+$$;
+
+
+-- backfill + trigger in one go: no insert can slip in between
+lock table qr_review_logs in share row exclusive mode;
+
+truncate qr_scan_daily, qr_scan_totals;
+
+insert into qr_scan_daily
+    (client_id, day, total, rating_3, rating_4, rating_5, rating_sum, last_scan)
+select
+    client_id,
+    (created_at at time zone 'Asia/Kolkata')::date,
+    count(*),
+    count(*) filter (where rating = 3),
+    count(*) filter (where rating = 4),
+    count(*) filter (where rating = 5),
+    coalesce(sum(rating) filter (where rating between 3 and 5), 0),
+    max(created_at)
+from qr_review_logs
+where client_id is not null
+group by 1, 2;
+
+insert into qr_scan_totals
+    (client_id, total, rating_3, rating_4, rating_5, rating_sum, last_scan)
+select
+    client_id,
+    sum(total),
+    sum(rating_3),
+    sum(rating_4),
+    sum(rating_5),
+    sum(rating_sum),
+    max(last_scan)
+from qr_scan_daily
+group by 1;
+
+drop trigger if exists qr_review_logs_rollup on qr_review_logs;
+
+create trigger qr_review_logs_rollup
+    after insert on qr_review_logs
+    referencing new table as new_rows
+    for each statement
+    execute function qr_review_logs_rollup();
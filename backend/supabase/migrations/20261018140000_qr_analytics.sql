@@ -0,0 +1,114 @@
+-- QR analytics (routes/qr_stats → GET /admin/qr-analytics).
+-- Groups in the database and answers in columnar form:
+--   series: {client_id: [...], bucket: [...], key: [...], scans: [...], rating_sum: [...]}
+--   totals: {client_id: [...], total_scans: [...], rating_sum: [...], last_scan: [...]}
+-- p_bucket    → day / week / month (IST days, weeks start Monday)
+-- p_breakdown → null / rating  : read from qr_scan_daily (rollup)
+--               language / product : grouped from qr_review_logs
+-- key is null without a breakdown; rating keys are "3" / "4" / "5" / "other".
+
+create index if not exists qr_review_logs_client_created
+    on qr_review_logs (client_id, created_at);
+
+
+create or replace function qr_analytics(
+    p_client_ids uuid[],
+    p_from date,
+    p_to date,
+    p_bucket text default 'day',
+    p_breakdown text default null
+)
+returns jsonb
+language plpgsql
+stable
+as $$
+declare
+    v_series jsonb;
+    v_totals jsonb;
+begin
+    if p_bucket not in ('day', 'week', 'month') then
+        raise exception 'invalid bucket: %', p_bucket;
+    end if;
+
+    if p_breakdown is not null and p_breakdown not in ('rating', 'language', 'product') then
+        raise exception 'invalid breakdown: %', p_breakdown;
+    end if;
+
+    if p_breakdown in ('language', 'product') then
+        -- only the requested window of raw logs (client_id, created_at index)
+        with grouped as (
+            select
+                client_id,
+                date_trunc(p_bucket, (created_at at time zone 'Asia/Kolkata')::date)::date as bucket,
+                coalesce(case p_breakdown when 'language' then language else product end, '') as key,
+                count(*) as scans,
+                coalesce(sum(rating) filter (where rating between 3 and 5), 0) as rating_sum
+            from qr_review_logs
+            where client_id = any(p_client_ids)
+              and created_at >= p_from::timestamp at time zone 'Asia/Kolkata'
+              and created_at < (p_to + 1)::timestamp at time zone 'Asia/Kolkata'
+            group by 1, 2, 3
+        )
+        select jsonb_build_object(
+            'client_id', coalesce(jsonb_agg(client_id order by client_id, bucket, key), '[]'),
+            'bucket', coalesce(jsonb_agg(bucket order by client_id, bucket, key), '[]'),
+            'key', coalesce(jsonb_agg(key order by client_id, bucket, key), '[]'),
+            'scans', coalesce(jsonb_agg(scans order by client_id, bucket, key), '[]'),
+            'rating_sum', coalesce(jsonb_agg(rating_sum order by client_id, bucket, key), '[]')
+        )
+        into v_series
+        from grouped;
+    else
+        with days as (
+            select
+                client_id,
+                date_trunc(p_bucket, day)::date as bucket,
+                total, rating_3, rating_4, rating_5, rating_sum
+            from qr_scan_daily
+            where client_id = any(p_client_ids)
+              and day between p_from and p_to
+        ),
+        grouped as (
+            select client_id, bucket, null::text as key, sum(total) as scans, sum(rating_sum) as rating_sum
+            from days
+            where p_breakdown is null
+            group by 1, 2
+
+            union all
+
+            select d.client_id, d.bucket, v.key, sum(v.scans), sum(v.rating_sum)
+            from days d
+            cross join lateral (values
+                ('3', d.rating_3, 3 * d.rating_3),
+                ('4', d.rating_4, 4 * d.rating_4),
+                ('5', d.rating_5, 5 * d.rating_5),
+                ('other', d.total - d.rating_3 - d.rating_4 - d.rating_5, 0)
+            ) v(key, scans, rating_sum)
+            where p_breakdown = 'rating' and v.scans > 0
+            group by 1, 2, 3
+        )
+        select jsonb_build_object(
+            'client_id', coalesce(jsonb_agg(client_id order by client_id, bucket, key), '[]'),
+            'bucket', coalesce(jsonb_agg(bucket order by client_id, bucket, key), '[]'),
+            'key', coalesce(jsonb_agg(key order by client_id, bucket, key), '[]'),
+            'scans', coalesce(jsonb_agg(scans order by client_id, bucket, key), '[]'),
+            'rating_sum', coalesce(jsonb_agg(rating_sum order by client_id, bucket, key), '[]')
+        )
+        into v_series
+        from grouped;
+    end if;
+
+    -- lifetime totals ride along → a dashboard load is one request
+    select jsonb_build_object(
+        'client_id', coalesce(jsonb_agg(client_id order by client_id), '[]'),
+        'total_scans', coalesce(jsonb_agg(total order by client_id), '[]'),
+        'rating_sum', coalesce(jsonb_agg(rating_sum order by client_id), '[]'),
+        'last_scan', coalesce(jsonb_agg(last_scan order by client_id), '[]')
+    )
+    into v_totals
+    from qr_scan_totals
+    where client_id = any(p_client_ids);
+
+    return jsonb_build_object('series', v_series, 'totals', v_totals);
+end;
+$$;
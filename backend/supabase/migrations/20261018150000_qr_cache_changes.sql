@@ -0,0 +1,55 @@
+-- Shared invalidation signal for core/qr_cache (one cache per worker).
+-- updated_at on qr_tokens / clients is bumped by a trigger on every update,
+-- whoever writes (admin routes, dashboard straight to Supabase). Each worker
+-- polls qr_cache_changes every few seconds and drops the tokens it lists.
+
+alter table qr_tokens add column if not exists updated_at timestamptz not null default now();
+alter table clients add column if not exists updated_at timestamptz not null default now();
+
+create index if not exists qr_tokens_updated_at on qr_tokens (updated_at);
+create index if not exists clients_updated_at on clients (updated_at);
+
+
+create or replace function touch_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+    new.updated_at := now();
+    return new;
+end;
+$$;
+
+drop trigger if exists qr_tokens_touch on qr_tokens;
+create trigger qr_tokens_touch
+    before update on qr_tokens
+    for each row execute function touch_updated_at();
+
+drop trigger if exists clients_touch on clients;
+create trigger clients_touch
+    before update on clients
+    for each row execute function touch_updated_at();
+
+
+-- p_since = "now" of the previous call (NULL → first call, nothing listed).
+-- Rows are matched with a small overlap: now() is the transaction start, so
+-- an update committed just after a poll can carry an earlier timestamp.
+create or replace function qr_cache_changes(p_since timestamptz)
+returns jsonb
+language sql
+stable
+as $$
+    select jsonb_build_object(
+        'now', now(),
+        'tokens', coalesce((
+            select jsonb_agg(t.token)
+            from qr_tokens t
+            where p_since is not null and t.updated_at > p_since - interval '10 seconds'
+        ), '[]'::jsonb),
+        'clients', coalesce((
+            select jsonb_agg(c.id)
+            from clients c
+            where p_since is not null and c.updated_at > p_since - interval '10 seconds'
+        ), '[]'::jsonb)
+    )
+$$;
@@ -0,0 +1,9 @@
+-- brain/minhash.py now hashes word bigrams into NUM_BINS = 128 bins
+-- (one-permutation hashing); the 64-value signatures stored so far can't
+-- be compared with the new ones. Clear them: review_cache treats NULL as
+-- legacy (computed on load) and app/scripts/backfill_minhash.py refills.
+
+update review_memory
+set minhash = null
+where minhash is not null
+  and cardinality(minhash) <> 128;
@@ -2,6 +2,7 @@ import { useEffect, useMemo, useState } from "react";
 import { useParams } from "react-router-dom";
 import AdminLayout from "../../layouts/AdminLayout";
 import { supabase } from "../../services/supabaseClient";
+import { invalidateClientCache } from "../../services/backendCache";
 
 /* ---------- TAG INPUT ---------- */
 const TagInput = ({ label, values, setValues }) => {
@@ -215,6 +216,8 @@ export default function AddClient() {
       return;
     }
 
+    if (isEdit) invalidateClientCache(id);
+
     if (
       isEdit &&
       oldClient &&
@@ -1,6 +1,7 @@
 import { useEffect, useState } from "react";
 import AdminLayout from "../../layouts/AdminLayout";
 import { supabase } from "../../services/supabaseClient";
+import { invalidateClientTypesCache } from "../../services/backendCache";
 
 /* ---------- TAG INPUT ---------- */
 const TagInput = ({ label, values, setValues }) => {
@@ -101,6 +102,8 @@ export default function ClientTypes() {
       return;
     }
 
+    invalidateClientTypesCache();
+
     setForm({
       type_name: "",
       contexts: [],
@@ -129,6 +132,7 @@ export default function ClientTypes() {
       })
       .eq("id", t.id);
 
+    invalidateClientTypesCache();
     loadTypes();
   };
 
@@ -2,8 +2,12 @@ import { useEffect, useState, useRef } from "react";
 import { useNavigate } from "react-router-dom";
 import AdminLayout from "../../layouts/AdminLayout";
 import { supabase } from "../../services/supabaseClient";
+import { invalidateClientCache, invalidateQrCache } from "../../services/backendCache";
 import QRCode from "react-qr-code";
 
+/* max client ids per /admin/qr-analytics request (backend MAX_CLIENTS) */
+const QR_ANALYTICS_MAX_IDS = 500;
+
 /* ---------- IST DATE HELPERS ---------- */
 const istToday = () => {
   const now = new Date();
@@ -27,6 +31,7 @@ export default function Dashboard() {
   const [clients, setClients] = useState([]);
   const [tokens, setTokens] = useState([]);
   const [qrStats, setQrStats] = useState({});
+  const [qrStatsError, setQrStatsError] = useState(null);
   const [saving, setSaving] = useState(null);
   const [uploading, setUploading] = useState(null);
 
@@ -41,6 +46,7 @@ export default function Dashboard() {
       .from("clients")
       .select("*, client_types(type_name), duration_days, logo_url");
     setClients(data || []);
+    loadQrStats((data || []).map(c => c.id));
   };
 
   /* ---------- LOAD TOKENS ---------- */
@@ -61,6 +67,7 @@ export default function Dashboard() {
       })
       .eq("token", token);
 
+    invalidateQrCache(token);
     loadTokens();
   };
 
@@ -74,6 +81,7 @@ export default function Dashboard() {
       })
       .eq("token", token);
 
+    invalidateQrCache(token);
     loadTokens();
   };
 
@@ -84,6 +92,7 @@ export default function Dashboard() {
       .from("clients")
       .update({ gmb_link: value })
       .eq("id", id);
+    invalidateClientCache(id);
     setSaving(null);
   };
 
@@ -110,20 +119,46 @@ export default function Dashboard() {
       .from("clients")
       .update({ logo_url: data.publicUrl })
       .eq("id", clientId);
+    invalidateClientCache(clientId);
 
     setUploading(null);
     loadClients();
   };
 
-  /* ---------- LOAD QR STATS ---------- */
-  const loadQrStats = async (clientId) => {
-    if (qrStats[clientId]) return;
+  /* ---------- LOAD QR STATS (lifetime totals, one request per 500 clients) ---------- */
+  const loadQrStats = async (clientIds) => {
+    if (!clientIds.length) return;
+
+    const chunks = [];
+    for (let i = 0; i < clientIds.length; i += QR_ANALYTICS_MAX_IDS) {
+      chunks.push(clientIds.slice(i, i + QR_ANALYTICS_MAX_IDS));
+    }
+
     try {
-      const res = await fetch(`/admin/qr-stats/${clientId}`);
-      const data = await res.json();
-      setQrStats(prev => ({ ...prev, [clientId]: data }));
-    } catch {
-      setQrStats(prev => ({ ...prev, [clientId]: null }));
+      const results = await Promise.all(chunks.map(async (ids) => {
+        const res = await fetch(`/admin/qr-analytics?client_ids=${ids.join(",")}`);
+        const body = await res.json().catch(() => ({}));
+        if (!res.ok) throw new Error(body.detail || `HTTP ${res.status}`);
+        return body.totals;
+      }));
+
+      const stats = {};
+      results.forEach(totals => {
+        totals.client_id.forEach((id, i) => {
+          const total = totals.total_scans[i];
+          stats[id] = {
+            total_scans: total,
+            avg_rating: total ? Math.round(totals.rating_sum[i] / total * 100) / 100 : 0,
+            last_scan: totals.last_scan[i]
+          };
+        });
+      });
+      setQrStats(stats);
+      setQrStatsError(null);
+    } catch (err) {
+      // don't show zeros for stats that never loaded
+      setQrStats({});
+      setQrStatsError(err.message || "failed to load");
     }
   };
 
@@ -239,6 +274,11 @@ export default function Dashboard() {
 
       {/* ================= QR & REVIEW MANAGER ================= */}
       <h2 style={{ marginTop: 40 }}>QR & Review Manager</h2>
+      {qrStatsError && (
+        <div style={{ color: "red", marginBottom: 10 }}>
+          QR stats unavailable: {qrStatsError}
+        </div>
+      )}
 
       <table border="1" cellPadding="6" width="100%">
         <thead>
@@ -334,17 +374,10 @@ export default function Dashboard() {
                 </td>
 
                 <td style={{ fontSize: 12 }}>
-                  {client ? (
+                  {client && !qrStatsError ? (
                     <>
-                      <button onClick={() => loadQrStats(client.id)}>
-                        Load
-                      </button>
-                      {stats && (
-                        <>
-                          <div>Total: {stats.total_scans}</div>
-                          <div>Avg: {stats.avg_rating}</div>
-                        </>
-                      )}
+                      <div>Total: {stats ? stats.total_scans : 0}</div>
+                      <div>Avg: {stats ? stats.avg_rating : 0}</div>
                     </>
                   ) : "—"}
                 </td>
@@ -2,6 +2,49 @@ import { useEffect, useState } from "react";
 import { useParams } from "react-router-dom";
 import "./PublicReview.css";
 
+/* ---------- SSE READER (opening → token* → replace? → done) ---------- */
+async function readReviewStream(res, onText) {
+  if (!res.ok || !res.body) return "";
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let text = "";
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+
+    buffer += decoder.decode(value, { stream: true });
+    const events = buffer.split("\n\n");
+    buffer = events.pop();
+
+    for (const raw of events) {
+      const event = raw.match(/^event: (.*)$/m)?.[1];
+      const data = raw.match(/^data: (.*)$/m)?.[1];
+      if (!event || !data) continue;
+
+      const payload = JSON.parse(data);
+
+      if (event === "opening" || event === "token") {
+        text += payload.text;
+      } else if (event === "replace") {
+        text = payload.review;
+      } else if (event === "done") {
+        onText(payload.review);
+        return payload.review;
+      } else if (event === "error") {
+        return "";
+      }
+
+      onText(text);
+    }
+  }
+
+  // stream closed without "done" → treat as failure
+  return "";
+}
+
 export default function PublicReview() {
   const { clientId: token } = useParams();
 
@@ -80,7 +123,7 @@ export default function PublicReview() {
     setReviewText("");
 
     try {
-      const res = await fetch("import.meta.env.VITE_API_URL/api/generate-review", {
+      const res = await fetch("import.meta.env.VITE_API_URL/api/generate-review/stream", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({
@@ -91,9 +134,8 @@ export default function PublicReview() {
         })
       });
 
-      const data = await res.json();
-      const text =
-        data.review || data.text || data.generated_review || "";
+      // opening + body tokens show up as they are generated
+      const text = await readReviewStream(res, setReviewText);
 
       if (!text) {
         setIsWriting(false);
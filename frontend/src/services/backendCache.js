@@ -0,0 +1,15 @@
+// Backend caches client config / client types / QR tokens per worker.
+// Admin edits go straight to Supabase, so tell the backend to drop
+// its copy (best effort — the backend TTL covers a failed call).
+
+export const invalidateClientCache = (clientId) =>
+  fetch(`/admin/cache/clients/${clientId}/invalidate`, { method: "POST" })
+    .catch(() => {});
+
+export const invalidateClientTypesCache = () =>
+  fetch(`/admin/cache/client-types/invalidate`, { method: "POST" })
+    .catch(() => {});
+
+export const invalidateQrCache = (token) =>
+  fetch(`/admin/cache/qr/${token}/invalidate`, { method: "POST" })
+    .catch(() => {});